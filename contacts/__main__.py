@@ -23,9 +23,19 @@ def _run_command(cl_args: argparse.Namespace) -> None:
         case command.Command.FAMILIES:
             command.families.run()
 
+        case command.Command.LAYOUT:
+            command.layout.run(layout=cl_args.layout)
+
         case command.Command.LOAD:
             command.load.run(name=cl_args.name)
 
+        case command.Command.LOOKUP:
+            command.lookup.run(query=cl_args.query)
+
+        case command.Command.NOTES:
+            icloud_dao.authenticate()
+            command.notes.run(notes_format=cl_args.format)
+
         case command.Command.PULL:
             if not cl_args.cached:
                 icloud_dao.authenticate()
@@ -35,6 +45,9 @@ def _run_command(cl_args: argparse.Namespace) -> None:
             icloud_dao.authenticate()
             command.push.run(force=cl_args.force, write=cl_args.write)
 
+        case command.Command.SEARCH:
+            command.search.run(query=cl_args.query, limit=cl_args.limit)
+
         case command.Command.SYNC_GROUPS:
             icloud_dao.authenticate()
             command.sync_groups.run()
@@ -0,0 +1,4 @@
+"""Benchmarks that are run by hand.
+
+For example, `python -m contacts.benchmark.memory`.
+"""
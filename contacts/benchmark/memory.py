@@ -0,0 +1,98 @@
+"""Benchmark of the memory that decoded contacts take up."""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+
+from contacts import model
+from contacts.common import constant
+from contacts.utils import dataclasses_utils, file_io_utils
+
+
+def measure(text: str) -> tuple[list[model.DiskContact], int]:
+    """Measure the memory that contacts take up once decoded.
+
+    Args:
+        text: The json array of the contacts.
+
+    Returns:
+        The decoded contacts, and the number of bytes allocated for them that are
+        still in use once the json they were decoded from is freed.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        contacts = [model.DiskContact.from_dict(obj) for obj in json.loads(text)]
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return contacts, after - before
+
+
+def measure_shared_strings(contacts: list[model.DiskContact]) -> int:
+    """Measure the memory that sharing equal strings saves.
+
+    Args:
+        contacts: The decoded contacts.
+
+    Returns:
+        The number of bytes that the strings of the contacts would take up on top of
+        what they do, if every occurrence of a string were a separate object.
+    """
+    seen_ids = set()
+    saved = 0
+    for string in _iter_strings(contacts):
+        if id(string) in seen_ids:
+            saved += sys.getsizeof(string)
+        else:
+            seen_ids.add(id(string))
+    return saved
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dataclasses_utils.DataClassJsonMixin):
+        for field_value in value.to_dict().values():
+            yield from _iter_strings(field_value)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "path",
+        nargs="?",
+        default=os.path.join(constant.DATA_DIRECTORY, constant.CONTACTS_FILE_NAME),
+        help="the contacts json file to decode",
+    )
+    args = arg_parser.parse_args()
+
+    with file_io_utils.open_text(args.path) as f:
+        text = f.read()
+    contacts, total = measure(text)
+    shared = measure_shared_strings(contacts)
+    count = max(len(contacts), 1)
+    print(f"contacts: {len(contacts)}")
+    print(f"total: {total / (1 << 20):.1f} MiB, {total / count:.0f} bytes per contact")
+    print(
+        f"saved by shared strings: {shared / (1 << 20):.1f} MiB, "
+        f"{shared / count:.0f} bytes per contact"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,13 @@ from contacts.command import (
     add,
     dump,
     families,
+    layout,
     load,
+    lookup,
+    notes,
     pull,
     push,
+    search,
     sync_groups,
     tag_ls,
     tag_mv,
@@ -20,9 +24,13 @@ class Command(enum.StrEnum):
     ADD = "add"
     DUMP = "dump"
     FAMILIES = "families"
+    LAYOUT = "layout"
     LOAD = "load"
+    LOOKUP = "lookup"
+    NOTES = "notes"
     PULL = "pull"
     PUSH = "push"
+    SEARCH = "search"
     SYNC_GROUPS = "sync-groups"
     TAG = "tag"
     VALIDATE = "validate"
@@ -1,14 +1,20 @@
 """Command to list all families."""
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from contacts import model
 from contacts.utils import command_utils, contact_utils
 
+_FIELDS = ("id", "name.first_name", "name.last_name")
+
 
 def run() -> None:
-    contacts = command_utils.read_contacts_from_disk()
     families = command_utils.read_families_from_disk()
-    contact_id_to_contact_map: dict[int, model.Contact] = {
+    contacts = command_utils.read_contacts_by_ids_from_database(
+        _extract_contact_ids(families), fields=_FIELDS
+    )
+    contact_id_to_contact_map: dict[int, contact_utils.NamedContact] = {
         contact.id: contact for contact in contacts
     }
 
@@ -18,10 +24,21 @@ def run() -> None:
     print(50 * "=")
 
 
+def _extract_contact_ids(families: Sequence[model.Family | int]) -> set[int]:
+    contact_ids: set[int] = set()
+    for family in families:
+        if isinstance(family, int):
+            contact_ids.add(family)
+            continue
+        contact_ids.update(family.parents or [])
+        contact_ids.update(_extract_contact_ids(family.children or []))
+    return contact_ids
+
+
 # https://simonhessner.de/python-3-recursively-print-structured-tree-including-hierarchy-markers-using-depth-first-search/
 def _print_family(
     family: model.Family | int,
-    contact_id_to_contact_map: dict[int, model.Contact],
+    contact_id_to_contact_map: dict[int, contact_utils.NamedContact],
     level_markers: tuple[bool, ...] = (),
 ) -> None:
     markers = "".join(map(lambda draw: "│  " if draw else "   ", level_markers[:-1]))
@@ -0,0 +1,14 @@
+"""Command to convert the layout of the contacts on disk."""
+from __future__ import annotations
+
+from contacts.utils import command_utils
+
+
+def run(layout: str) -> None:
+    match layout:
+        case "json":
+            command_utils.convert_contacts_to_json_layout()
+        case "sharded":
+            command_utils.convert_contacts_to_sharded_layout()
+        case _:
+            raise ValueError(f"Unknown layout: {layout}")
@@ -5,7 +5,7 @@ from contacts.utils import command_utils
 
 
 def run(name: str | None) -> None:
-    contacts = command_utils.read_contacts_from_disk()
+    contacts = command_utils.open_contacts_from_disk()
     contact = command_utils.get_contact_by_name(contacts, name)
     if contact is None:
         return None
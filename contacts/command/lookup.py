@@ -0,0 +1,13 @@
+"""Command to find the contacts with a phone number or email address."""
+from __future__ import annotations
+
+from contacts.utils import command_utils, contact_utils
+
+
+def run(query: str) -> None:
+    if "@" in query:
+        contacts = command_utils.read_contacts_by_email_address_from_database(query)
+    else:
+        contacts = command_utils.read_contacts_by_phone_number_from_database(query)
+    for contact in contacts:
+        print(contact_utils.build_name_and_tags_str(contact))
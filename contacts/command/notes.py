@@ -0,0 +1,8 @@
+"""Command to rewrite the notes of the iCloud contacts in a format."""
+from __future__ import annotations
+
+from contacts.utils import command_utils
+
+
+def run(notes_format: str) -> None:
+    command_utils.migrate_icloud_notes(notes_format)
@@ -49,7 +49,7 @@ def run(*, cached: bool) -> None:
         icloud_contact = icloud_id_to_icloud_contact_map[icloud_id]
         disk_contact = icloud_id_to_disk_contact_map[icloud_id]
 
-        updated_contact = disk_contact.copy()
+        updated_contact = disk_contact.overlay()
         updated_contact.patch(icloud_contact)
         diff = dataclasses_utils.diff(disk_contact, updated_contact)
 
@@ -0,0 +1,10 @@
+"""Command to search contacts by name."""
+from __future__ import annotations
+
+from contacts.utils import command_utils, contact_utils
+
+
+def run(query: str, limit: int) -> None:
+    contacts = command_utils.open_contacts_from_disk()
+    for contact in command_utils.search_contacts(contacts, query, limit=limit):
+        print(contact_utils.build_name_and_tags_str(contact))
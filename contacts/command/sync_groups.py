@@ -3,11 +3,11 @@ import time
 from collections.abc import Callable
 
 from contacts import model
-from contacts.utils import command_utils, uuid_utils
+from contacts.utils import command_utils, frame_utils, uuid_utils
 
 
 def run() -> None:
-    contacts = command_utils.read_contacts_from_disk()
+    frame = command_utils.read_contact_frame_from_disk()
     icloud_groups = command_utils.read_groups_from_icloud()
     group_name_to_icloud_group_map: dict[str, model.Group] = {
         icloud_group.name: icloud_group for icloud_group in icloud_groups
@@ -17,11 +17,8 @@ def run() -> None:
     updated_groups: list[model.Group] = []
 
     for name, predicate in GROUP_NAME_TO_PREDICATE_MAP.items():
-        contact_uuids = [
-            contact.icloud.uuid
-            for contact in contacts
-            if contact.icloud is not None and predicate(contact)
-        ]
+        uuids = [frame.icloud_uuids[row] for row in frame.rows(predicate(frame))]
+        contact_uuids = [uuid for uuid in uuids if uuid is not None]
         if name not in group_name_to_icloud_group_map.keys():
             new_groups.append(
                 model.Group(
@@ -48,18 +45,22 @@ def run() -> None:
         time.sleep(1)
 
 
-def _has_tag_predicate_factory(tag: str) -> Callable[[model.Contact], bool]:
-    def has_tag_predicate(contact: model.Contact) -> bool:
-        return contact.tags is not None and tag in contact.tags
+def _has_tag_predicate_factory(
+    tag: str,
+) -> Callable[[frame_utils.ContactFrame], frame_utils.Mask]:
+    def has_tag_predicate(frame: frame_utils.ContactFrame) -> frame_utils.Mask:
+        return frame.has_tag(tag)
 
     return has_tag_predicate
 
 
-def _has_phone_number_predicate(contact: model.Contact) -> bool:
-    return contact.phone_numbers is not None
+def _has_phone_number_predicate(frame: frame_utils.ContactFrame) -> frame_utils.Mask:
+    return frame.has_phone_numbers
 
 
-GROUP_NAME_TO_PREDICATE_MAP: dict[str, Callable[[model.Contact], bool]] = {
+GROUP_NAME_TO_PREDICATE_MAP: dict[
+    str, Callable[[frame_utils.ContactFrame], frame_utils.Mask]
+] = {
     "CTY": _has_tag_predicate_factory("CTY"),
     "HubSpot": _has_tag_predicate_factory("HubSpot"),
     "Needham": _has_tag_predicate_factory("Needham"),
@@ -3,23 +3,23 @@ from __future__ import annotations
 
 from contacts.utils import command_utils, contact_utils
 
+_FIELDS = ("name.first_name", "name.last_name", "tags")
 
-def run(tags: list[str]) -> None:
-    contacts = command_utils.read_contacts_from_disk()
 
+def run(tags: list[str]) -> None:
     if not tags:
-        all_tags = contact_utils.extract_tags(contacts)
+        all_tags = command_utils.read_tags_from_database()
         all_tags_by_row = [all_tags[i : i + 5] for i in range(0, len(all_tags), 5)]
         for row in all_tags_by_row:
             for tag in row:
                 print(tag.ljust(20), end="")
             print("")
     else:
-        count = 0
+        contacts = command_utils.read_contacts_by_tags_from_database(
+            tags, fields=_FIELDS
+        )
         for contact in contacts:
-            if contact.tags and all(tag in contact.tags for tag in tags):
-                print(contact_utils.build_name_and_tags_str(contact))
-                count += 1
+            print(contact_utils.build_name_and_tags_str(contact))
 
         print("===============")
-        print(f"total: {count}")
+        print(f"total: {len(contacts)}")
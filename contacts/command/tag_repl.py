@@ -18,7 +18,7 @@ def run() -> None:
             print("Skipping...")
 
 
-def _add_tags_to_contact(contacts: Sequence[model.Contact]) -> None:
+def _add_tags_to_contact(contacts: Sequence[model.DiskContact]) -> None:
     contact = command_utils.get_contact_by_name(contacts)
     if contact is None:
         return None
@@ -7,7 +7,7 @@ from collections.abc import Sequence
 from typing import Literal
 
 from contacts import model
-from contacts.utils import command_utils, contact_utils
+from contacts.utils import command_utils, contact_utils, frame_utils
 
 _PATTERN_TO_HIGH_SCHOOL_NAME_MAP = {
     re.compile(r"^ABRSH$"): model.HighSchoolName.ACTON_BOXBOROUGH_REGIONAL_HIGH_SCHOOL,
@@ -33,9 +33,10 @@ def run() -> None:
     contacts = command_utils.read_contacts_from_disk()
     _validate_names(contacts)
     for contact in contacts:
+        _validate_model(contact)
         _validate_email_addresses(contact)
         _validate_education(contact)
-        _validate_tags(contact)
+    _validate_tags(frame_utils.ContactFrame.from_contacts(contacts))
 
 
 def _validate_names(contacts: Sequence[model.Contact]) -> None:
@@ -47,13 +48,23 @@ def _validate_names(contacts: Sequence[model.Contact]) -> None:
             print(f"Duplicate name {name}")
 
 
+def _validate_model(contact: model.Contact) -> None:
+    # contacts are read without the checks of the model, so they are run here
+    try:
+        contact.validate()
+    except AssertionError:
+        print(f"{contact_utils.build_name_str(contact)} is invalid")
+
+
 def _validate_email_addresses(contact: model.Contact) -> None:
     if contact.email_addresses is None:
         return None
 
     normalized_email_addresses = set()
     for email_address in contact.email_addresses:
-        normalized_email_addresses.add(email_address.address.lower().replace(".", ""))
+        normalized_email_addresses.add(
+            contact_utils.normalize_email_address(email_address.address)
+        )
     if len(normalized_email_addresses) < len(contact.email_addresses):
         print(f"{contact_utils.build_name_str(contact)} has duplicate email addresses")
 
@@ -90,18 +101,13 @@ def _expect_high_school(
             print(f"{contact_name} mismatched high school graduation year")
 
 
-def _validate_tags(contact: model.Contact) -> None:
-    if not contact.tags:
-        return None
-
-    for pattern in _PATTERN_TO_EXPECTED_TAG_MAP:
-        if _any_tag_matches_pattern(contact.tags, pattern):
-            _expect_tag(contact, _PATTERN_TO_EXPECTED_TAG_MAP[pattern])
-
-
-def _expect_tag(contact: model.Contact, tag: str) -> None:
-    if contact.tags is None or tag not in contact.tags:
-        print(f"{contact_utils.build_name_str(contact)} missing {tag} tag")
+def _validate_tags(frame: frame_utils.ContactFrame) -> None:
+    for pattern, tag in _PATTERN_TO_EXPECTED_TAG_MAP.items():
+        missing_tag = frame.all_of(
+            [frame.has_tag_matching(pattern), frame.negate(frame.has_tag(tag))]
+        )
+        for row in frame.rows(missing_tag):
+            print(f"{frame.names[row]} missing {tag} tag")
 
 
 def _any_tag_matches_pattern(
@@ -6,13 +6,18 @@ DATA_DIRECTORY = "data"
 CONFIG_FILE = "config.ini"
 
 CONTACTS_FILE_NAME = "contacts.json"
+CONTACTS_DATABASE_FILE_NAME = "contacts.sqlite3"
 LOADED_CONTACT_FILE_NAME = "loaded-contact.json"
 NEW_CONTACTS_FILE_NAME = "new-contacts.json"
 
+JOURNAL_COMPACTION_THRESHOLD_BYTES = 1 << 20
+
 FAMILIES_FILE_NAME = "families.json"
 
 ICLOUD_CONTACTS_FILE_NAME = "icloud-contacts.json"
 ICLOUD_GROUPS_FILE_NAME = "icloud-groups.json"
+ICLOUD_RENDERED_NOTES_FILE_NAME = "icloud-rendered-notes.pickle"
+NAME_INDEX_FILE_NAME = "name-index.pickle"
 
 COUNTRY_TO_COUNTRY_CODE_MAP = {
     model.Country.IRELAND.value: "ie",
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import configparser
 import os.path
+from collections.abc import Iterable
 
 import contacts
 from contacts.common import constant
 from contacts.dao.icloud import manager, model, transformer
-from contacts.utils import file_io_utils
+from contacts.dao.icloud.model import notes as nt
+from contacts.utils import dataclasses_utils, file_io_utils
 
 _ALERT_UUIDS = [
     "4B949DAF-F587-47DF-95C2-857B85800ADC",
@@ -23,11 +25,15 @@ _OTHER_UUIDS = [
 ]
 _IGNORED_UUIDS = _ALERT_UUIDS + _TEST_CONTACT_UUIDS + _OTHER_UUIDS
 
+_NOTES_FORMATS = ("json", "yaml")
+_NOTES_MIGRATION_BATCH_SIZE = 100
+
 
 class ICloudDao:
     _contact_manager: manager.ICloudContactManager | None = None
     _authenticated: bool = False
     _init_sync_token: bool = False
+    _rendered_notes: transformer.RenderedNotesCache | None = None
 
     def authenticate(self) -> None:
         if self._authenticated:
@@ -47,29 +53,23 @@ class ICloudDao:
         *,
         cached: bool = False,
     ) -> tuple[list[contacts.model.Contact], list[contacts.model.Group]]:
+        icloud_contacts: Iterable[model.ICloudContact]
+        icloud_groups: Iterable[model.ICloudGroup]
         if cached:
             if not os.path.isdir(constant.CACHE_DIRECTORY):
                 raise ValueError(
                     f"Cache path is not a directory, {constant.CACHE_DIRECTORY}"
                 )
 
-            contacts_file_path = os.path.join(
-                constant.CACHE_DIRECTORY, constant.ICLOUD_CONTACTS_FILE_NAME
-            )
-            if not os.path.isfile(contacts_file_path):
-                raise ValueError(f"Contacts file does not exist, {contacts_file_path}")
-
-            groups_file_path = os.path.join(
-                constant.CACHE_DIRECTORY, constant.ICLOUD_GROUPS_FILE_NAME
-            )
-            if not os.path.isfile(contacts_file_path):
-                raise ValueError(f"Groups file does not exist, {groups_file_path}")
+            contacts_file_path = _find_cache_file(constant.ICLOUD_CONTACTS_FILE_NAME)
+            groups_file_path = _find_cache_file(constant.ICLOUD_GROUPS_FILE_NAME)
 
-            icloud_contacts = file_io_utils.read_json_array_as_dataclass_objects(
+            # streamed, so each cached contact is transformed as soon as it is parsed
+            icloud_contacts = file_io_utils.iter_json_array_as_dataclass_objects(
                 contacts_file_path,
                 model.ICloudContact,
             )
-            icloud_groups = file_io_utils.read_json_array_as_dataclass_objects(
+            icloud_groups = file_io_utils.iter_json_array_as_dataclass_objects(
                 groups_file_path,
                 model.ICloudGroup,
             )
@@ -78,17 +78,12 @@ class ICloudDao:
             contact_manager = self._get_contact_manager()
             icloud_contacts, icloud_groups = contact_manager.get_contacts_and_groups()
 
-            file_io_utils.write_dataclass_objects_as_json_array(
-                os.path.join(
-                    constant.CACHE_DIRECTORY, constant.ICLOUD_CONTACTS_FILE_NAME
-                ),
-                icloud_contacts,
+            compression = _get_cache_compression()
+            _write_cache_file(
+                constant.ICLOUD_CONTACTS_FILE_NAME, icloud_contacts, compression
             )
-            file_io_utils.write_dataclass_objects_as_json_array(
-                os.path.join(
-                    constant.CACHE_DIRECTORY, constant.ICLOUD_GROUPS_FILE_NAME
-                ),
-                icloud_groups,
+            _write_cache_file(
+                constant.ICLOUD_GROUPS_FILE_NAME, icloud_groups, compression
             )
 
         contacts = [
@@ -105,17 +100,58 @@ class ICloudDao:
 
     def create_contacts(self, contacts: list[contacts.model.Contact]) -> None:
         contact_manager = self._get_contact_manager()
-        icloud_contacts = [
-            transformer.contact_to_icloud_contact(contact) for contact in contacts
-        ]
-        contact_manager.create_contacts(icloud_contacts)
+        contact_manager.create_contacts(self._transform_contacts(contacts))
 
     def update_contacts(self, contacts: list[contacts.model.Contact]) -> None:
         contact_manager = self._get_contact_manager()
-        icloud_contacts = [
-            transformer.contact_to_icloud_contact(contact) for contact in contacts
+        contact_manager.update_contacts(self._transform_contacts(contacts))
+
+    def count_rendered_notes(self) -> tuple[int, int]:
+        """Count the notes rendered for contacts that were created or updated.
+
+        Returns:
+            The number of notes that were cached, and the number that were rendered.
+        """
+        if self._rendered_notes is None:
+            return 0, 0
+        return self._rendered_notes.hits, self._rendered_notes.misses
+
+    def migrate_notes(self, notes_format: str) -> tuple[int, int]:
+        """Rewrite the notes of all iCloud contacts in a format.
+
+        Args:
+            notes_format: The format to write the notes in, json or yaml.
+
+        Returns:
+            The number of notes that were rewritten, and the number of batched
+            updates they were rewritten in.
+        """
+        if notes_format not in _NOTES_FORMATS:
+            raise ValueError(f"Unknown notes format, {notes_format}")
+        compact = notes_format == "json"
+        contact_manager = self._get_contact_manager()
+        icloud_contacts, _ = contact_manager.get_contacts_and_groups()
+
+        migrated_contacts = []
+        for icloud_contact in icloud_contacts:
+            if (
+                icloud_contact.contactId in _IGNORED_UUIDS
+                or not icloud_contact.notes
+                or nt.Notes.is_compact(icloud_contact.notes) == compact
+            ):
+                continue
+            icloud_contact.notes = nt.Notes.to_string(
+                nt.Notes.from_string(icloud_contact.notes), compact=compact
+            )
+            migrated_contacts.append(icloud_contact)
+
+        batches = [
+            migrated_contacts[i : i + _NOTES_MIGRATION_BATCH_SIZE]
+            for i in range(0, len(migrated_contacts), _NOTES_MIGRATION_BATCH_SIZE)
         ]
-        contact_manager.update_contacts(icloud_contacts)
+        for batch in batches:
+            contact_manager.update_contacts(batch)
+        return len(migrated_contacts), len(batches)
 
     def create_group(self, group: contacts.model.Group) -> None:
         contact_manager = self._get_contact_manager()
@@ -125,7 +161,75 @@ class ICloudDao:
         contact_manager = self._get_contact_manager()
         contact_manager.update_group(transformer.group_to_icloud_group(group))
 
+    def _transform_contacts(
+        self, contacts: list[contacts.model.Contact]
+    ) -> list[model.ICloudContact]:
+        # unchanged notes are rendered the same on every push, so they are cached
+        path = os.path.join(
+            constant.CACHE_DIRECTORY, constant.ICLOUD_RENDERED_NOTES_FILE_NAME
+        )
+        if self._rendered_notes is None:
+            self._rendered_notes = transformer.RenderedNotesCache.load(path)
+        compact_notes = _get_notes_format() == "json"
+        icloud_contacts = [
+            transformer.contact_to_icloud_contact(
+                contact, self._rendered_notes, compact_notes=compact_notes
+            )
+            for contact in contacts
+        ]
+        self._rendered_notes.dump(path)
+        return icloud_contacts
+
     def _get_contact_manager(self) -> manager.ICloudContactManager:
         if self._contact_manager is None:
             raise RuntimeError("Authentication required")
         return self._contact_manager
+
+
+def _get_cache_compression() -> str | None:
+    config = configparser.ConfigParser()
+    config.read(constant.CONFIG_FILE)
+    compression = config.get("icloud", "cache_compression", fallback="none")
+    if compression == "none":
+        return None
+    if compression not in file_io_utils.COMPRESSION_TO_EXTENSION:
+        raise ValueError(f"Unknown cache compression, {compression}")
+    return compression
+
+
+def _get_notes_format() -> str:
+    config = configparser.ConfigParser()
+    config.read(constant.CONFIG_FILE)
+    notes_format = config.get("icloud", "notes_format", fallback="yaml")
+    if notes_format not in _NOTES_FORMATS:
+        raise ValueError(f"Unknown notes format, {notes_format}")
+    return notes_format
+
+
+def _find_cache_file(file_name: str) -> str:
+    file_paths = [
+        file_path
+        for file_path in file_io_utils.get_compressed_paths(
+            os.path.join(constant.CACHE_DIRECTORY, file_name)
+        )
+        if os.path.isfile(file_path)
+    ]
+    if not file_paths:
+        raise ValueError(f"Cache file does not exist, {file_name}")
+    return max(file_paths, key=os.path.getmtime)
+
+
+def _write_cache_file(
+    file_name: str,
+    objects: Iterable[dataclasses_utils.DataClassJsonMixin],
+    compression: str | None,
+) -> None:
+    path = os.path.join(constant.CACHE_DIRECTORY, file_name)
+    if compression is not None:
+        path += file_io_utils.COMPRESSION_TO_EXTENSION[compression]
+    file_io_utils.write_dataclass_objects_as_json_array(path, objects)
+    for file_path in file_io_utils.get_compressed_paths(
+        os.path.join(constant.CACHE_DIRECTORY, file_name)
+    ):
+        if file_path != path and os.path.isfile(file_path):
+            os.remove(file_path)
@@ -10,9 +10,9 @@ from contacts.dao.icloud.model import date
 from contacts.utils import dataclasses_utils
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Date(dataclasses_utils.DataClassJsonMixin):
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
     field: model.Date = dataclasses.field(
         metadata=dataclasses_json.config(
             decoder=date.decoder,
@@ -21,69 +21,81 @@ class Date(dataclasses_utils.DataClassJsonMixin):
     )
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class EmailAddress(dataclasses_utils.DataClassJsonMixin):
     field: str
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class IMField(dataclasses_utils.DataClassJsonMixin):
-    IMService: str
+    IMService: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
     userName: str
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class IM(dataclasses_utils.DataClassJsonMixin):
     field: IMField
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Phone(dataclasses_utils.DataClassJsonMixin):
     field: str
-    label: str | None = None
+    label: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Profile(dataclasses_utils.DataClassJsonMixin):
     field: str
-    label: str | None = None
+    label: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
     displayname: str | None = None
     user: str | None = None
     userId: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class RelatedName(dataclasses_utils.DataClassJsonMixin):
     field: str
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class StreetAddressField(dataclasses_utils.DataClassJsonMixin):
-    country: str | None = None
-    countryCode: str | None = None
-    city: str | None = None
+    country: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
+    countryCode: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
+    city: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
     postalCode: str | None = None
-    state: str | None = None
+    state: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
     street: str | None = None
     subLocality: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class StreetAddress(dataclasses_utils.DataClassJsonMixin):
     field: StreetAddressField
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Url(dataclasses_utils.DataClassJsonMixin):
     field: str
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class ICloudContact(dataclasses_utils.DataClassJsonMixin):
     contactId: str
     isCompany: bool
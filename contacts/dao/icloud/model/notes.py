@@ -2,33 +2,40 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
+import json
 
 from contacts import model
 from contacts.utils import dataclasses_utils, yaml_utils
 
+_PARSED_NOTES_CACHE_SIZE = 1 << 12
 
-@dataclasses.dataclass(repr=False)
+# starts notes encoded as compact json, which notes in YAML do not start with
+_COMPACT_NOTES_MARKER = "#notes-json-v1\n"
+
+
+@dataclasses.dataclass(repr=False, slots=True)
 class School(dataclasses_utils.DataClassJsonMixin):
-    name: str
+    name: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
     grad_year: int | None = None
     majors: str | None = None
     minors: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Education(dataclasses_utils.DataClassJsonMixin):
     bachelor: School | None = None
     high_school: School | None = None
     master: School | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Favorites(dataclasses_utils.DataClassJsonMixin):
     candy: str | None = None
     color: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Notes(dataclasses_utils.DataClassJsonMixin):
     chinese_name: str | None = None
     comment: str | None = None
@@ -39,8 +46,28 @@ class Notes(dataclasses_utils.DataClassJsonMixin):
 
     @staticmethod
     def from_string(notes: str) -> Notes:
-        return Notes.from_dict(yaml_utils.load(notes))
+        # the notes of contacts that did not change are parsed again on every pull
+        return _parse(notes).copy()
 
     @staticmethod
-    def to_string(notes: Notes) -> str:
+    def to_string(notes: Notes, *, compact: bool = False) -> str:
+        if compact:
+            encoded_notes = json.dumps(
+                notes.to_dict(),
+                ensure_ascii=False,
+                separators=(",", ":"),
+                sort_keys=True,
+            )
+            return f"{_COMPACT_NOTES_MARKER}{encoded_notes}"
         return yaml_utils.dump(notes)
+
+    @staticmethod
+    def is_compact(notes: str) -> bool:
+        return notes.startswith(_COMPACT_NOTES_MARKER)
+
+
+@functools.lru_cache(maxsize=_PARSED_NOTES_CACHE_SIZE)
+def _parse(notes: str) -> Notes:
+    if Notes.is_compact(notes):
+        return Notes.from_dict(json.loads(notes[len(_COMPACT_NOTES_MARKER) :]))
+    return Notes.from_dict(yaml_utils.load(notes))
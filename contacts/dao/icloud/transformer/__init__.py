@@ -12,6 +12,7 @@ from contacts.dao.icloud.transformer import (
     icloud_group_to_group as _icloud_group_to_group,
 )
 
+RenderedNotesCache = _contact_to_icloud_contact.RenderedNotesCache
 contact_to_icloud_contact = _contact_to_icloud_contact.contact_to_icloud_contact
 group_to_icloud_group = _group_to_icloud_group.group_to_icloud_group
 icloud_contact_to_contact = _icloud_contact_to_contact.icloud_contact_to_contact
@@ -1,18 +1,71 @@
 """Convert a model.Contact into an icloud.model.ICloudContact."""
 from __future__ import annotations
 
+import hashlib
+import json
+
 from contacts import model
 from contacts.common import constant
 from contacts.dao import icloud
 from contacts.dao.icloud.model import notes as nt
-from contacts.utils import uuid_utils
+from contacts.utils import cache_utils, uuid_utils
+
+# bump whenever notes are rendered differently, so that cached notes are discarded
+_RENDERED_NOTES_CACHE_VERSION = 1
+_MAX_RENDERED_NOTES = 1 << 16
+
+
+class RenderedNotesCache:
+    """The rendered notes of contacts, by a hash of the fields they are rendered from.
 
+    Counts its hits and misses, and keeps the most recently used notes when dumped.
+    """
+
+    def __init__(self, hash_to_notes: dict[str, str] | None = None) -> None:
+        self.hash_to_notes = hash_to_notes or {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def load(path: str) -> RenderedNotesCache:
+        """Load the cache dumped to a file, or an empty cache if there is none."""
+        return RenderedNotesCache(
+            cache_utils.load_pickle(path, [], _RENDERED_NOTES_CACHE_VERSION)
+        )
 
-def contact_to_icloud_contact(contact: model.Contact) -> icloud.model.ICloudContact:
+    def dump(self, path: str) -> None:
+        """Dump the cache to a file."""
+        recent_items = list(self.hash_to_notes.items())[-_MAX_RENDERED_NOTES:]
+        cache_utils.dump_pickle(
+            path, [], [], _RENDERED_NOTES_CACHE_VERSION, dict(recent_items)
+        )
+
+    def render(self, contact: model.Contact, *, compact: bool = False) -> str:
+        """Render the notes of a contact, unless they were rendered before."""
+        notes_hash = _hash_notes_fields(contact, compact)
+        # notes are moved to the end whenever they are used, so the oldest come first
+        notes = self.hash_to_notes.pop(notes_hash, None)
+        if notes is None:
+            self.misses += 1
+            notes = nt.Notes.to_string(_extract_notes(contact), compact=compact)
+        else:
+            self.hits += 1
+        self.hash_to_notes[notes_hash] = notes
+        return notes
+
+
+def contact_to_icloud_contact(
+    contact: model.Contact,
+    rendered_notes: RenderedNotesCache | None = None,
+    *,
+    compact_notes: bool = False,
+) -> icloud.model.ICloudContact:
     """Convert a model.Contact into an icloud.model.ICloudContact.
 
     Args:
         contact: The contact to transform.
+        rendered_notes: The cache to render the notes of the contact through, if any.
+        compact_notes: Whether to encode the notes as compact json instead of YAML.
 
     Returns:
         The transformed icloud.model.ICloudContact.
@@ -64,7 +117,11 @@ def contact_to_icloud_contact(contact: model.Contact) -> icloud.model.ICloudCont
         or contact.name.chinese_name
         or contact.notes
     ):
-        icloud_contact.notes = nt.Notes.to_string(_extract_notes(contact))
+        icloud_contact.notes = (
+            nt.Notes.to_string(_extract_notes(contact), compact=compact_notes)
+            if rendered_notes is None
+            else rendered_notes.render(contact, compact=compact_notes)
+        )
 
     return icloud_contact
 
@@ -159,6 +216,20 @@ def _transform_street_addresses(
     return icloud_street_addresses
 
 
+def _hash_notes_fields(contact: model.Contact, compact: bool) -> str:
+    fields = [
+        compact,
+        contact.name.chinese_name,
+        contact.notes,
+        contact.favorite,
+        contact.friends_friend,
+        None if contact.dated is None else contact.dated.to_dict(),
+        None if contact.education is None else contact.education.to_dict(),
+    ]
+    encoded_fields = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(encoded_fields.encode(), digest_size=16).hexdigest()
+
+
 def _extract_notes(contact: model.Contact) -> nt.Notes:
     notes = nt.Notes()
     if contact.name.chinese_name is not None:
@@ -6,6 +6,7 @@ import re
 from contacts import model
 from contacts.dao import icloud
 from contacts.dao.icloud.model import notes as nt
+from contacts.utils import dataclasses_utils
 
 PHONE_NUMBER_REGEX = re.compile(r"^\+\d+$")
 AMERICAN_NUMBER_REGEX = re.compile(r"\d{10}")
@@ -80,6 +81,8 @@ def icloud_contact_to_contact(
             print(contact)
             raise e
 
+    # tags and majors are split out of longer strings, so they are not interned yet
+    dataclasses_utils.intern_strings(contact)
     return contact
 
 
@@ -0,0 +1,78 @@
+"""Tests for contacts.dao.icloud.transformer."""
+from __future__ import annotations
+
+import os.path
+
+from contacts import model
+from contacts.dao.icloud import transformer
+from contacts.dao.icloud.model import notes as nt
+from contacts.fixtures import contact_fixtures
+
+
+def _build_contact() -> model.Contact:
+    return contact_fixtures.build(
+        name=model.Name(first_name="Alice", chinese_name="爱丽丝"),
+        notes="notes",
+        education=model.Education(
+            high_school=model.HighSchool(
+                name=model.HighSchoolName.NEEDHAM_HIGH_SCHOOL, graduation_year=2014
+            )
+        ),
+    )
+
+
+def test_rendered_notes_are_cached() -> None:
+    contact = _build_contact()
+    rendered_notes = transformer.RenderedNotesCache()
+
+    notes = transformer.contact_to_icloud_contact(contact, rendered_notes).notes
+    cached_notes = transformer.contact_to_icloud_contact(contact, rendered_notes).notes
+
+    assert notes == cached_notes == transformer.contact_to_icloud_contact(contact).notes
+    assert (rendered_notes.hits, rendered_notes.misses) == (1, 1)
+
+    contact.notes = "other notes"
+    notes = transformer.contact_to_icloud_contact(contact, rendered_notes).notes
+
+    assert notes == transformer.contact_to_icloud_contact(contact).notes
+    assert (rendered_notes.hits, rendered_notes.misses) == (1, 2)
+
+
+def test_rendered_notes_cache_round_trips(tmp_path) -> None:
+    path = os.path.join(tmp_path, "rendered-notes.pickle")
+    contact = _build_contact()
+    rendered_notes = transformer.RenderedNotesCache()
+    transformer.contact_to_icloud_contact(contact, rendered_notes)
+
+    rendered_notes.dump(path)
+    loaded_rendered_notes = transformer.RenderedNotesCache.load(path)
+    transformer.contact_to_icloud_contact(contact, loaded_rendered_notes)
+
+    assert (loaded_rendered_notes.hits, loaded_rendered_notes.misses) == (1, 0)
+    assert transformer.RenderedNotesCache.load(f"{path}.missing").hash_to_notes == {}
+
+
+def test_compact_notes_round_trip() -> None:
+    contact = _build_contact()
+
+    compact_notes = transformer.contact_to_icloud_contact(
+        contact, compact_notes=True
+    ).notes
+    notes = transformer.contact_to_icloud_contact(contact).notes
+
+    assert compact_notes is not None and notes is not None
+    assert nt.Notes.is_compact(compact_notes) and not nt.Notes.is_compact(notes)
+    assert nt.Notes.from_string(compact_notes) == nt.Notes.from_string(notes)
+
+
+def test_rendered_notes_are_cached_by_format() -> None:
+    contact = _build_contact()
+    rendered_notes = transformer.RenderedNotesCache()
+
+    notes = transformer.contact_to_icloud_contact(contact, rendered_notes).notes
+    compact_notes = transformer.contact_to_icloud_contact(
+        contact, rendered_notes, compact_notes=True
+    ).notes
+
+    assert notes != compact_notes
+    assert (rendered_notes.hits, rendered_notes.misses) == (0, 2)
@@ -1,6 +1,400 @@
 """The local data source."""
 from __future__ import annotations
 
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Sequence
+from typing import Any, overload
+
+from contacts import model
+from contacts.common import constant
+from contacts.utils import (
+    cache_utils,
+    contact_utils,
+    dataclasses_utils,
+    file_io_utils,
+    journal_utils,
+)
+
+# bump whenever tables are added to or derived differently from the contacts, so
+# that databases created before are imported again
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    icloud_uuid TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    mtime REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_icloud_uuid ON contacts (icloud_uuid);
+CREATE INDEX IF NOT EXISTS contacts_name ON contacts (last_name, first_name);
+CREATE INDEX IF NOT EXISTS contacts_mtime ON contacts (mtime);
+CREATE TABLE IF NOT EXISTS contact_tags (
+    tag TEXT NOT NULL,
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, contact_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS contact_tags_contact_id ON contact_tags (contact_id);
+CREATE TABLE IF NOT EXISTS contact_phone_numbers (
+    phone_number TEXT NOT NULL,
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    PRIMARY KEY (phone_number, contact_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS contact_phone_numbers_contact_id
+    ON contact_phone_numbers (contact_id);
+CREATE TABLE IF NOT EXISTS contact_email_addresses (
+    email_address TEXT NOT NULL,
+    contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE,
+    PRIMARY KEY (email_address, contact_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS contact_email_addresses_contact_id
+    ON contact_email_addresses (contact_id);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_ORDER_BY = "ORDER BY last_name, first_name, id"
+
 
 class LocalDao:
-    pass
+    """A SQLite database of contacts that mirrors a contacts json file."""
+
+    _connection: sqlite3.Connection | None = None
+
+    def is_synced_with(self, source_paths: Sequence[str]) -> bool:
+        """Check if the database reflects the files contacts are stored in.
+
+        Args:
+            source_paths: The paths of the files the contacts are stored in.
+
+        Returns:
+            Whether the database was last imported from, exported to, or written
+            alongside the files in their current state.
+        """
+        if self._connection is None and not os.path.isfile(_database_path()):
+            return False
+        row = (
+            self._get_connection()
+            .execute("SELECT value FROM metadata WHERE key = 'source'")
+            .fetchone()
+        )
+        return row is not None and json.loads(row[0]) == _stat_sources(source_paths)
+
+    def import_json(self, path: str) -> None:
+        """Replace the contacts in the database with the contacts in a json file.
+
+        Args:
+            path: The path of the contacts json file, whose journal is replayed.
+        """
+        self.import_objects(
+            journal_utils.iter_json_objects(path, key="id"), _json_source_paths(path)
+        )
+
+    def import_objects(
+        self, objects: Iterable[dict], source_paths: Sequence[str]
+    ) -> None:
+        """Replace the contacts in the database with json objects.
+
+        Args:
+            objects: The json objects of the contacts.
+            source_paths: The paths of the files the objects were read from.
+        """
+        connection = self._get_connection()
+        with connection:
+            connection.execute("DELETE FROM contacts")
+            for obj in objects:
+                _put_object(connection, obj)
+            _record_sources(connection, source_paths)
+
+    def export_json(self, path: str) -> None:
+        """Write the contacts in the database to a json file.
+
+        Args:
+            path: The path of the contacts json file to write.
+        """
+        file_io_utils.write_contacts_as_json_array(path, self.read_contacts())
+        journal_utils.discard(path)
+        connection = self._get_connection()
+        with connection:
+            _record_sources(connection, _json_source_paths(path))
+
+    def write_contacts(
+        self,
+        contacts: Iterable[model.Contact],
+        deleted_ids: Iterable[int] = (),
+        *,
+        source_paths: Sequence[str] | None = None,
+    ) -> None:
+        """Insert, update and delete contacts.
+
+        Args:
+            contacts: The contacts to insert or update.
+            deleted_ids: The ids of the contacts to delete.
+            source_paths: The paths of the files that the same changes were written
+                to, if any.
+        """
+        connection = self._get_connection()
+        with connection:
+            for contact in contacts:
+                _put_object(connection, contact.to_dict())
+            connection.executemany(
+                "DELETE FROM contacts WHERE id = ?",
+                ((contact_id,) for contact_id in deleted_ids),
+            )
+            if source_paths is not None:
+                _record_sources(connection, source_paths)
+
+    def read_contacts(self) -> list[model.DiskContact]:
+        """Read all contacts.
+
+        Returns:
+            All the contacts, ordered by name.
+        """
+        return self._read_contacts(f"SELECT data FROM contacts {_ORDER_BY}")
+
+    @overload
+    def read_contacts_by_ids(self, ids: Iterable[int]) -> list[model.DiskContact]:
+        ...
+
+    @overload
+    def read_contacts_by_ids(
+        self, ids: Iterable[int], *, fields: Sequence[str]
+    ) -> list[Any]:
+        ...
+
+    def read_contacts_by_ids(
+        self, ids: Iterable[int], *, fields: Sequence[str] | None = None
+    ) -> list[Any]:
+        """Read the contacts with the given ids.
+
+        Args:
+            ids: The ids of the contacts.
+            fields: The field paths to project the contacts onto, if only those are
+                needed. See dataclasses_utils.projector().
+
+        Returns:
+            The contacts that exist, or their projections, ordered by name.
+        """
+        return self._read_contacts(
+            f"SELECT data FROM contacts "
+            f"WHERE id IN (SELECT value FROM json_each(?)) {_ORDER_BY}",
+            json.dumps(list(ids)),
+            fields=fields,
+        )
+
+    def read_contact_by_icloud_uuid(self, uuid: str) -> model.DiskContact | None:
+        """Read the contact with the given iCloud uuid.
+
+        Args:
+            uuid: The iCloud uuid of the contact.
+
+        Returns:
+            The contact, or None if there is no such contact.
+        """
+        contacts = self._read_contacts(
+            "SELECT data FROM contacts WHERE icloud_uuid = ?", uuid
+        )
+        return contacts[0] if contacts else None
+
+    @overload
+    def read_contacts_by_tags(self, tags: Iterable[str]) -> list[model.DiskContact]:
+        ...
+
+    @overload
+    def read_contacts_by_tags(
+        self, tags: Iterable[str], *, fields: Sequence[str]
+    ) -> list[Any]:
+        ...
+
+    def read_contacts_by_tags(
+        self, tags: Iterable[str], *, fields: Sequence[str] | None = None
+    ) -> list[Any]:
+        """Read the contacts that have all the given tags.
+
+        Args:
+            tags: The tags the contacts must have.
+            fields: The field paths to project the contacts onto, if only those are
+                needed. See dataclasses_utils.projector().
+
+        Returns:
+            The matching contacts, or their projections, ordered by name.
+        """
+        tags = set(tags)
+        return self._read_contacts(
+            f"SELECT data FROM contacts WHERE id IN ("
+            f"SELECT contact_id FROM contact_tags "
+            f"WHERE tag IN (SELECT value FROM json_each(?)) "
+            f"GROUP BY contact_id HAVING COUNT(*) = ?"
+            f") {_ORDER_BY}",
+            json.dumps(list(tags)),
+            len(tags),
+            fields=fields,
+        )
+
+    def read_contacts_by_phone_number(
+        self, phone_number: str
+    ) -> list[model.DiskContact]:
+        """Read the contacts that have a phone number.
+
+        Args:
+            phone_number: The phone number, normalized with
+                contact_utils.normalize_phone_number().
+
+        Returns:
+            The matching contacts, ordered by name.
+        """
+        return self._read_contacts(
+            f"SELECT data FROM contacts WHERE id IN ("
+            f"SELECT contact_id FROM contact_phone_numbers WHERE phone_number = ?"
+            f") {_ORDER_BY}",
+            phone_number,
+        )
+
+    def read_contacts_by_email_address(
+        self, email_address: str
+    ) -> list[model.DiskContact]:
+        """Read the contacts that have an email address.
+
+        Args:
+            email_address: The email address, normalized with
+                contact_utils.normalize_email_address().
+
+        Returns:
+            The matching contacts, ordered by name.
+        """
+        return self._read_contacts(
+            f"SELECT data FROM contacts WHERE id IN ("
+            f"SELECT contact_id FROM contact_email_addresses WHERE email_address = ?"
+            f") {_ORDER_BY}",
+            email_address,
+        )
+
+    def read_tags(self) -> list[str]:
+        """Read all tags.
+
+        Returns:
+            A sorted list of all the tags the contacts have.
+        """
+        return [
+            row[0]
+            for row in self._get_connection().execute(
+                "SELECT DISTINCT tag FROM contact_tags ORDER BY tag"
+            )
+        ]
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _read_contacts(
+        self, sql: str, *params: Any, fields: Sequence[str] | None = None
+    ) -> list[Any]:
+        decode = (
+            model.LazyDiskContact.from_trusted_dict
+            if fields is None
+            else dataclasses_utils.projector(model.DiskContact, fields)
+        )
+        return [
+            decode(json.loads(row[0]))
+            for row in self._get_connection().execute(sql, params)
+        ]
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(_database_path())
+            self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection.executescript(_SCHEMA)
+            (schema_version,) = self._connection.execute(
+                "PRAGMA user_version"
+            ).fetchone()
+            if schema_version != _SCHEMA_VERSION:
+                # new tables are empty, so the database no longer reflects any file
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM metadata WHERE key = 'source'"
+                    )
+                    self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        return self._connection
+
+
+def _database_path() -> str:
+    return os.path.join(constant.DATA_DIRECTORY, constant.CONTACTS_DATABASE_FILE_NAME)
+
+
+def _put_object(connection: sqlite3.Connection, obj: dict) -> None:
+    name = obj.get("name") or {}
+    icloud = obj.get("icloud") or {}
+    connection.execute(
+        "INSERT OR REPLACE INTO contacts "
+        "(id, icloud_uuid, first_name, last_name, mtime, data) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            obj["id"],
+            icloud.get("uuid"),
+            name.get("first_name"),
+            name.get("last_name"),
+            obj.get("mtime"),
+            json.dumps(obj, ensure_ascii=False),
+        ),
+    )
+    connection.execute("DELETE FROM contact_tags WHERE contact_id = ?", (obj["id"],))
+    connection.executemany(
+        "INSERT OR IGNORE INTO contact_tags (tag, contact_id) VALUES (?, ?)",
+        ((tag, obj["id"]) for tag in obj.get("tags") or []),
+    )
+    connection.execute(
+        "DELETE FROM contact_phone_numbers WHERE contact_id = ?", (obj["id"],)
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO contact_phone_numbers (phone_number, contact_id) "
+        "VALUES (?, ?)",
+        (
+            (
+                contact_utils.normalize_phone_number(
+                    phone_number.get("country_code", model.CountryCode.NANP),
+                    phone_number["number"],
+                ),
+                obj["id"],
+            )
+            for phone_number in obj.get("phone_numbers") or []
+        ),
+    )
+    connection.execute(
+        "DELETE FROM contact_email_addresses WHERE contact_id = ?", (obj["id"],)
+    )
+    connection.executemany(
+        "INSERT OR IGNORE INTO contact_email_addresses (email_address, contact_id) "
+        "VALUES (?, ?)",
+        (
+            (contact_utils.normalize_email_address(email_address["address"]), obj["id"])
+            for email_address in obj.get("email_addresses") or []
+        ),
+    )
+
+
+def _json_source_paths(path: str) -> list[str]:
+    return [path, journal_utils.journal_path(path)]
+
+
+def _record_sources(connection: sqlite3.Connection, paths: Sequence[str]) -> None:
+    connection.execute(
+        "INSERT OR REPLACE INTO metadata (key, value) VALUES ('source', ?)",
+        (json.dumps(_stat_sources(paths)),),
+    )
+
+
+def _stat_sources(paths: Sequence[str]) -> list:
+    return [
+        [os.path.abspath(path) for path in paths],
+        [
+            None if stat is None else list(stat)
+            for stat in cache_utils.stat_sources(paths)
+        ],
+    ]
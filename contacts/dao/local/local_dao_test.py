@@ -0,0 +1,165 @@
+"""Tests for contacts.dao.local.local_dao."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from contacts import model
+from contacts.common import constant
+from contacts.dao.local import local_dao
+from contacts.utils import file_io_utils, journal_utils
+
+
+def _build(contact_id: int, first_name: str, **kwargs) -> model.DiskContact:
+    return model.DiskContact(
+        id=contact_id,
+        mtime=0.0,
+        name=model.Name(first_name=first_name, last_name="Smith"),
+        icloud=model.ICloudMetadata(uuid=f"UUID-{contact_id}"),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def dao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir(constant.DATA_DIRECTORY)
+    dao = local_dao.LocalDao()
+    yield dao
+    dao.close()
+
+
+@pytest.fixture
+def contacts_path(dao) -> str:
+    path = os.path.join(constant.DATA_DIRECTORY, constant.CONTACTS_FILE_NAME)
+    file_io_utils.write_contacts_as_json_array(
+        path,
+        [
+            _build(1, "Alice", tags=["NU", "CTY"]),
+            _build(2, "Bob", tags=["NU"]),
+            _build(3, "Carol"),
+        ],
+    )
+    return path
+
+
+def test_import_json(dao, contacts_path) -> None:
+    assert not dao.is_synced_with(
+        [contacts_path, journal_utils.journal_path(contacts_path)]
+    )
+
+    dao.import_json(contacts_path)
+
+    assert dao.is_synced_with(
+        [contacts_path, journal_utils.journal_path(contacts_path)]
+    )
+    assert [contact.id for contact in dao.read_contacts()] == [1, 2, 3]
+    assert dao.read_tags() == ["CTY", "NU"]
+
+
+def test_import_json_replays_journal(dao, contacts_path) -> None:
+    journal_utils.append(contacts_path, "id", [_build(4, "Dave").to_dict()], [3])
+
+    dao.import_json(contacts_path)
+
+    assert [contact.id for contact in dao.read_contacts()] == [1, 2, 4]
+
+
+def test_read_contacts_by_tags_requires_all_tags(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+
+    assert [contact.id for contact in dao.read_contacts_by_tags(["NU"])] == [1, 2]
+    assert [contact.id for contact in dao.read_contacts_by_tags(["NU", "CTY"])] == [1]
+    assert dao.read_contacts_by_tags(["Sharks"]) == []
+
+
+def test_read_contacts_by_tags_onto_fields(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+
+    projections = dao.read_contacts_by_tags(["NU"], fields=["name.first_name", "tags"])
+
+    assert [
+        (projection.name.first_name, projection.tags) for projection in projections
+    ] == [("Alice", ["CTY", "NU"]), ("Bob", ["NU"])]
+    assert not hasattr(projections[0], "id")
+
+
+def test_read_contacts_by_ids_and_icloud_uuid(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+
+    assert [contact.id for contact in dao.read_contacts_by_ids([3, 1, 5])] == [1, 3]
+    assert dao.read_contact_by_icloud_uuid("UUID-2") == _build(2, "Bob", tags=["NU"])
+    assert dao.read_contact_by_icloud_uuid("UUID-5") is None
+
+
+def test_write_contacts_updates_tags(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+
+    dao.write_contacts([_build(2, "Bob", tags=["Sharks"])], deleted_ids=[1])
+
+    assert dao.read_tags() == ["Sharks"]
+    assert [contact.id for contact in dao.read_contacts()] == [2, 3]
+
+
+def test_read_contacts_by_phone_number_and_email_address(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+    dao.write_contacts(
+        [
+            _build(
+                4,
+                "Dave",
+                phone_numbers=[
+                    model.PhoneNumber(
+                        number="871234567", country_code=model.CountryCode.IRELAND
+                    )
+                ],
+                email_addresses=[
+                    model.EmailAddresss(address="Dave.Smith@example.com", label="HOME")
+                ],
+            )
+        ]
+    )
+
+    assert [
+        contact.id for contact in dao.read_contacts_by_phone_number("+353871234567")
+    ] == [4]
+    assert [
+        contact.id
+        for contact in dao.read_contacts_by_email_address("davesmith@examplecom")
+    ] == [4]
+
+    dao.write_contacts([_build(4, "Dave")])
+
+    assert dao.read_contacts_by_phone_number("+353871234567") == []
+    assert dao.read_contacts_by_email_address("davesmith@examplecom") == []
+
+
+def test_import_json_again_after_schema_change(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+    dao._get_connection().execute("PRAGMA user_version = 0")
+    dao.close()
+
+    assert not dao.is_synced_with(
+        [contacts_path, journal_utils.journal_path(contacts_path)]
+    )
+
+
+def test_export_json_round_trips(dao, contacts_path) -> None:
+    dao.import_json(contacts_path)
+    dao.write_contacts([_build(4, "Dave")])
+    exported_path = os.path.join(constant.DATA_DIRECTORY, "exported.json")
+
+    dao.export_json(exported_path)
+
+    assert dao.is_synced_with(
+        [exported_path, journal_utils.journal_path(exported_path)]
+    )
+    assert file_io_utils.read_json_array_as_dataclass_objects(
+        exported_path, model.DiskContact
+    ) == [
+        _build(1, "Alice", tags=["NU", "CTY"]),
+        _build(2, "Bob", tags=["NU"]),
+        _build(3, "Carol"),
+        _build(4, "Dave"),
+    ]
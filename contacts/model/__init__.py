@@ -28,6 +28,7 @@ StreetAddress = contact.StreetAddress
 
 Contact = contact.Contact
 DiskContact = contact.DiskContact
+LazyDiskContact = contact.LazyDiskContact
 
 Family = family.Family
 Group = group.Group
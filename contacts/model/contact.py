@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import dataclasses
+from collections.abc import Hashable
 from typing import Any
 
 import dataclasses_json
@@ -10,27 +11,31 @@ from contacts.model import date, enumeration
 from contacts.utils import dataclasses_utils
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class HighSchool(dataclasses_utils.DataClassJsonMixin):
-    name: str
+    name: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
     graduation_year: int | None = None
 
     def __post_init__(self):
         assert self.name in enumeration.HighSchoolName.values()
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class University(dataclasses_utils.DataClassJsonMixin):
-    name: str
+    name: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
     graduation_year: int | None = None
-    majors: list[str] | None = None
-    minors: list[str] | None = None
+    majors: list[str] | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
+    minors: list[str] | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
 
     def __post_init__(self):
         assert self.name in enumeration.UniversityName.values()
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Education(dataclasses_utils.DataClassJsonMixin):
     bachelor: University | None = None
     high_school: HighSchool | None = None
@@ -40,13 +45,16 @@ class Education(dataclasses_utils.DataClassJsonMixin):
     phd: University | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class EmailAddress(dataclasses_utils.DataClassJsonMixin):
     address: str
-    label: str
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
 
+    def diff_key(self) -> Hashable | None:
+        return self.address
 
-@dataclasses.dataclass(repr=False)
+
+@dataclasses.dataclass(repr=False, slots=True)
 class ICloudPhotoCrop(dataclasses_utils.DataClassJsonMixin):
     height: int
     width: int
@@ -54,7 +62,7 @@ class ICloudPhotoCrop(dataclasses_utils.DataClassJsonMixin):
     y: int
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class ICloudPhoto(dataclasses_utils.DataClassJsonMixin):
     url: str
     crop: ICloudPhotoCrop | None = None
@@ -62,14 +70,14 @@ class ICloudPhoto(dataclasses_utils.DataClassJsonMixin):
     whitelisted: bool | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class ICloudContactMetadata(dataclasses_utils.DataClassJsonMixin):
     uuid: str
     etag: str | None = None
     photo: ICloudPhoto | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Name(dataclasses_utils.DataClassJsonMixin):
     prefix: str | None = None
     first_name: str | None = None
@@ -80,56 +88,70 @@ class Name(dataclasses_utils.DataClassJsonMixin):
     chinese_name: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class PhoneNumber(dataclasses_utils.DataClassJsonMixin):
     number: str
     country_code: int = enumeration.CountryCode.NANP.value
-    label: str | None = None
+    label: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
 
     def __post_init__(self):
         assert self.country_code in enumeration.CountryCode.values()
 
+    def diff_key(self) -> Hashable | None:
+        return self.country_code, self.number
+
 
 # https://www.facebook.com/help/211813265517027
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class FacebookProfile(dataclasses_utils.DataClassJsonMixin):
     user_id: str | None = None
     username: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class GameCenterProfile(dataclasses_utils.DataClassJsonMixin):
     link: str
     username: str
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class InstagramProfile(dataclasses_utils.DataClassJsonMixin):
     username: str
     finsta_usernames: list[str] | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class SocialProfiles(dataclasses_utils.DataClassJsonMixin):
     facebook: FacebookProfile | None = None
     game_center: GameCenterProfile | None = None
     instagram: InstagramProfile | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class StreetAddress(dataclasses_utils.DataClassJsonMixin):
-    label: str
-    country: str | None = None
-    city: str | None = None
+    label: str = dataclasses.field(metadata=dataclasses_utils.config(intern=True))
+    country: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
+    city: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
     postal_code: str | None = None
-    state: str | None = None
+    state: str | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
     street: list[str] | None = None
 
     def __post_init__(self):
         assert self.country is None or self.country in enumeration.Country.values()
 
+    def diff_key(self) -> Hashable | None:
+        return self.label
+
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Contact(dataclasses_utils.DataClassJsonMixin):
     # Required
     name: Name
@@ -154,7 +176,9 @@ class Contact(dataclasses_utils.DataClassJsonMixin):
     phone_numbers: list[PhoneNumber] | None = None
     social_profiles: SocialProfiles | None = None
     street_addresses: list[StreetAddress] | None = None
-    tags: list[str] | None = None
+    tags: list[str] | None = dataclasses.field(
+        default=None, metadata=dataclasses_utils.config(intern=True)
+    )
 
     # Meta information
     mtime: float | None = None
@@ -163,17 +187,29 @@ class Contact(dataclasses_utils.DataClassJsonMixin):
     icloud: ICloudContactMetadata | None = None
 
     def __setattr__(self, key: str, value: Any) -> None:
+        # super() without arguments refers to the class that slots=True replaces
         if key == "email_addresses" and value is not None:
-            super().__setattr__(
+            super(Contact, self).__setattr__(
                 key,
                 sorted(value, key=lambda email_address: email_address.address),
             )
         elif key == "tags" and value is not None:
-            super().__setattr__(key, list(sorted(set(value))))
+            super(Contact, self).__setattr__(key, list(sorted(set(value))))
         else:
-            super().__setattr__(key, value)
+            super(Contact, self).__setattr__(key, value)
 
 
 class DiskContact(Contact):
+    __slots__ = ()
+
     id: int
     mtime: float
+
+
+@dataclasses_utils.lazy_fields(
+    "dated", "education", "social_profiles", "street_addresses"
+)
+class LazyDiskContact(DiskContact):
+    """A contact on disk whose rarely used nested fields are decoded on access."""
+
+    __slots__ = ()
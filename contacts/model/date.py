@@ -50,7 +50,7 @@ def decoder(date: str | None) -> model.Date | None:
     return model.Date(year=year, month=month, day=day)
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class DateRange(dataclasses_utils.DataClassJsonMixin):
     start: Date | None = dataclasses.field(
         metadata=dataclasses_json.config(
@@ -66,7 +66,7 @@ class DateRange(dataclasses_utils.DataClassJsonMixin):
     )
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Date(dataclasses_utils.DataClassJsonMixin):
     day: int | None = None
     month: int | None = None
@@ -16,7 +16,7 @@ def _children_decoder(d: list[dict | int] | None) -> list[Family | int] | None:
     )
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Family(dataclasses_utils.DataClassJsonMixin):
     parents: list[int] | None = None
     children: list[Family | int] | None = dataclasses.field(
@@ -6,14 +6,14 @@ import dataclasses
 from contacts.utils import dataclasses_utils
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class ICloudGroupMetadata(dataclasses_utils.DataClassJsonMixin):
     contact_uuids: list[str]
     uuid: str
     etag: str | None = None
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class Group(dataclasses_utils.DataClassJsonMixin):
     icloud: ICloudGroupMetadata
     name: str
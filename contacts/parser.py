@@ -24,9 +24,13 @@ def _create_parser() -> argparse.ArgumentParser:
     _build_add_command_parser(command_parser)
     _build_dump_command_parser(command_parser)
     _build_families_command_parser(command_parser)
+    _build_layout_command_parser(command_parser)
     _build_load_command_parser(command_parser)
+    _build_lookup_command_parser(command_parser)
+    _build_notes_command_parser(command_parser)
     _build_pull_command_parser(command_parser)
     _build_push_command_parser(command_parser)
+    _build_search_command_parser(command_parser)
     _build_tag_command_parser(command_parser)
     _build_sync_groups_command_parser(command_parser)
     _build_validate_command_parser(command_parser)
@@ -58,6 +62,19 @@ def _build_families_command_parser(command_parser: argparse._SubParsersAction) -
     )
 
 
+def _build_layout_command_parser(command_parser: argparse._SubParsersAction) -> None:
+    layout_parser = command_parser.add_parser(
+        command.Command.LAYOUT.value,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="convert the layout of the contacts on disk",
+    )
+    layout_parser.add_argument(
+        "layout",
+        choices=["json", "sharded"],
+        help="a single json file, or one json file per contact",
+    )
+
+
 def _build_load_command_parser(command_parser: argparse._SubParsersAction) -> None:
     load_parser = command_parser.add_parser(
         command.Command.LOAD.value,
@@ -67,6 +84,32 @@ def _build_load_command_parser(command_parser: argparse._SubParsersAction) -> No
     load_parser.add_argument("name", nargs="?")
 
 
+def _build_lookup_command_parser(command_parser: argparse._SubParsersAction) -> None:
+    lookup_parser = command_parser.add_parser(
+        command.Command.LOOKUP.value,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="find the contacts with a phone number or email address",
+    )
+    lookup_parser.add_argument(
+        "query",
+        help="a phone number, which is American unless it starts with +, "
+        "or an email address",
+    )
+
+
+def _build_notes_command_parser(command_parser: argparse._SubParsersAction) -> None:
+    notes_parser = command_parser.add_parser(
+        command.Command.NOTES.value,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="rewrite the notes of the iCloud contacts in a format",
+    )
+    notes_parser.add_argument(
+        "format",
+        choices=["json", "yaml"],
+        help="compact json, or YAML",
+    )
+
+
 def _build_pull_command_parser(command_parser: argparse._SubParsersAction) -> None:
     pull_parser = command_parser.add_parser(
         command.Command.PULL.value,
@@ -98,6 +141,18 @@ def _build_push_command_parser(command_parser: argparse._SubParsersAction) -> No
     )
 
 
+def _build_search_command_parser(command_parser: argparse._SubParsersAction) -> None:
+    search_parser = command_parser.add_parser(
+        command.Command.SEARCH.value,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        help="search contacts by name, tolerating typos",
+    )
+    search_parser.add_argument("query")
+    search_parser.add_argument(
+        "--limit", type=int, default=10, help="the maximum number of contacts to list"
+    )
+
+
 def _build_sync_groups_command_parser(
     command_parser: argparse._SubParsersAction,
 ) -> None:
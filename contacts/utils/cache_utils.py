@@ -0,0 +1,121 @@
+"""Utilities for caches of data derived from files."""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+from contacts.utils import file_io_utils
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def stat_sources(paths: Sequence[str]) -> list[tuple[int, int] | None]:
+    """Get the size and modification time of source files.
+
+    Args:
+        paths: The paths of the source files.
+
+    Returns:
+        The size and modification time in nanoseconds of each file, or None for
+        files that do not exist.
+    """
+    stats: list[tuple[int, int] | None] = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stats.append((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            stats.append(None)
+    return stats
+
+
+def hash_sources(paths: Sequence[str]) -> list[str | None]:
+    """Hash the contents of source files.
+
+    Args:
+        paths: The paths of the source files.
+
+    Returns:
+        The hex digest of each file, or None for files that do not exist.
+    """
+    digests: list[str | None] = []
+    for path in paths:
+        try:
+            with open(path, mode="rb") as f:
+                digest = hashlib.sha256()
+                while chunk := f.read(_HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+            digests.append(digest.hexdigest())
+        except FileNotFoundError:
+            digests.append(None)
+    return digests
+
+
+def load_pickle(
+    cache_path: str, source_paths: Sequence[str], version: Hashable
+) -> Any | None:
+    """Load an object cached for a set of source files.
+
+    The cached object is only returned if it was dumped with the same version and
+    the source files still have the same size, modification time and contents.
+
+    Args:
+        cache_path: The path of the cache file.
+        source_paths: The paths of the files the object was derived from.
+        version: The version of the format of the cached object.
+
+    Returns:
+        The cached object, or None if the cache is missing or stale.
+    """
+    try:
+        with open(cache_path, mode="rb") as f:
+            header = pickle.load(f)
+            if (
+                header["version"] != version
+                or header["stats"] != stat_sources(source_paths)
+                or header["hashes"] != hash_sources(source_paths)
+            ):
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # a cache written by an older version of the code may no longer unpickle
+        return None
+
+
+def dump_pickle(
+    cache_path: str,
+    source_paths: Sequence[str],
+    source_stats: list[tuple[int, int] | None],
+    version: Hashable,
+    obj: Any,
+) -> None:
+    """Cache an object derived from a set of source files.
+
+    Nothing is cached if the source files changed while the object was derived.
+
+    Args:
+        cache_path: The path of the cache file.
+        source_paths: The paths of the files the object was derived from.
+        source_stats: The stats of the source files from before they were read.
+        version: The version of the format of the cached object.
+        obj: The object to cache.
+    """
+    if stat_sources(source_paths) != source_stats:
+        return None
+    header = {
+        "version": version,
+        "stats": source_stats,
+        "hashes": hash_sources(source_paths),
+    }
+    try:
+        with file_io_utils.open_atomic(cache_path, binary=True) as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # the cache is an optimization, so failing to write it is not an error
+        pass
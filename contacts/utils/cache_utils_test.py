@@ -0,0 +1,68 @@
+"""Tests for contacts.utils.cache_utils."""
+from __future__ import annotations
+
+import os.path
+
+from contacts.utils import cache_utils
+
+
+def _write(path: str, text: str) -> None:
+    with open(path, mode="w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_load_returns_dumped_object(tmp_path) -> None:
+    source_path = os.path.join(tmp_path, "source.json")
+    missing_path = os.path.join(tmp_path, "missing.json")
+    cache_path = os.path.join(tmp_path, "cache.pickle")
+    _write(source_path, "[1, 2]")
+    source_paths = [source_path, missing_path]
+
+    cache_utils.dump_pickle(
+        cache_path, source_paths, cache_utils.stat_sources(source_paths), 1, [1, 2]
+    )
+
+    assert cache_utils.load_pickle(cache_path, source_paths, 1) == [1, 2]
+
+
+def test_load_misses_on_changed_source(tmp_path) -> None:
+    source_path = os.path.join(tmp_path, "source.json")
+    cache_path = os.path.join(tmp_path, "cache.pickle")
+    _write(source_path, "[1, 2]")
+    cache_utils.dump_pickle(
+        cache_path, [source_path], cache_utils.stat_sources([source_path]), 1, [1, 2]
+    )
+
+    _write(source_path, "[1, 2, 3]")
+
+    assert cache_utils.load_pickle(cache_path, [source_path], 1) is None
+
+
+def test_load_misses_on_changed_version(tmp_path) -> None:
+    source_path = os.path.join(tmp_path, "source.json")
+    cache_path = os.path.join(tmp_path, "cache.pickle")
+    _write(source_path, "[1, 2]")
+    cache_utils.dump_pickle(
+        cache_path, [source_path], cache_utils.stat_sources([source_path]), 1, [1, 2]
+    )
+
+    assert cache_utils.load_pickle(cache_path, [source_path], 2) is None
+
+
+def test_dump_skips_source_changed_while_reading(tmp_path) -> None:
+    source_path = os.path.join(tmp_path, "source.json")
+    cache_path = os.path.join(tmp_path, "cache.pickle")
+    _write(source_path, "[1, 2]")
+    source_stats = cache_utils.stat_sources([source_path])
+
+    _write(source_path, "[1, 2, 3]")
+    cache_utils.dump_pickle(cache_path, [source_path], source_stats, 1, [1, 2])
+
+    assert not os.path.exists(cache_path)
+
+
+def test_load_misses_on_corrupt_cache(tmp_path) -> None:
+    cache_path = os.path.join(tmp_path, "cache.pickle")
+    _write(cache_path, "not a pickle")
+
+    assert cache_utils.load_pickle(cache_path, [], 1) is None
@@ -1,33 +1,379 @@
 """High-level utilities for commands."""
 from __future__ import annotations
 
+import dataclasses
+import functools
+import json
 import os.path
-from collections.abc import Sequence
+from collections.abc import Collection, Iterable, Iterator, Sequence
+from typing import Any, NamedTuple, cast, overload
 
 from contacts import model
 from contacts.common import constant
-from contacts.dao import icloud_dao
+from contacts.dao import icloud_dao, local_dao
 from contacts.utils import (
+    cache_utils,
     contact_utils,
+    dataclasses_utils,
     file_io_utils,
+    frame_utils,
     input_utils,
+    journal_utils,
     json_utils,
+    lazy_json_utils,
+    name_index_utils,
     progress_utils,
+    shard_utils,
 )
 
+# the fingerprints of the contacts last read from or written to each contacts file
+_path_to_contact_id_to_fingerprint: dict[str, dict[int, int]] = {}
 
-@progress_utils.annotate("Reading contacts from disk")
+# pickled contacts are only loaded by code with the same model fields
+_CONTACTS_CACHE_VERSION = tuple(
+    (cls.__qualname__, tuple(field.name for field in dataclasses.fields(cls)))
+    for module in (model.contact, model.date)
+    for cls in vars(module).values()
+    if isinstance(cls, type) and dataclasses.is_dataclass(cls)
+)
+
+
+class _ContactSummary(NamedTuple):
+    id: int
+    icloud_uuid: str | None
+    name_parts: tuple[str, str, str, str, str]
+
+
+_CONTACTS_INDEX_VERSION = _ContactSummary._fields
+
+# frames built with numpy are only loaded by code that has numpy, and vice versa
+_CONTACT_FRAME_VERSION = (frame_utils.BACKEND, _CONTACTS_CACHE_VERSION)
+
+
+@overload
 def read_contacts_from_disk(
     *, file_name: str = constant.CONTACTS_FILE_NAME
 ) -> list[model.DiskContact]:
-    contacts = file_io_utils.read_json_array_as_dataclass_objects(
-        os.path.join(constant.DATA_DIRECTORY, file_name),
+    ...
+
+
+@overload
+def read_contacts_from_disk(
+    *, file_name: str = constant.CONTACTS_FILE_NAME, fields: Sequence[str]
+) -> list[Any]:
+    ...
+
+
+@progress_utils.annotate("Reading contacts from disk")
+def read_contacts_from_disk(
+    *,
+    file_name: str = constant.CONTACTS_FILE_NAME,
+    fields: Sequence[str] | None = None,
+) -> list[Any]:
+    """Read the contacts on disk.
+
+    Commands that only read a few fields of the contacts should pass them as fields,
+    and get lightweight projections that cannot be written back instead.
+    """
+    if fields is not None:
+        project = dataclasses_utils.projector(model.DiskContact, fields)
+        projections = [project(obj) for obj in _iter_contact_objects(file_name)]
+        progress_utils.message(f"Read {len(projections)} contact(s)")
+        return projections
+
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    source_paths = _contacts_source_paths(file_name)
+    cache_path = os.path.join(constant.CACHE_DIRECTORY, f"{file_name}.pickle")
+
+    cached = cache_utils.load_pickle(cache_path, source_paths, _CONTACTS_CACHE_VERSION)
+    if cached is not None:
+        _path_to_contact_id_to_fingerprint[path], contacts = cached
+    else:
+        source_stats = cache_utils.stat_sources(source_paths)
+        contacts = list(iter_contacts_from_disk(file_name=file_name))
+        cache_utils.dump_pickle(
+            cache_path,
+            source_paths,
+            source_stats,
+            _CONTACTS_CACHE_VERSION,
+            (_path_to_contact_id_to_fingerprint[path], contacts),
+        )
+    progress_utils.message(f"Read {len(contacts)} contact(s)")
+    return contacts
+
+
+def iter_contacts_from_disk(
+    *, file_name: str = constant.CONTACTS_FILE_NAME
+) -> Iterator[model.DiskContact]:
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    id_to_fingerprint: dict[int, int] = {}
+    for obj in _iter_contact_objects(file_name):
+        # the contacts file is only written by this tool, so it needs no validation
+        contact = model.LazyDiskContact.from_trusted_dict(obj)
+        # objects on disk were encoded by to_json(), so encoding them again in C
+        # gives back the json, without going through the much slower to_json()
+        encoded_json = json.dumps(obj, ensure_ascii=False)
+        contact.cache_json(encoded_json)
+        id_to_fingerprint[obj["id"]] = journal_utils.fingerprint_json(encoded_json)
+        yield contact
+    _path_to_contact_id_to_fingerprint[path] = id_to_fingerprint
+
+
+@progress_utils.annotate("Opening contacts on disk")
+def open_contacts_from_disk(
+    *, file_name: str = constant.CONTACTS_FILE_NAME
+) -> lazy_json_utils.LazyJsonArray[model.DiskContact]:
+    """Open the contacts on disk without decoding them.
+
+    The contacts file is memory-mapped and each contact is decoded when it is accessed.
+    The byte ranges of the contacts in the file are cached alongside the summaries
+    needed to look them up by id, iCloud uuid and name. Sharded contacts are parsed
+    up front, but still only decoded when they are accessed.
+    """
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    directory = _shard_directory(file_name)
+    if shard_utils.is_sharded(directory):
+        objects = list(shard_utils.iter_json_objects(directory))
+        progress_utils.message(f"Opened {len(objects)} contact(s)")
+        return _build_lazy_contacts(
+            shard_utils.manifest_path(directory),
+            objects,
+            [_summarize_contact(obj) for obj in objects],
+        )
+
+    cache_path = os.path.join(constant.CACHE_DIRECTORY, f"{file_name}.index.pickle")
+
+    index = cache_utils.load_pickle(cache_path, [path], _CONTACTS_INDEX_VERSION)
+    if index is None:
+        source_stats = cache_utils.stat_sources([path])
+        index = lazy_json_utils.index_json_array(path, _summarize_contact)
+        cache_utils.dump_pickle(
+            cache_path, [path], source_stats, _CONTACTS_INDEX_VERSION, index
+        )
+    ranges, summaries = index
+
+    id_to_journaled_object = journal_utils.read_journal(path)
+    elements: list[tuple[int, int] | dict] = []
+    element_summaries: list[_ContactSummary] = []
+    for element, summary in zip(ranges, summaries):
+        if summary.id in id_to_journaled_object:
+            element = id_to_journaled_object.pop(summary.id)
+            if element is None:
+                continue
+            summary = _summarize_contact(element)
+        elements.append(element)
+        element_summaries.append(summary)
+    for obj in id_to_journaled_object.values():
+        if obj is not None:
+            elements.append(obj)
+            element_summaries.append(_summarize_contact(obj))
+
+    progress_utils.message(f"Opened {len(elements)} contact(s)")
+    return _build_lazy_contacts(path, elements, element_summaries)
+
+
+def _build_lazy_contacts(
+    path: str,
+    elements: Sequence[tuple[int, int] | dict],
+    summaries: Sequence[_ContactSummary],
+) -> lazy_json_utils.LazyJsonArray[model.DiskContact]:
+    return lazy_json_utils.LazyJsonArray(
+        path,
         model.DiskContact,
+        elements,
+        summaries,
+        trusted=True,
+        key_functions={
+            "id": lambda summary: summary.id,
+            "icloud_uuid": lambda summary: summary.icloud_uuid,
+        },
+    )
+
+
+@progress_utils.annotate("Reading contact frame from disk")
+def read_contact_frame_from_disk(
+    *, file_name: str = constant.CONTACTS_FILE_NAME
+) -> frame_utils.ContactFrame:
+    """Read the contacts on disk as columns.
+
+    The frame is cached alongside the contacts, so it is only built again once the
+    contacts change.
+    """
+    source_paths = _contacts_source_paths(file_name)
+    cache_path = os.path.join(constant.CACHE_DIRECTORY, f"{file_name}.frame.pickle")
+
+    frame = cache_utils.load_pickle(cache_path, source_paths, _CONTACT_FRAME_VERSION)
+    if frame is None:
+        source_stats = cache_utils.stat_sources(source_paths)
+        frame = frame_utils.ContactFrame(_iter_contact_objects(file_name))
+        cache_utils.dump_pickle(
+            cache_path, source_paths, source_stats, _CONTACT_FRAME_VERSION, frame
+        )
+    progress_utils.message(f"Read {len(frame)} contact(s)")
+    return frame
+
+
+@progress_utils.annotate("Converting contacts to the sharded layout")
+def convert_contacts_to_sharded_layout(
+    *, file_name: str = constant.CONTACTS_FILE_NAME
+) -> None:
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    directory = _shard_directory(file_name)
+    if shard_utils.is_sharded(directory):
+        progress_utils.message("Contacts are already sharded")
+        return None
+
+    written_objects, _ = shard_utils.write_json_objects(
+        directory, journal_utils.iter_json_objects(path, key="id")
+    )
+    os.remove(path)
+    journal_utils.discard(path)
+    _path_to_contact_id_to_fingerprint.pop(path, None)
+    progress_utils.message(f"Wrote {len(written_objects)} shard(s)")
+
+
+@progress_utils.annotate("Converting contacts to the json layout")
+def convert_contacts_to_json_layout(
+    *, file_name: str = constant.CONTACTS_FILE_NAME
+) -> None:
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    directory = _shard_directory(file_name)
+    if not shard_utils.is_sharded(directory):
+        progress_utils.message("Contacts are not sharded")
+        return None
+
+    contacts = [
+        model.DiskContact.from_trusted_dict(obj)
+        for obj in shard_utils.iter_json_objects(directory)
+    ]
+    _compact_contacts_on_disk(path, contacts)
+    shard_utils.remove(directory)
+    _path_to_contact_id_to_fingerprint.pop(path, None)
+    progress_utils.message(f"Wrote {len(contacts)} contact(s)")
+
+
+@overload
+def read_contacts_by_ids_from_database(ids: Iterable[int]) -> list[model.DiskContact]:
+    ...
+
+
+@overload
+def read_contacts_by_ids_from_database(
+    ids: Iterable[int], *, fields: Sequence[str]
+) -> list[Any]:
+    ...
+
+
+@progress_utils.annotate("Reading contacts from database")
+def read_contacts_by_ids_from_database(
+    ids: Iterable[int], *, fields: Sequence[str] | None = None
+) -> list[Any]:
+    _sync_database()
+    contacts = (
+        local_dao.read_contacts_by_ids(ids)
+        if fields is None
+        else local_dao.read_contacts_by_ids(ids, fields=fields)
+    )
+    progress_utils.message(f"Read {len(contacts)} contact(s)")
+    return contacts
+
+
+@overload
+def read_contacts_by_tags_from_database(
+    tags: Iterable[str],
+) -> list[model.DiskContact]:
+    ...
+
+
+@overload
+def read_contacts_by_tags_from_database(
+    tags: Iterable[str], *, fields: Sequence[str]
+) -> list[Any]:
+    ...
+
+
+@progress_utils.annotate("Reading contacts from database")
+def read_contacts_by_tags_from_database(
+    tags: Iterable[str], *, fields: Sequence[str] | None = None
+) -> list[Any]:
+    _sync_database()
+    contacts = (
+        local_dao.read_contacts_by_tags(tags)
+        if fields is None
+        else local_dao.read_contacts_by_tags(tags, fields=fields)
+    )
+    progress_utils.message(f"Read {len(contacts)} contact(s)")
+    return contacts
+
+
+@progress_utils.annotate("Reading tags from database")
+def read_tags_from_database() -> list[str]:
+    _sync_database()
+    tags = local_dao.read_tags()
+    progress_utils.message(f"Read {len(tags)} tag(s)")
+    return tags
+
+
+@progress_utils.annotate("Reading contacts from database")
+def read_contacts_by_phone_number_from_database(
+    phone_number: str,
+) -> list[model.DiskContact]:
+    """Read the contacts that have a phone number, as typed by a user.
+
+    See contact_utils.parse_phone_number().
+    """
+    _sync_database()
+    contacts = local_dao.read_contacts_by_phone_number(
+        contact_utils.parse_phone_number(phone_number)
+    )
+    progress_utils.message(f"Read {len(contacts)} contact(s)")
+    return contacts
+
+
+@progress_utils.annotate("Reading contacts from database")
+def read_contacts_by_email_address_from_database(
+    email_address: str,
+) -> list[model.DiskContact]:
+    """Read the contacts that have an email address, or an equivalent one.
+
+    See contact_utils.normalize_email_address().
+    """
+    _sync_database()
+    contacts = local_dao.read_contacts_by_email_address(
+        contact_utils.normalize_email_address(email_address)
     )
     progress_utils.message(f"Read {len(contacts)} contact(s)")
     return contacts
 
 
+def _sync_database() -> None:
+    source_paths = _contacts_source_paths(constant.CONTACTS_FILE_NAME)
+    if not local_dao.is_synced_with(source_paths):
+        local_dao.import_objects(
+            _iter_contact_objects(constant.CONTACTS_FILE_NAME), source_paths
+        )
+
+
+def _shard_directory(file_name: str) -> str:
+    return os.path.join(constant.DATA_DIRECTORY, os.path.splitext(file_name)[0])
+
+
+def _contacts_source_paths(file_name: str) -> list[str]:
+    directory = _shard_directory(file_name)
+    if shard_utils.is_sharded(directory):
+        return [shard_utils.manifest_path(directory)]
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    return [path, journal_utils.journal_path(path)]
+
+
+def _iter_contact_objects(file_name: str) -> Iterator[dict]:
+    directory = _shard_directory(file_name)
+    if shard_utils.is_sharded(directory):
+        return shard_utils.iter_json_objects(directory)
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    return journal_utils.iter_json_objects(path, key="id")
+
+
 @progress_utils.annotate("Reading new contacts from disk")
 def read_new_contacts_from_disk(
     *, file_name: str = constant.NEW_CONTACTS_FILE_NAME
@@ -56,13 +402,72 @@ def read_groups_from_icloud() -> list[model.Group]:
 
 @progress_utils.annotate("Writing contacts to disk")
 def write_contacts_to_disk(
-    contacts: Sequence[model.Contact], *, file_name: str = constant.CONTACTS_FILE_NAME
+    contacts: Collection[model.Contact], *, file_name: str = constant.CONTACTS_FILE_NAME
 ) -> None:
-    file_io_utils.write_contacts_as_json_array(
-        os.path.join(constant.DATA_DIRECTORY, file_name),
-        contacts,
+    path = os.path.join(constant.DATA_DIRECTORY, file_name)
+    directory = _shard_directory(file_name)
+    id_to_contact = {cast(int, contact.id): contact for contact in contacts}
+    previous_id_to_fingerprint = _path_to_contact_id_to_fingerprint.get(path)
+    # contacts that did not change since they were read or written keep their
+    # fingerprints, so that only the changed ones are encoded and fingerprinted
+    id_to_fingerprint = {
+        contact_id: (
+            previous_id_to_fingerprint[contact_id]
+            if previous_id_to_fingerprint is not None
+            and contact_id in previous_id_to_fingerprint
+            and not contact.is_dirty()
+            else journal_utils.fingerprint_json(contact.to_cached_json())
+        )
+        for contact_id, contact in id_to_contact.items()
+    }
+    database_synced = (
+        file_name == constant.CONTACTS_FILE_NAME
+        and local_dao.is_synced_with(_contacts_source_paths(file_name))
     )
-    progress_utils.message(f"Wrote {len(contacts)} contact(s) to disk")
+
+    sharded = shard_utils.is_sharded(directory)
+    if previous_id_to_fingerprint is None:
+        if not sharded:
+            _compact_contacts_on_disk(path, contacts)
+            _path_to_contact_id_to_fingerprint[path] = id_to_fingerprint
+            progress_utils.message(f"Wrote {len(contacts)} contact(s) to disk")
+            return None
+        # decoding the cached json is much faster than re-encoding the contacts
+        written_objects, deleted_ids = shard_utils.write_json_objects(
+            directory, (json.loads(contact.to_cached_json()) for contact in contacts)
+        )
+        put_ids = [obj["id"] for obj in written_objects]
+    else:
+        put_ids = [
+            contact_id
+            for contact_id, fingerprint in id_to_fingerprint.items()
+            if previous_id_to_fingerprint.get(contact_id) != fingerprint
+        ]
+        deleted_ids = previous_id_to_fingerprint.keys() - id_to_fingerprint.keys()
+        put_objects = [
+            json.loads(id_to_contact[contact_id].to_cached_json())
+            for contact_id in put_ids
+        ]
+        if sharded:
+            shard_utils.update_json_objects(directory, put_objects, deleted_ids)
+        else:
+            journal_size = journal_utils.append(path, "id", put_objects, deleted_ids)
+            if journal_size > constant.JOURNAL_COMPACTION_THRESHOLD_BYTES:
+                _compact_contacts_on_disk(path, contacts)
+
+    if database_synced:
+        local_dao.write_contacts(
+            [id_to_contact[contact_id] for contact_id in put_ids],
+            deleted_ids,
+            source_paths=_contacts_source_paths(file_name),
+        )
+    _path_to_contact_id_to_fingerprint[path] = id_to_fingerprint
+    progress_utils.message(f"Wrote {len(put_ids) + len(deleted_ids)} change(s) to disk")
+
+
+def _compact_contacts_on_disk(path: str, contacts: Collection[model.Contact]) -> None:
+    file_io_utils.write_contacts_as_json_array(path, list(contacts))
+    journal_utils.discard(path)
 
 
 @progress_utils.annotate("Loading contact")
@@ -85,7 +490,9 @@ def read_loaded_contact_from_disk() -> model.DiskContact:
 def write_new_contacts_to_icloud(contacts: list[model.Contact]) -> None:
     if len(contacts) > 0:
         icloud_dao.create_contacts(contacts)
-    progress_utils.message(f"Created {len(contacts)} contact(s)")
+    progress_utils.message(
+        f"Created {len(contacts)} contact(s), {_summarize_rendered_notes()}"
+    )
 
 
 @progress_utils.annotate("Updating iCloud contacts")
@@ -94,7 +501,20 @@ def write_updated_contacts_to_icloud(
 ) -> None:
     if len(contacts) > 0:
         icloud_dao.update_contacts(contacts)
-    progress_utils.message(f"Updated {len(contacts)} contact(s)")
+    progress_utils.message(
+        f"Updated {len(contacts)} contact(s), {_summarize_rendered_notes()}"
+    )
+
+
+def _summarize_rendered_notes() -> str:
+    hits, misses = icloud_dao.count_rendered_notes()
+    return f"notes cache {hits} hit(s) {misses} miss(es)"
+
+
+@progress_utils.annotate("Rewriting iCloud notes")
+def migrate_icloud_notes(notes_format: str) -> None:
+    count, batch_count = icloud_dao.migrate_notes(notes_format)
+    progress_utils.message(f"Rewrote {count} note(s) in {batch_count} batch(es)")
 
 
 @progress_utils.annotate("Creating iCloud group")
@@ -121,17 +541,23 @@ def write_updated_group_to_icloud(
 def read_families_from_disk(
     *, file_name: str = constant.FAMILIES_FILE_NAME
 ) -> list[model.Family]:
-    families = file_io_utils.read_json_array_as_dataclass_objects(
+    families = list(iter_families_from_disk(file_name=file_name))
+    progress_utils.message(f"Read {len(families)} families(s)")
+    return families
+
+
+def iter_families_from_disk(
+    *, file_name: str = constant.FAMILIES_FILE_NAME
+) -> Iterator[model.Family]:
+    return file_io_utils.iter_json_array_as_dataclass_objects(
         os.path.join(constant.DATA_DIRECTORY, file_name),
         model.Family,
     )
-    progress_utils.message(f"Read {len(families)} families(s)")
-    return families
 
 
 def get_contact_by_name(
-    contacts: Sequence[model.Contact], name: str | None = None
-) -> model.Contact | None:
+    contacts: Sequence[model.DiskContact], name: str | None = None
+) -> model.DiskContact | None:
     if name is None:
         name = input_utils.basic_input(
             "Enter the name of the contact to select", lower=True
@@ -140,6 +566,10 @@ def get_contact_by_name(
         name = name.lower()
 
     matching_contacts = _get_matching_contacts(contacts, name)
+    if len(matching_contacts) == 0:
+        matching_contacts = search_contacts(contacts, name)
+        if matching_contacts:
+            print(f"No exact match for {name}, selecting from similar names")
     if len(matching_contacts) == 0:
         return None
     elif len(matching_contacts) == 1:
@@ -171,29 +601,99 @@ def get_contact_by_name(
         return matching_contacts[selection - 1]
 
 
+def search_contacts(
+    contacts: Sequence[model.DiskContact], query: str, *, limit: int = 10
+) -> list[model.DiskContact]:
+    """Find the contacts whose names are close to a query, tolerating typos.
+
+    Args:
+        contacts: The contacts to search.
+        query: The name to search for.
+        limit: The maximum number of contacts to find.
+
+    Returns:
+        The closest contacts, best first. See name_index_utils.NameIndex.rank().
+    """
+    name_index, id_to_position = _get_name_index(contacts)
+    return [
+        contacts[id_to_position[contact_id]]
+        for contact_id in name_index.rank(query, limit=limit)
+    ]
+
+
 def _get_matching_contacts(
-    contacts: Sequence[model.Contact], name: str
-) -> list[model.Contact]:
-    name = " ".join(name.strip().split())
-    matching_contacts = []
-
-    if name.count(" ") == 1:
-        first_name, last_name = name.split()
-        for contact in contacts:
-            if (
-                first_name in f"{contact.name.first_name}".lower()
-                or first_name in f"{contact.name.nickname}".lower()
-            ) and last_name in f"{contact.name.last_name}".lower():
-                matching_contacts.append(contact)
-                continue
+    contacts: Sequence[model.DiskContact], name: str
+) -> list[model.DiskContact]:
+    name_index, id_to_position = _get_name_index(contacts)
+    matching_ids = name_index.search(name)
+    return [
+        contacts[i]
+        for i in sorted(id_to_position[contact_id] for contact_id in matching_ids)
+    ]
+
+
+def _get_name_index(
+    contacts: Sequence[model.DiskContact],
+) -> tuple[name_index_utils.NameIndex, dict[int, int]]:
+    if isinstance(contacts, lazy_json_utils.LazyJsonArray):
+        summaries = contacts.summaries
+    else:
+        summaries = [
+            _ContactSummary(
+                id=contact.id,
+                icloud_uuid=None,
+                name_parts=_build_name_parts(
+                    contact.name.first_name,
+                    contact.name.nickname,
+                    contact.name.middle_name,
+                    contact.name.last_name,
+                    contact.name.chinese_name,
+                ),
+            )
+            for contact in contacts
+        ]
+    id_to_position = {summary.id: i for i, summary in enumerate(summaries)}
+
+    path = os.path.join(constant.CACHE_DIRECTORY, constant.NAME_INDEX_FILE_NAME)
+    name_index = _load_name_index(os.path.abspath(path))
+    # only the contacts whose names changed since they were last indexed are indexed
+    if name_index.sync({summary.id: summary.name_parts for summary in summaries}):
+        name_index.dump(path)
+    return name_index, id_to_position
+
+
+# the index is loaded once and kept up to date for the rest of the session
+@functools.cache
+def _load_name_index(path: str) -> name_index_utils.NameIndex:
+    return name_index_utils.NameIndex.load(path)
+
+
+def _build_name_parts(
+    first_name: str | None,
+    nickname: str | None,
+    middle_name: str | None,
+    last_name: str | None,
+    chinese_name: str | None,
+) -> tuple[str, str, str, str, str]:
+    return (
+        name_index_utils.normalize(first_name),
+        name_index_utils.normalize(nickname),
+        name_index_utils.normalize(middle_name),
+        name_index_utils.normalize(last_name),
+        name_index_utils.normalize(chinese_name),
+    )
+
 
-    for contact in contacts:
-        contact_name = (
-            f"{contact.name.first_name} "
-            f"{contact.name.nickname} "
-            f"{contact.name.middle_name} "
-            f"{contact.name.last_name}"
-        ).lower()
-        if name in contact_name:
-            matching_contacts.append(contact)
-    return matching_contacts
+def _summarize_contact(obj: dict) -> _ContactSummary:
+    name = obj["name"]
+    return _ContactSummary(
+        id=obj["id"],
+        icloud_uuid=(obj.get("icloud") or {}).get("uuid"),
+        name_parts=_build_name_parts(
+            name.get("first_name"),
+            name.get("nickname"),
+            name.get("middle_name"),
+            name.get("last_name"),
+            name.get("chinese_name"),
+        ),
+    )
@@ -3,9 +3,37 @@ from __future__ import annotations
 
 import re
 from collections.abc import Sequence
+from typing import Protocol
 
 from contacts import model
 
+_NON_DIGIT_REGEX = re.compile(r"\D")
+
+# the number of digits of an American phone number, without its country code
+_NANP_NUMBER_LENGTH = 10
+
+
+class _Name(Protocol):
+    @property
+    def first_name(self) -> str | None:
+        ...
+
+    @property
+    def last_name(self) -> str | None:
+        ...
+
+
+class NamedContact(Protocol):
+    """A contact, or a projection of contacts onto their id and name."""
+
+    @property
+    def id(self) -> int | None:
+        ...
+
+    @property
+    def name(self) -> _Name:
+        ...
+
 
 def add_email_address_if_not_exists(
     contact: model.Contact, email_address: str, label: str
@@ -56,7 +84,52 @@ def add_phone_number_if_not_exists(
     contact.phone_numbers.append(new_phone_number)
 
 
-def build_name_str(contact: model.Contact) -> str:
+def normalize_email_address(email_address: str) -> str:
+    """Normalize an email address, so that equivalent addresses compare equal.
+
+    Args:
+        email_address: An email address.
+
+    Returns:
+        The email address casefolded and without dots.
+    """
+    return email_address.casefold().replace(".", "")
+
+
+def normalize_phone_number(country_code: int, number: str) -> str:
+    """Normalize a phone number to the E.164 format.
+
+    Args:
+        country_code: The country code of the phone number.
+        number: The phone number without the country code.
+
+    Returns:
+        The phone number as a plus sign, the country code and the digits of the number.
+    """
+    return f"+{country_code}{_NON_DIGIT_REGEX.sub('', number)}"
+
+
+def parse_phone_number(text: str) -> str:
+    """Parse a phone number typed by a user to the E.164 format.
+
+    Args:
+        text: A phone number, which is American unless it starts with a plus sign.
+            An American number may start with its country code, 1.
+
+    Returns:
+        The phone number as a plus sign, the country code and the digits of the number.
+    """
+    if text.strip().startswith("+"):
+        return f"+{_NON_DIGIT_REGEX.sub('', text)}"
+    digits = _NON_DIGIT_REGEX.sub("", text)
+    if len(digits) == _NANP_NUMBER_LENGTH + 1 and digits.startswith(
+        str(model.CountryCode.NANP.value)
+    ):
+        digits = digits[1:]
+    return normalize_phone_number(model.CountryCode.NANP, digits)
+
+
+def build_name_str(contact: NamedContact) -> str:
     """Extract the name from a contact.
 
     Args:
@@ -73,7 +146,7 @@ def build_name_str(contact: model.Contact) -> str:
     return " ".join(name_parts)
 
 
-def build_name_and_id_str(contact: model.Contact) -> str:
+def build_name_and_id_str(contact: NamedContact) -> str:
     """Extract the name and id from a contact.
 
     Args:
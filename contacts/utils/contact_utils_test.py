@@ -102,3 +102,18 @@ def test_add_phone_number_error_if_number_not_all_digits() -> None:
         contact_utils.add_phone_number_if_not_exists(
             contact_fixtures.build(), model.CountryCode.NANP, "123a", "HOME"
         )
+
+
+def test_normalize_email_address() -> None:
+    assert (
+        contact_utils.normalize_email_address("First.Last@Example.com")
+        == "firstlast@examplecom"
+    )
+
+
+def test_normalize_and_parse_phone_number() -> None:
+    assert contact_utils.normalize_phone_number(353, "87 123-4567") == "+353871234567"
+    assert contact_utils.parse_phone_number("(617) 555-1234") == "+16175551234"
+    assert contact_utils.parse_phone_number("1-617-555-0100") == "+16175550100"
+    assert contact_utils.parse_phone_number("911") == "+1911"
+    assert contact_utils.parse_phone_number(" +353 87 123 4567") == "+353871234567"
@@ -1,35 +1,978 @@
 """Utilities for dataclasses."""
 from __future__ import annotations
 
+import abc
+import collections
 import dataclasses
-from collections.abc import Callable
-from typing import Any, TypeVar
+import datetime
+import decimal
+import functools
+import json
+import operator
+import sys
+import types
+import typing
+import uuid
+import warnings
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, ClassVar, Type, TypeVar, cast
 
 import dataclasses_json
-import jsondiff
+from dataclasses_json import core as dataclasses_json_core
+from dataclasses_json import undefined as dataclasses_json_undefined
+from dataclasses_json import utils as dataclasses_json_utils
 
+_T = TypeVar("_T", bound=type)
 _TDataClassJsonMixin = TypeVar("_TDataClassJsonMixin", bound="DataClassJsonMixin")
 
+# stands for the absence of changes, since None is a value in a diff
+_NO_CHANGES = object()
+
 
 def diff(dataclass_1: DataClassJsonMixin, dataclass_2: DataClassJsonMixin) -> dict:
-    return jsondiff.diff(
-        dataclass_1.to_dict(),
-        dataclass_2.to_dict(),
-        marshal=True,
-        syntax="explicit",
+    """Diff two dataclass objects.
+
+    The diff has the shape of the explicit syntax of jsondiff over the dicts of the
+    objects: changes to a dict are under "$insert", "$update" and "$delete", changes
+    to a list are keyed by the positions of the changed items next to "$insert" and
+    "$delete", and values are as returned by to_dict(). The items of two lists are
+    matched by their diff_key() when every item has a distinct one, and by position
+    otherwise.
+
+    Args:
+        dataclass_1: The original object.
+        dataclass_2: The changed object.
+
+    Returns:
+        The changes from the original object to the changed object, or an empty dict
+        if there are none.
+    """
+    if dataclass_1.__class__ is dataclass_2.__class__ and dataclass_1 == dataclass_2:
+        return {}
+    changes = _diff_dataclasses(dataclass_1, dataclass_2)
+    return {} if changes is _NO_CHANGES else changes
+
+
+def _diff_dataclasses(dataclass_1: Any, dataclass_2: Any) -> Any:
+    inserts: dict[str, Any] = {}
+    updates: dict[str, Any] = {}
+    deletes: list[str] = []
+    field_encoders = _get_field_encoders(dataclass_1.__class__)
+    if dataclass_2.__class__ is not dataclass_1.__class__:
+        field_encoders = _get_field_encoders(dataclass_2.__class__) | field_encoders
+
+    for field_name, encoder in field_encoders.items():
+        value_1 = getattr(dataclass_1, field_name, None)
+        value_2 = getattr(dataclass_2, field_name, None)
+        if value_1 is value_2:
+            continue
+        if encoder is not None:
+            value_1 = encoder(value_1)
+            value_2 = encoder(value_2)
+        if value_1 is None:
+            if value_2 is not None:
+                inserts[field_name] = _encode(value_2)
+        elif value_2 is None:
+            deletes.append(field_name)
+        else:
+            changes = _diff_values(value_1, value_2)
+            if changes is not _NO_CHANGES:
+                updates[field_name] = changes
+    return _build_diff(inserts, updates, deletes)
+
+
+@functools.cache
+def _get_field_encoders(cls: type) -> dict[str, Callable[[Any], Any] | None]:
+    overrides = dataclasses_json_core._user_overrides_or_exts(cls)
+    return {
+        field.name: overrides[field.name].encoder for field in dataclasses.fields(cls)
+    }
+
+
+def _diff_values(value_1: Any, value_2: Any) -> Any:
+    if value_1.__class__ is not value_2.__class__:
+        return _encode(value_2)
+    if isinstance(value_1, DataClassJsonMixin):
+        if value_1 == value_2:
+            return _NO_CHANGES
+        return _diff_dataclasses(value_1, value_2)
+    if isinstance(value_1, list):
+        return _diff_lists(value_1, value_2)
+    if isinstance(value_1, dict):
+        return _diff_dicts(value_1, value_2)
+    return _NO_CHANGES if value_1 == value_2 else _encode(value_2)
+
+
+def _diff_dicts(dict_1: dict, dict_2: dict) -> Any:
+    if dict_1 == dict_2:
+        return _NO_CHANGES
+    inserts = {
+        key: _encode(value) for key, value in dict_2.items() if key not in dict_1
+    }
+    updates = {}
+    for key, value in dict_2.items():
+        if key in dict_1:
+            changes = _diff_values(dict_1[key], value)
+            if changes is not _NO_CHANGES:
+                updates[key] = changes
+    deletes = [key for key in dict_1 if key not in dict_2]
+    return _build_diff(inserts, updates, deletes)
+
+
+def _diff_lists(list_1: list, list_2: list) -> Any:
+    if list_1 == list_2:
+        return _NO_CHANGES
+    keys_1 = _get_diff_keys(list_1)
+    keys_2 = _get_diff_keys(list_2)
+    if keys_1 is None or keys_2 is None:
+        return _diff_lists_by_position(list_1, list_2)
+
+    key_to_position_1 = {key: i for i, key in enumerate(keys_1)}
+    key_set_2 = set(keys_2)
+    if [key for key in keys_2 if key in key_to_position_1] != [
+        key for key in keys_1 if key in key_set_2
+    ]:
+        # the items were reordered, which a diff of matched items cannot express
+        return _encode(list_2)
+
+    inserts = []
+    updates = {}
+    for i, (key, item) in enumerate(zip(keys_2, list_2)):
+        if key not in key_to_position_1:
+            inserts.append((i, _encode(item)))
+            continue
+        changes = _diff_values(list_1[key_to_position_1[key]], item)
+        if changes is not _NO_CHANGES:
+            updates[i] = changes
+    deletes = [i for i, key in enumerate(keys_1) if key not in key_set_2]
+    return _build_list_diff(inserts, updates, deletes)
+
+
+def _diff_lists_by_position(list_1: list, list_2: list) -> Any:
+    inserts = [
+        (i, _encode(item)) for i, item in enumerate(list_2[len(list_1) :], len(list_1))
+    ]
+    updates = {}
+    for i, (item_1, item_2) in enumerate(zip(list_1, list_2)):
+        changes = _diff_values(item_1, item_2)
+        if changes is not _NO_CHANGES:
+            updates[i] = changes
+    deletes = list(range(len(list_2), len(list_1)))
+    return _build_list_diff(inserts, updates, deletes)
+
+
+def _get_diff_keys(items: list) -> list[Any] | None:
+    """Get the keys that the items of a list are matched by.
+
+    Returns:
+        The key of each item, or None if some item has no key or the keys are not
+        distinct.
+    """
+    keys: list[Any] = []
+    for item in items:
+        if isinstance(item, DataClassJsonMixin):
+            key = item.diff_key()
+        elif isinstance(item, (str, int, float)):
+            key = (item.__class__, item)
+        else:
+            key = None
+        if key is None:
+            return None
+        keys.append(key)
+    return keys if len(set(keys)) == len(keys) else None
+
+
+def _build_diff(inserts: Any, updates: dict, deletes: list) -> Any:
+    changes: dict[str, Any] = {}
+    if inserts:
+        changes["$insert"] = inserts
+    if updates:
+        changes["$update"] = updates
+    if deletes:
+        changes["$delete"] = deletes
+    return changes or _NO_CHANGES
+
+
+def _build_list_diff(inserts: list, updates: dict[int, Any], deletes: list[int]) -> Any:
+    # like jsondiff, the changed items are keyed by their position
+    changes: dict[Any, Any] = dict(updates)
+    if inserts:
+        changes["$insert"] = inserts
+    if deletes:
+        changes["$delete"] = sorted(deletes, reverse=True)
+    return changes or _NO_CHANGES
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, DataClassJsonMixin):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def config(*, intern: bool = False) -> dict[str, Any]:
+    """Configure a dataclass field, like dataclasses_json.config().
+
+    Args:
+        intern: Whether to intern the string values of the field, or the strings in
+            its list values, when they are decoded. Meant for fields with few
+            distinct values, such as labels and tags.
+
+    Returns:
+        The metadata of the field.
+    """
+    return {__name__: {"intern": intern}}
+
+
+def intern_strings(dataclass: DataClassJsonMixin) -> None:
+    """Intern the strings of the interned fields of a dataclass object in place.
+
+    Objects that are decoded have their strings interned already, so this is for
+    objects that are built field by field.
+
+    Args:
+        dataclass: The object, whose nested objects are interned too.
+    """
+    interned_field_names = _get_interned_field_names(dataclass.__class__)
+    for field_name in _get_field_names(dataclass.__class__):
+        value = getattr(dataclass, field_name)
+        if field_name in interned_field_names:
+            # the interned strings are equal to the strings they replace
+            object.__setattr__(dataclass, field_name, _intern(value))
+        elif isinstance(value, DataClassJsonMixin):
+            intern_strings(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, DataClassJsonMixin):
+                    intern_strings(item)
+
+
+@functools.cache
+def _get_interned_field_names(cls: type) -> frozenset[str]:
+    return frozenset(
+        field.name
+        for field in dataclasses.fields(cls)
+        if field.metadata.get(__name__, {}).get("intern")
     )
 
 
+def _intern(value: Any) -> Any:
+    if value.__class__ is str:
+        return sys.intern(value)
+    if value.__class__ is list:
+        return [sys.intern(item) if item.__class__ is str else item for item in value]
+    return value
+
+
 def _is_none(obj) -> bool:
     return obj is None
 
 
-class DataClassJsonMixin(dataclasses_json.DataClassJsonMixin):
+@functools.cache
+def _get_field_names(cls: type) -> tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
+def _get_state(value: Any) -> Any:
+    """Get a snapshot that changes whenever a value or a value nested in it changes.
+
+    Dataclass objects are represented by the number of times their fields were
+    assigned, so that their scalar fields need not be compared. Lists and dicts are
+    copied, since they can be changed in place.
+    """
+    if isinstance(value, DataClassJsonMixin):
+        return (
+            value._modification_count,
+            tuple(
+                _get_state(get_value(value))
+                for get_value in _get_raw_value_getters(value.__class__)
+            ),
+        )
+    if isinstance(value, list):
+        return tuple((item, _get_state(item)) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, item, _get_state(item)) for key, item in value.items())
+    return None
+
+
+@functools.cache
+def _get_decoder(cls: type, trusted: bool = False) -> Callable[[Any], Any]:
+    """Get the decoder of a dataclass, compiling it on first use.
+
+    The decoder is _decode_dataclass from dataclasses_json specialized for the
+    dataclass, with infer_missing=False. The type hints, field overrides and defaults
+    are resolved once when the decoder is compiled, instead of for every object.
+    Values of unexpected types are handed back to dataclasses_json, so the decoder
+    returns and raises exactly what _decode_dataclass does.
+
+    A trusted decoder sets the fields of the objects it decodes directly, so that
+    neither __init__, __post_init__ nor __setattr__ of the dataclasses run, and
+    leaves the values of lazy fields to be decoded when they are first accessed.
+    """
+    overrides = dataclasses_json_core._user_overrides_or_exts(cls)
+    if dataclasses_json_utils._undefined_parameter_action_safe(
+        cls
+    ) is not dataclasses_json.Undefined.RAISE or any(
+        override.letter_case is not None for override in overrides.values()
+    ):
+        return functools.partial(
+            dataclasses_json_core._decode_dataclass, cls, infer_missing=False
+        )
+
+    field_types = typing.get_type_hints(cls)
+    lazy_field_names = _get_lazy_field_names(cls) if trusted else frozenset()
+    namespace = _build_decoder_namespace(cls, trusted)
+    lines = [
+        "def decode(kvs):",
+        "    if isinstance(kvs, cls):",
+        "        return kvs",
+        "    if not kvs.keys() <= field_names:",
+        "        raise_undefined(kvs)",
+    ]
+    field_values = []
+    for i, field in enumerate(dataclasses.fields(cls)):
+        if not field.init:
+            continue
+        key = repr(field.name)
+        if field.default is not dataclasses.MISSING:
+            default = _add_constant(namespace, field.default)
+            lines.append(f"    value = kvs.get({key}, {default})")
+        elif field.default_factory is not dataclasses.MISSING:
+            default_factory = _add_constant(namespace, field.default_factory)
+            lines.append(
+                f"    value = kvs[{key}] if {key} in kvs else {default_factory}()"
+            )
+        else:
+            lines.append(f"    value = kvs[{key}]")
+
+        field_type = field_types[field.name]
+        indent = "    "
+        if not dataclasses_json_utils._is_optional(field_type):
+            warning = _add_constant(
+                namespace,
+                f"`NoneType` object value of non-optional type {field.name} "
+                f"detected when decoding {cls.__name__}.",
+            )
+            lines.append("    if value is None:")
+            lines.append(f"        warn({warning}, RuntimeWarning)")
+            lines.append(f"        value_{i} = None")
+            lines.append("    else:")
+            indent = "        "
+
+        if field.name in lazy_field_names:
+            lines.append(
+                f"{indent}value_{i} = None if value is None "
+                f"else undecoded(cls, {key}, value)"
+            )
+        else:
+            expression = _build_value_decode_expression(
+                namespace, field_type, overrides[field.name]
+            )
+            lines.append(f"{indent}value_{i} = {expression}")
+            if field.name in _get_interned_field_names(cls):
+                lines.append(f"{indent}value_{i} = intern(value_{i})")
+        field_values.append((field.name, f"value_{i}"))
+    if trusted:
+        lines.append("    obj = new(cls)")
+        for field_name, value in field_values:
+            lines.append(f"    object_setattr(obj, {field_name!r}, {value})")
+        lines.append("    return obj")
+    else:
+        arguments = ", ".join(f"{name}={value}" for name, value in field_values)
+        lines.append(f"    return cls({arguments})")
+
+    code = compile("\n".join(lines), f"<decoder of {cls.__qualname__}>", "exec")
+    exec(code, namespace)
+    return namespace["decode"]
+
+
+@functools.cache
+def _get_field_decoder(cls: type, field_name: str) -> Callable[[Any], Any]:
+    """Get the trusted decoder of the values of a field, compiling it on first use.
+
+    The decoder decodes values that are not None as the trusted decoder of the
+    dataclass would, for the values of lazy fields.
+    """
+    field_type = typing.get_type_hints(cls)[field_name]
+    namespace = _build_decoder_namespace(cls, trusted=True)
+    override = dataclasses_json_core._user_overrides_or_exts(cls)[field_name]
+    expression = _build_value_decode_expression(namespace, field_type, override)
+    lines = ["def decode(value):", f"    value = {expression}"]
+    if field_name in _get_interned_field_names(cls):
+        lines.append("    value = intern(value)")
+    lines.append("    return value")
+
+    code = compile(
+        "\n".join(lines), f"<decoder of {cls.__qualname__}.{field_name}>", "exec"
+    )
+    exec(code, namespace)
+    return namespace["decode"]
+
+
+def _build_decoder_namespace(cls: type, trusted: bool) -> dict[str, Any]:
+    return {
+        "cls": cls,
+        "decode_dataclass": _decode_trusted_dataclass if trusted else _decode_dataclass,
+        "decode_generic": dataclasses_json_core._decode_generic,
+        "field_names": frozenset(_get_field_names(cls)),
+        "intern": _intern,
+        "is_dataclass": dataclasses.is_dataclass,
+        "new": object.__new__,
+        "object_setattr": object.__setattr__,
+        "raise_undefined": functools.partial(_raise_undefined_parameters, cls),
+        "support_extended_types": dataclasses_json_core._support_extended_types,
+        "undecoded": _Undecoded,
+        "warn": warnings.warn,
+    }
+
+
+def _build_value_decode_expression(
+    namespace: dict[str, Any], type_: Any, override: Any
+) -> str:
+    while dataclasses_json_utils._is_new_type(type_):
+        type_ = type_.__supertype__
+    if override.decoder is not None:
+        type_name = _add_constant(namespace, type_)
+        decoder = _add_constant(namespace, override.decoder)
+        return f"value if type(value) is {type_name} else {decoder}(value)"
+    return _build_field_decode_expression(namespace, type_)
+
+
+def _build_field_decode_expression(namespace: dict[str, Any], type_: Any) -> str:
+    type_name = _add_constant(namespace, type_)
+    if dataclasses.is_dataclass(type_):
+        return f"value if is_dataclass(value) else decode_dataclass({type_name}, value)"
+    if dataclasses_json_core._is_supported_generic(type_) and type_ is not str:
+        expression = _build_generic_decode_expression(namespace, type_)
+        return f"None if value is None else {expression}"
+    if _is_extended_type(type_):
+        return f"support_extended_types({type_name}, value)"
+    return "value"
+
+
+def _build_generic_decode_expression(namespace: dict[str, Any], type_: Any) -> str:
+    """Build the expression of _decode_generic for a value that is not None.
+
+    Only the optional and list types that the models use are specialized, behind
+    checks of the type of the value.
+    """
+    type_name = _add_constant(namespace, type_)
+    fallback = f"decode_generic({type_name}, value, False)"
+    args = typing.get_args(type_)
+
+    if dataclasses_json_utils._is_optional(type_) and len(args) == 2:
+        if args[1:] != (types.NoneType,):
+            return fallback
+        type_arg = args[0]
+        type_arg_name = _add_constant(namespace, type_arg)
+        if dataclasses.is_dataclass(type_arg):
+            return f"decode_dataclass({type_arg_name}, value)"
+        if typing.get_origin(type_arg) is list:
+            return _build_generic_decode_expression(namespace, type_arg)
+        if not dataclasses_json_core._is_supported_generic(
+            type_arg
+        ) and not _is_extended_type(type_arg):
+            return f"value if value.__class__ is {type_arg_name} else {fallback}"
+        return fallback
+
+    if typing.get_origin(type_) is list and len(args) == 1:
+        item_type = args[0]
+        if dataclasses.is_dataclass(item_type):
+            item_type_name = _add_constant(namespace, item_type)
+            return (
+                f"[decode_dataclass({item_type_name}, item) for item in value] "
+                f"if value.__class__ is list else {fallback}"
+            )
+        if not dataclasses_json_core._is_supported_generic(item_type):
+            return f"list(value) if value.__class__ is list else {fallback}"
+    return fallback
+
+
+def _is_extended_type(type_: Any) -> bool:
+    return any(
+        dataclasses_json_utils._issubclass_safe(type_, extended_type)
+        for extended_type in (datetime.datetime, decimal.Decimal, uuid.UUID)
+    )
+
+
+def _add_constant(namespace: dict[str, Any], value: Any) -> str:
+    name = f"constant_{len(namespace)}"
+    namespace[name] = value
+    return name
+
+
+def _decode_dataclass(cls: type, kvs: Any) -> Any:
+    return _get_decoder(cls)(kvs)
+
+
+def _decode_trusted_dataclass(cls: type, kvs: Any) -> Any:
+    return _get_decoder(cls, trusted=True)(kvs)
+
+
+def _raise_undefined_parameters(cls: type, kvs: Any) -> None:
+    field_names = _get_field_names(cls)
+    unknown = {k: v for k, v in kvs.items() if k not in field_names}
+    raise dataclasses_json_undefined.UndefinedParameterError(
+        f"Received undefined initialization arguments {unknown}"
+    )
+
+
+@functools.cache
+def _get_encoder(cls: type) -> Callable[[Any], dict[str, Any]]:
+    """Get the encoder of a dataclass, compiling it on first use.
+
+    The encoder is _asdict from dataclasses_json specialized for the dataclass, with
+    encode_json=False. The exclude predicates and field encoders are resolved once
+    when the encoder is compiled, and excluding None values is done inline. Values
+    of unexpected types are handed back to dataclasses_json, so the encoder returns
+    exactly what _asdict does.
+    """
+    overrides = dataclasses_json_core._user_overrides_or_exts(cls)
+    if dataclasses_json_utils._undefined_parameter_action_safe(
+        cls
+    ) is not dataclasses_json.Undefined.RAISE or any(
+        override.letter_case is not None for override in overrides.values()
+    ):
+        return functools.partial(dataclasses_json_core._asdict, encode_json=False)
+
+    field_types = typing.get_type_hints(cls)
+    namespace: dict[str, Any] = {
+        "asdict": dataclasses_json_core._asdict,
+        "atomic_types": frozenset((str, int, float, bool, types.NoneType)),
+        "encode_dataclass": _encode_dataclass,
+    }
+    lines = ["def encode(obj):", "    result = {}"]
+    for field in dataclasses.fields(cls):
+        lines.append(f"    value = obj.{field.name}")
+        override = overrides[field.name]
+        if override.encoder is None:
+            converted = _build_encode_expression(
+                namespace, field_types[field.name], "value"
+            )
+        else:
+            # dataclasses_json passes the value to the field encoder as is
+            converted = "value"
+            encoder = _add_constant(namespace, override.encoder)
+
+        indent = "        "
+        if override.exclude is _is_none:
+            # the converted value is None exactly when the value is None
+            lines.append("    if value is not None:")
+        elif override.exclude is not None:
+            exclude = _add_constant(namespace, override.exclude)
+            if converted != "value":
+                lines.append(f"    value = {converted}")
+                converted = "value"
+            lines.append(f"    if not {exclude}(value):")
+        else:
+            indent = "    "
+        encoded = converted if override.encoder is None else f"{encoder}(value)"
+        lines.append(f"{indent}result[{field.name!r}] = {encoded}")
+    lines.append("    return result")
+
+    code = compile("\n".join(lines), f"<encoder of {cls.__qualname__}>", "exec")
+    exec(code, namespace)
+    return namespace["encode"]
+
+
+def _build_encode_expression(namespace: dict[str, Any], type_: Any, value: str) -> str:
+    """Build the expression of _asdict for a value of a type.
+
+    The value is expected to be of the type with None removed from it, and values of
+    other types are handed to _asdict.
+    """
+    args = typing.get_args(type_)
+    if dataclasses_json_utils._is_optional(type_) and args[1:] == (types.NoneType,):
+        type_ = args[0]
+        args = typing.get_args(type_)
+
+    fallback = f"asdict({value})"
+    if dataclasses.is_dataclass(type_):
+        type_name = _add_constant(namespace, type_)
+        return (
+            f"encode_dataclass({type_name}, {value}) "
+            f"if {value}.__class__ is {type_name} else {fallback}"
+        )
+    if typing.get_origin(type_) is list and len(args) == 1:
+        item_expression = _build_encode_expression(namespace, args[0], "item")
+        return (
+            f"[{item_expression} for item in {value}] "
+            f"if {value}.__class__ is list else {fallback}"
+        )
+    return f"{value} if {value}.__class__ in atomic_types else {fallback}"
+
+
+def _encode_dataclass(cls: type, obj: Any) -> dict[str, Any]:
+    return _get_encoder(cls)(obj)
+
+
+def projector(cls: type, paths: Iterable[str]) -> Callable[[Any], Any]:
+    """Get a function that projects trusted json objects of a dataclass onto paths.
+
+    The projection of an object is a named tuple with a field for each distinct
+    first part of the paths, in order. A path that names a field of the dataclass
+    projects the field decoded as the trusted decoder would, and a path that goes on
+    into a field of a dataclass type, or of a list of one, projects the field onto
+    the rest of the path, so that projections read like the objects they stand for.
+    The fields of the json objects that are not projected are never decoded.
+
+    Args:
+        cls: The dataclass.
+        paths: The paths to project onto, such as "tags" and "name.first_name".
+
+    Returns:
+        The function from json objects to their projections.
+    """
+    return _get_projector(cls, tuple(paths))
+
+
+@functools.cache
+def _get_projector(cls: type, paths: tuple[str, ...]) -> Callable[[Any], Any]:
+    field_name_to_subpaths: dict[str, list[str]] = {}
+    for path in paths:
+        field_name, _, subpath = path.partition(".")
+        subpaths = field_name_to_subpaths.setdefault(field_name, [])
+        if subpath:
+            subpaths.append(subpath)
+
+    fields = {field.name: field for field in dataclasses.fields(cls)}
+    field_types = typing.get_type_hints(cls)
+    namespace: dict[str, Any] = {
+        "record": collections.namedtuple(
+            f"{cls.__name__}Projection", field_name_to_subpaths
+        )
+    }
+    lines = ["def project(kvs):"]
+    for i, (field_name, subpaths) in enumerate(field_name_to_subpaths.items()):
+        if field_name not in fields:
+            raise ValueError(f"{cls.__name__} has no field {field_name}")
+        field = fields[field_name]
+        key = repr(field_name)
+        if field.default_factory is not dataclasses.MISSING:
+            default_factory = _add_constant(namespace, field.default_factory)
+            lines.append(
+                f"    value = kvs[{key}] if {key} in kvs else {default_factory}()"
+            )
+        else:
+            default = _add_constant(
+                namespace,
+                None if field.default is dataclasses.MISSING else field.default,
+            )
+            lines.append(f"    value = kvs.get({key}, {default})")
+
+        if not subpaths:
+            decoder = _add_constant(namespace, _get_field_decoder(cls, field_name))
+            lines.append(f"    value_{i} = None if value is None else {decoder}(value)")
+            continue
+        field_type = field_types[field_name]
+        if dataclasses_json_utils._is_optional(field_type):
+            field_type = typing.get_args(field_type)[0]
+        if typing.get_origin(field_type) is list:
+            item_type = typing.get_args(field_type)[0]
+            expression = "[{}(item) for item in value]"
+        else:
+            item_type = field_type
+            expression = "{}(value)"
+        if not dataclasses.is_dataclass(item_type):
+            raise ValueError(f"{cls.__name__}.{field_name} has no fields to project")
+        project = _add_constant(
+            namespace, _get_projector(cast(type, item_type), tuple(subpaths))
+        )
+        lines.append(
+            f"    value_{i} = None if value is None else {expression.format(project)}"
+        )
+    arguments = ", ".join(f"value_{i}" for i in range(len(field_name_to_subpaths)))
+    lines.append(f"    return record({arguments})")
+
+    code = compile("\n".join(lines), f"<projector of {cls.__qualname__}>", "exec")
+    exec(code, namespace)
+    return namespace["project"]
+
+
+def lazy_fields(*field_names: str) -> Callable[[_T], _T]:
+    """Make fields of a dataclass lazy.
+
+    The trusted decoder of the dataclass keeps the json values of lazy fields as they
+    are, and decodes each one when the field is first accessed. Copies, overlays and
+    pickles of objects keep the values that are not decoded yet as they are too.
+    Objects compare equal to objects of the dataclass with the same field values.
+
+    Args:
+        field_names: The names of the fields to make lazy.
+
+    Returns:
+        A class decorator for a subclass of the dataclass with empty __slots__.
+    """
+
+    def decorate(cls: _T) -> _T:
+        for field_name in field_names:
+            setattr(cls, field_name, _LazyField(getattr(cls, field_name)))
+        setattr(cls, "__getstate__", _get_raw_state)
+        setattr(cls, "__eq__", _eq_fields)
+        return cls
+
+    return decorate
+
+
+def peek(obj: Any, field_name: str) -> Any:
+    """Get the value of a field of an object without decoding it into the object.
+
+    The value of a lazy field that is not decoded yet is decoded for the caller only,
+    which spares the object the dirty check and json caching of a first access.
+    """
+    attribute = getattr(obj.__class__, field_name, None)
+    if not isinstance(attribute, _LazyField):
+        return getattr(obj, field_name)
+    value = attribute.get_raw_value(obj)
+    if value.__class__ is _Undecoded:
+        return value.decode()
+    return value
+
+
+class _Undecoded:
+    """The json value of a lazy field that is not decoded yet."""
+
+    __slots__ = ("cls", "field_name", "value")
+
+    def __init__(self, cls: type, field_name: str, value: Any) -> None:
+        self.cls = cls
+        self.field_name = field_name
+        self.value = value
+
+    def decode(self) -> Any:
+        return _get_field_decoder(self.cls, self.field_name)(self.value)
+
+
+class _LazyField:
+    """A descriptor that decodes the value of a slot when it is first read."""
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: Any) -> None:
+        self.slot = slot
+
+    def __get__(self, obj: Any, cls: type | None = None) -> Any:
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, cls)
+        if value.__class__ is _Undecoded:
+            # decoding is not a modification, so cached json that was clean stays so
+            was_dirty = obj.is_dirty()
+            value = value.decode()
+            self.slot.__set__(obj, value)
+            if not was_dirty:
+                obj.cache_json(obj._json_cache[1])
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj: Any) -> None:
+        self.slot.__delete__(obj)
+
+    def get_raw_value(self, obj: Any) -> Any:
+        return self.slot.__get__(obj, obj.__class__)
+
+
+@functools.cache
+def _get_lazy_field_names(cls: type) -> frozenset[str]:
+    return frozenset(
+        field_name
+        for field_name in _get_field_names(cls)
+        if isinstance(getattr(cls, field_name, None), _LazyField)
+    )
+
+
+@functools.cache
+def _get_raw_value_getters(cls: type) -> tuple[Callable[[Any], Any], ...]:
+    """Get functions that get the values of the fields of a dataclass.
+
+    The values of lazy fields are returned without being decoded.
+    """
+    getters: list[Callable[[Any], Any]] = []
+    for field_name in _get_field_names(cls):
+        attribute = getattr(cls, field_name, None)
+        if isinstance(attribute, _LazyField):
+            getters.append(attribute.get_raw_value)
+        else:
+            getters.append(operator.attrgetter(field_name))
+    return tuple(getters)
+
+
+def _eq_fields(obj: Any, other: Any) -> bool:
+    if not isinstance(other, DataClassJsonMixin) or _get_field_names(
+        other.__class__
+    ) != _get_field_names(obj.__class__):
+        return NotImplemented
+    return all(
+        getattr(obj, field_name) == getattr(other, field_name)
+        for field_name in _get_field_names(obj.__class__)
+    )
+
+
+def _get_raw_state(obj: Any) -> tuple[None, dict[str, Any]]:
+    # the state that object.__getstate__() returns, but read from the slots directly
+    # instead of through the descriptors of lazy fields
+    slot_state = {}
+    for cls in obj.__class__.__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            try:
+                slot_state[name] = cls.__dict__[name].__get__(obj, cls)
+            except AttributeError:
+                pass
+    return None, slot_state
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, DataClassJsonMixin):
+        # the fields are set directly, since the copied values are already valid
+        obj = object.__new__(value.__class__)
+        for field_name, get_value in zip(
+            _get_field_names(value.__class__), _get_raw_value_getters(value.__class__)
+        ):
+            object.__setattr__(obj, field_name, _copy_value(get_value(value)))
+        return obj
+    if isinstance(value, list):
+        return [_copy_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_value(item) for key, item in value.items()}
+    return value
+
+
+class DataClassJsonMixin(abc.ABC):
+    """A slotted version of the mixin of dataclasses_json.
+
+    The mixin has no __dict__, so that dataclasses with slots=True that use it have
+    none either. Like the dataclass_json decorator of dataclasses_json, it registers
+    itself as a virtual subclass of the mixin of dataclasses_json.
+    """
+
+    __slots__ = ("_modification_count", "_json_cache", "_shared_field_names")
+
     # https://github.com/lidatong/dataclasses-json/issues/187#issuecomment-919992503
     dataclass_json_config = dataclasses_json.config(  # type: ignore
         exclude=_is_none, undefined=dataclasses_json.Undefined.RAISE  # type: ignore
     )["dataclasses_json"]
 
+    # defaults of the private slots until they are first set, so that unpickled
+    # objects start out dirty
+    _SLOT_DEFAULTS: ClassVar[dict[str, Any]] = {
+        "_modification_count": 0,
+        "_json_cache": None,
+        "_shared_field_names": frozenset(),
+    }
+
+    _modification_count: int
+    _json_cache: tuple[Any, str] | None
+    _shared_field_names: frozenset[str]
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._SLOT_DEFAULTS[name]
+        except KeyError:
+            raise AttributeError(
+                f"{self.__class__.__name__!r} object has no attribute {name!r}"
+            ) from None
+
+    def __setstate__(self, state: Any) -> None:
+        # the slots are restored as they were, without counting modifications
+        _, slot_state = state
+        for name, value in slot_state.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_json(
+        cls: Type[_TDataClassJsonMixin],
+        s: str | bytes | bytearray,
+        *,
+        infer_missing: bool = False,
+        **kw,
+    ) -> _TDataClassJsonMixin:
+        return cls.from_dict(json.loads(s, **kw), infer_missing=infer_missing)
+
+    @classmethod
+    def from_dict(
+        cls: Type[_TDataClassJsonMixin],
+        kvs: dataclasses_json_core.Json,
+        *,
+        infer_missing: bool = False,
+    ) -> _TDataClassJsonMixin:
+        if infer_missing:
+            return dataclasses_json_core._decode_dataclass(cls, kvs, infer_missing)
+        # a decoder compiled for the class, which is much faster than the generic one
+        return _get_decoder(cls)(kvs)
+
+    @classmethod
+    def from_trusted_dict(
+        cls: Type[_TDataClassJsonMixin], kvs: dataclasses_json_core.Json
+    ) -> _TDataClassJsonMixin:
+        """Decode a dict that was encoded by to_dict(), without validating it.
+
+        The fields are set without running __post_init__ or __setattr__, so the
+        checks and the normalization they do are skipped. Use validate() to run them
+        on demand.
+
+        Args:
+            kvs: The dict to decode.
+
+        Returns:
+            The decoded object.
+        """
+        return _get_decoder(cls, trusted=True)(kvs)
+
+    def validate(self) -> None:
+        """Run the checks and the normalization that from_dict() runs.
+
+        Raises:
+            AssertionError: If the object or an object nested in it is invalid or not
+                normalized.
+        """
+        normalized = self.__class__.from_dict(self.to_dict())
+        assert normalized == self, f"{self!r} is not normalized"
+
+    def to_dict(
+        self, encode_json: bool = False
+    ) -> dict[str, dataclasses_json_core.Json]:
+        if encode_json:
+            return dataclasses_json_core._asdict(self, encode_json=encode_json)
+        # an encoder compiled for the class, which is much faster than the generic one
+        return _get_encoder(self.__class__)(self)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        super().__setattr__(key, value)
+        object.__setattr__(self, "_modification_count", self._modification_count + 1)
+
+    def is_dirty(self) -> bool:
+        """Check if the object changed since its json was cached.
+
+        Returns:
+            Whether the object or any object nested in it changed since the cached
+            json was encoded, or True if no json is cached.
+        """
+        return self._json_cache is None or self._json_cache[0] != _get_state(self)
+
+    def to_cached_json(self) -> str:
+        """Encode the object to json, reusing the cached json if it is not dirty.
+
+        Returns:
+            The json encoding of the object, as returned by to_json().
+        """
+        if self._json_cache is None or self._json_cache[0] != _get_state(self):
+            self.cache_json(self.to_json())
+        return cast(tuple[Any, str], self._json_cache)[1]
+
+    def cache_json(self, encoded_json: str) -> None:
+        """Cache the json encoding of the object in its current state.
+
+        Args:
+            encoded_json: The json encoding of the object, for example the json the
+                object was just decoded from.
+        """
+        object.__setattr__(self, "_json_cache", (_get_state(self), encoded_json))
+
     def to_json(
         self: _TDataClassJsonMixin,
         *,
@@ -43,27 +986,63 @@ class DataClassJsonMixin(dataclasses_json.DataClassJsonMixin):
         sort_keys: bool = False,
         **kw,
     ) -> str:
-        return super().to_json(
+        return json.dumps(
+            self.to_dict(encode_json=False),
+            cls=dataclasses_json_core._ExtendedEncoder,
             skipkeys=skipkeys,
             ensure_ascii=ensure_ascii,
             check_circular=check_circular,
             allow_nan=allow_nan,
             indent=indent,
-            separators=separators,  # type: ignore
-            default=default,  # type: ignore
+            separators=separators,
+            default=default,
             sort_keys=sort_keys,
             **kw,
         )
 
     def __repr__(self) -> str:
-        dict_repr = ", ".join(
-            f"{k}={v!r}"
-            for k, v in filter(lambda item: item[1] is not None, self.__dict__.items())
+        values = (
+            (field_name, getattr(self, field_name))
+            for field_name in _get_field_names(self.__class__)
         )
-        return f"{self.__class__.__name__}({dict_repr})"
+        fields_repr = ", ".join(
+            f"{field_name}={value!r}"
+            for field_name, value in values
+            if value is not None
+        )
+        return f"{self.__class__.__name__}({fields_repr})"
+
+    def diff_key(self) -> Hashable | None:
+        """Get the key that identifies the object among the items of a list.
+
+        Returns:
+            The key that diff() matches the object by when the list it is in changes,
+            or None to match it by its position.
+        """
+        return None
 
     def copy(self: _TDataClassJsonMixin) -> _TDataClassJsonMixin:
-        return self.__class__.from_dict(self.to_dict())
+        return _copy_value(self)
+
+    def overlay(self: _TDataClassJsonMixin) -> _TDataClassJsonMixin:
+        """Make a copy of the object that copies nested objects on write.
+
+        The overlay shares the values of its fields with the object. patch() copies
+        a shared nested object before patching it, so patching the overlay leaves the
+        object unchanged, and the nested objects that the patch does not touch stay
+        shared. Changing a shared list or dict in place changes both objects.
+
+        Returns:
+            The overlay.
+        """
+        field_names = _get_field_names(self.__class__)
+        obj = object.__new__(self.__class__)
+        for field_name, get_value in zip(
+            field_names, _get_raw_value_getters(self.__class__)
+        ):
+            object.__setattr__(obj, field_name, get_value(self))
+        object.__setattr__(obj, "_shared_field_names", frozenset(field_names))
+        return obj
 
     def patch(self: _TDataClassJsonMixin, patch: Any) -> None:
         for field in dataclasses.fields(self):
@@ -75,6 +1054,17 @@ class DataClassJsonMixin(dataclasses_json.DataClassJsonMixin):
             elif self_value is None:
                 setattr(self, field.name, patch_value)
             elif issubclass(self_value.__class__, DataClassJsonMixin):
+                if field.name in self._shared_field_names:
+                    self_value = self_value.overlay()
+                    setattr(self, field.name, self_value)
+                    object.__setattr__(
+                        self,
+                        "_shared_field_names",
+                        self._shared_field_names - {field.name},
+                    )
                 self_value.patch(patch_value)
             else:
                 setattr(self, field.name, patch_value)
+
+
+dataclasses_json.DataClassJsonMixin.register(DataClassJsonMixin)
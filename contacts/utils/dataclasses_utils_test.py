@@ -1,8 +1,77 @@
 """Tests for contacts.utils.dataclasses_utils."""
 from __future__ import annotations
 
+import json
+import pickle
+import sys
+
+import pytest
+from dataclasses_json import core as dataclasses_json_core
+from dataclasses_json.undefined import UndefinedParameterError
+
 from contacts import model
-from contacts.utils import uuid_utils
+from contacts.common import error
+from contacts.dao.icloud import model as icloud_model
+from contacts.dao.icloud.model import notes
+from contacts.utils import dataclasses_utils, uuid_utils
+
+_SAMPLES = [
+    (
+        model.DiskContact,
+        {
+            "name": {"first_name": "John", "nickname": "J", "last_name": "Smith"},
+            "id": 1,
+            "birthday": "XXXX-01-02",
+            "dated": {"start": "2020-XX-XX", "end": None},
+            "education": {
+                "bachelor": {
+                    "name": model.UniversityName.values()[0],
+                    "graduation_year": 2020,
+                    "majors": ["a", "b"],
+                },
+                "high_school": {"name": model.HighSchoolName.values()[0]},
+            },
+            "email_addresses": [{"address": "b@b", "label": "HOME"}],
+            "favorite": {"color": "blue", "nested": {"a": [1, 2]}},
+            "phone_numbers": [{"number": "1234", "country_code": 1}],
+            "social_profiles": {"instagram": {"username": "u"}},
+            "street_addresses": [{"label": "HOME", "street": ["1 Main St"]}],
+            "tags": ["a", "b"],
+            "mtime": 1,
+            "icloud": {"uuid": "uuid", "photo": {"url": "u", "crop": None}},
+        },
+    ),
+    (model.Contact, {"name": {}}),
+    (model.Family, {"parents": [1, 2], "children": [3, {"parents": [3]}]}),
+    (
+        icloud_model.ICloudContact,
+        {
+            "contactId": "id",
+            "isCompany": False,
+            "birthday": "1604-01-02",
+            "dates": [{"label": "anniversary", "field": "2000-01-02"}],
+            "IMs": [{"field": {"IMService": "s", "userName": "u"}, "label": "l"}],
+            "streetAddresses": [{"field": {"city": "c"}, "label": "HOME"}],
+        },
+    ),
+    (
+        icloud_model.ICloudGroup,
+        {"contactIds": ["a"], "groupId": "g", "name": "n", "headerPositions": {}},
+    ),
+    (
+        notes.Notes,
+        {
+            "education": {"master": {"name": "n"}},
+            "partner": {"start": None, "end": "2020-01-XX"},
+        },
+    ),
+]
+
+
+def _sample_contact() -> model.DiskContact:
+    cls, obj = _SAMPLES[0]
+    assert cls is model.DiskContact and isinstance(obj, dict)
+    return model.DiskContact.from_dict(obj)
 
 
 def test_patch_dataclasses() -> None:
@@ -28,3 +97,411 @@ def test_patch_dataclasses() -> None:
         notes="notes",
         tags=["tag3"],
     )
+
+
+def test_copy_is_deep() -> None:
+    contact = _sample_contact()
+
+    copy = contact.copy()
+
+    assert copy == contact
+    assert copy.to_dict() == contact.to_dict()
+    assert copy.name is not contact.name
+    assert copy.email_addresses is not contact.email_addresses
+    assert copy.favorite is not contact.favorite
+
+
+def test_patch_overlay_leaves_original_unchanged() -> None:
+    contact = _sample_contact()
+    original = contact.copy()
+    patch = model.Contact(
+        name=model.Name(first_name="Jane"),
+        icloud=model.ICloudMetadata(uuid="uuid", etag="etag"),
+    )
+
+    overlay = contact.overlay()
+    overlay.patch(patch)
+
+    assert contact == original
+    assert overlay.name.first_name == "Jane"
+    assert overlay.icloud is not None and overlay.icloud.etag == "etag"
+    assert overlay.education is contact.education
+    assert dataclasses_utils.diff(contact, overlay) == {
+        "$update": {
+            "name": {"$update": {"first_name": "Jane"}},
+            "icloud": {"$insert": {"etag": "etag"}},
+        }
+    }
+
+
+def test_diff_dataclasses() -> None:
+    contact = model.Contact(
+        name=model.Name(first_name="John", last_name="Smith"),
+        birthday=model.Date(year=2000, month=1, day=2),
+        icloud=model.ICloudMetadata(uuid="uuid", etag="etag1"),
+        notes="notes",
+    )
+    updated_contact = model.Contact(
+        name=model.Name(first_name="Jane", last_name="Smith"),
+        birthday=model.Date(year=2001, month=1, day=2),
+        icloud=model.ICloudMetadata(uuid="uuid", etag="etag2"),
+        tags=["tag1"],
+    )
+
+    assert dataclasses_utils.diff(contact, contact.copy()) == {}
+    assert dataclasses_utils.diff(contact, updated_contact) == {
+        "$insert": {"tags": ["tag1"]},
+        "$update": {
+            "name": {"$update": {"first_name": "Jane"}},
+            "birthday": "2001-01-02",
+            "icloud": {"$update": {"etag": "etag2"}},
+        },
+        "$delete": ["notes"],
+    }
+
+
+def test_diff_matches_list_items_by_key() -> None:
+    contact = model.Contact(
+        name=model.Name(first_name="John"),
+        email_addresses=[
+            model.EmailAddresss(address="b@example.com", label="HOME"),
+            model.EmailAddresss(address="c@example.com", label="WORK"),
+        ],
+        phone_numbers=[
+            model.PhoneNumber(number="1234", label="HOME"),
+            model.PhoneNumber(number="5678", label="WORK"),
+        ],
+    )
+    updated_contact = model.Contact(
+        name=model.Name(first_name="John"),
+        email_addresses=[
+            model.EmailAddresss(address="a@example.com", label="HOME"),
+            model.EmailAddresss(address="b@example.com", label="HOME"),
+            model.EmailAddresss(address="c@example.com", label="SCHOOL"),
+        ],
+        phone_numbers=[model.PhoneNumber(number="5678", label="WORK")],
+    )
+
+    assert dataclasses_utils.diff(contact, updated_contact) == {
+        "$update": {
+            "email_addresses": {
+                2: {"$update": {"label": "SCHOOL"}},
+                "$insert": [(0, {"address": "a@example.com", "label": "HOME"})],
+            },
+            "phone_numbers": {"$delete": [0]},
+        }
+    }
+
+
+def test_diff_replaces_reordered_lists() -> None:
+    family = model.Family(parents=[1, 2])
+    updated_family = model.Family(parents=[2, 1])
+
+    assert dataclasses_utils.diff(family, updated_family) == {
+        "$update": {"parents": [2, 1]}
+    }
+
+
+def test_decoding_interns_strings() -> None:
+    # the strings are built at runtime, so that they are not shared constants
+    labels = ["".join(["HO", "ME"]) for _ in range(2)]
+    tags = ["".join(["t", "ag"]) for _ in range(2)]
+    assert labels[0] is not labels[1]
+
+    contacts = [
+        model.Contact.from_dict(
+            {
+                "name": {},
+                "email_addresses": [{"address": "a", "label": label}],
+                "tags": [tag],
+            }
+        )
+        for label, tag in zip(labels, tags)
+    ]
+
+    email_addresses = [contact.email_addresses for contact in contacts]
+    contact_tags = [contact.tags for contact in contacts]
+    assert email_addresses[0] is not None and email_addresses[1] is not None
+    assert email_addresses[0][0].label is email_addresses[1][0].label
+    assert contact_tags[0] is not None and contact_tags[1] is not None
+    assert contact_tags[0][0] is contact_tags[1][0]
+
+
+def test_intern_strings_of_built_dataclass() -> None:
+    label = "".join(["HO", "ME"])
+    contact = model.Contact(
+        name=model.Name(),
+        email_addresses=[model.EmailAddresss(address="a", label=label)],
+    )
+
+    dataclasses_utils.intern_strings(contact)
+
+    assert contact.email_addresses is not None
+    assert contact.email_addresses[0].label is sys.intern("HOME")
+    assert contact.email_addresses[0].label is not label
+
+
+def test_cached_json_is_reused_until_dirty() -> None:
+    contact = model.Contact(
+        name=model.Name(first_name="John"),
+        phone_numbers=[model.PhoneNumber(number="1234")],
+        tags=["tag1"],
+    )
+    assert contact.is_dirty()
+
+    contact.cache_json("cached")
+
+    assert not contact.is_dirty()
+    assert contact.to_cached_json() == "cached"
+
+
+def test_nested_changes_make_dataclass_dirty() -> None:
+    name = model.Name(first_name="John")
+    phone_numbers = [model.PhoneNumber(number="1234")]
+    contact = model.Contact(name=name, phone_numbers=phone_numbers, tags=["tag1"])
+    tags = contact.tags
+    assert tags is not None
+
+    def changes(contact: model.Contact):
+        yield lambda: setattr(contact, "notes", "notes")
+        yield lambda: setattr(name, "last_name", "Smith")
+        yield lambda: setattr(phone_numbers[0], "label", "HOME")
+        yield lambda: phone_numbers.append(model.PhoneNumber(number="5678"))
+        yield lambda: tags.remove("tag1")
+
+    for change in changes(contact):
+        contact.to_cached_json()
+        assert not contact.is_dirty()
+
+        change()
+
+        assert contact.is_dirty()
+        assert contact.to_cached_json() == contact.to_json()
+
+
+def test_repr_omits_private_attributes() -> None:
+    name = model.Name(first_name="John")
+    name.cache_json(name.to_json())
+
+    assert repr(name) == "Name(first_name='John')"
+
+
+@pytest.mark.parametrize("cls,obj", _SAMPLES)
+def test_slotted_dataclasses_pickle_with_cached_json(cls, obj) -> None:
+    dataclass = cls.from_dict(obj)
+    dataclass.cache_json(dataclass.to_json())
+
+    unpickled = pickle.loads(pickle.dumps(dataclass))
+
+    assert not hasattr(dataclass, "__dict__")
+    assert unpickled == dataclass
+    assert not unpickled.is_dirty()
+
+
+@pytest.mark.parametrize("cls,obj", _SAMPLES)
+def test_compiled_decoder_agrees_with_dataclasses_json(cls, obj) -> None:
+    assert cls.from_dict(obj) == dataclasses_json_core._decode_dataclass(
+        cls, obj, False
+    )
+
+
+@pytest.mark.parametrize("cls,obj", _SAMPLES)
+def test_trusted_decoder_agrees_with_decoder(cls, obj) -> None:
+    assert cls.from_trusted_dict(obj) == cls.from_dict(obj)
+
+
+def test_trusted_decoder_skips_validation() -> None:
+    obj = {"name": {}, "phone_numbers": [{"number": "1234", "country_code": 0}]}
+    with pytest.raises(AssertionError):
+        model.Contact.from_dict(obj)
+
+    contact = model.Contact.from_trusted_dict(obj)
+
+    with pytest.raises(AssertionError):
+        contact.validate()
+
+
+def test_trusted_decoder_skips_normalization() -> None:
+    contact = model.Contact.from_trusted_dict({"name": {}, "tags": ["b", "a"]})
+
+    assert contact.tags == ["b", "a"]
+    with pytest.raises(AssertionError):
+        contact.validate()
+    model.Contact.from_dict(contact.to_dict()).validate()
+
+
+def _is_decoded(contact: model.LazyDiskContact, field_name: str) -> bool:
+    value = getattr(model.LazyDiskContact, field_name).get_raw_value(contact)
+    return not isinstance(value, dataclasses_utils._Undecoded)
+
+
+def _lazy_sample_contact() -> model.LazyDiskContact:
+    cls, obj = _SAMPLES[0]
+    assert cls is model.DiskContact and isinstance(obj, dict)
+    return model.LazyDiskContact.from_trusted_dict(obj)
+
+
+def test_lazy_fields_are_decoded_on_access() -> None:
+    contact = _lazy_sample_contact()
+    assert not _is_decoded(contact, "education")
+
+    assert contact.education == _sample_contact().education
+    assert _is_decoded(contact, "education")
+    assert contact.education is contact.education
+    assert not _is_decoded(contact, "street_addresses")
+
+
+def test_peek_leaves_lazy_fields_undecoded() -> None:
+    contact = _lazy_sample_contact()
+
+    assert dataclasses_utils.peek(contact, "education") == _sample_contact().education
+    assert not _is_decoded(contact, "education")
+    assert dataclasses_utils.peek(contact, "name") is contact.name
+    assert contact.education is not None
+    assert dataclasses_utils.peek(contact, "education") is contact.education
+
+
+def test_lazy_dataclass_agrees_with_dataclass() -> None:
+    contact = _sample_contact()
+    lazy_contact = _lazy_sample_contact()
+
+    assert lazy_contact == contact and contact == lazy_contact
+    assert lazy_contact.to_dict() == contact.to_dict()
+    assert dataclasses_utils.diff(lazy_contact, lazy_contact.copy()) == {}
+
+    other = contact.copy()
+    assert other.street_addresses is not None
+    other.street_addresses[0].label = "WORK"
+    assert dataclasses_utils.diff(lazy_contact, other) == dataclasses_utils.diff(
+        contact, other
+    )
+
+    patch = model.Contact(
+        name=model.Name(first_name="Jane"),
+        education=model.Education(
+            high_school=model.HighSchool(
+                name=model.HighSchoolName.values()[0], graduation_year=2010
+            )
+        ),
+    )
+    contact.patch(patch)
+    lazy_contact.patch(patch)
+    assert lazy_contact == contact
+
+
+def test_lazy_fields_stay_undecoded_in_copies_and_pickles() -> None:
+    contact = _lazy_sample_contact()
+
+    for copied in [
+        contact.copy(),
+        contact.overlay(),
+        pickle.loads(pickle.dumps(contact)),
+    ]:
+        assert not _is_decoded(copied, "education")
+        assert copied == _sample_contact()
+
+
+def test_decoding_lazy_field_keeps_cached_json_clean() -> None:
+    contact = _lazy_sample_contact()
+    contact.cache_json("cached")
+
+    assert contact.education is not None
+    assert not contact.is_dirty()
+
+    assert contact.education.bachelor is not None
+    contact.education.bachelor.graduation_year = 2021
+    assert contact.is_dirty()
+
+
+def test_projector_projects_onto_paths() -> None:
+    cls, obj = _SAMPLES[0]
+    contact = _sample_contact()
+
+    project = dataclasses_utils.projector(
+        cls,
+        ["id", "name.first_name", "name.last_name", "phone_numbers.number", "notes"],
+    )
+    projection = project(obj)
+
+    assert projection._fields == ("id", "name", "phone_numbers", "notes")
+    assert projection.id == contact.id
+    assert projection.name == (contact.name.first_name, contact.name.last_name)
+    assert projection.name.last_name == contact.name.last_name
+    assert projection.phone_numbers == [("1234",)]
+    assert projection.notes is None
+    assert project({"id": 2, "name": {}}).phone_numbers is None
+
+
+def test_projector_decodes_fields_like_trusted_decoder() -> None:
+    cls, obj = _SAMPLES[0]
+    assert isinstance(obj, dict)
+    project = dataclasses_utils.projector(cls, ["birthday", "education", "tags"])
+
+    projection = project(obj)
+
+    contact = _sample_contact()
+    assert projection.birthday == contact.birthday
+    assert projection.education == contact.education
+    assert projection.tags is not obj["tags"] and projection.tags == contact.tags
+
+
+@pytest.mark.parametrize("path", ["unknown", "id.value", "tags.value"])
+def test_projector_rejects_unknown_paths(path) -> None:
+    with pytest.raises(ValueError):
+        dataclasses_utils.projector(model.DiskContact, [path])
+
+
+@pytest.mark.parametrize(
+    "obj,error",
+    [
+        ({"name": {}, "unknown": 1}, UndefinedParameterError),
+        ({"name": {"unknown": 1}}, UndefinedParameterError),
+        ({}, KeyError),
+        ({"name": {}, "phone_numbers": [{"label": "HOME"}]}, KeyError),
+        ({"name": {}, "birthday": "2000/01/01"}, error.DecodingError),
+    ],
+)
+def test_compiled_decoder_raises_like_dataclasses_json(obj, error) -> None:
+    with pytest.raises(error) as compiled_error:
+        model.Contact.from_dict(obj)
+    with pytest.raises(error) as dataclasses_json_error:
+        dataclasses_json_core._decode_dataclass(model.Contact, obj, False)
+
+    assert str(compiled_error.value) == str(dataclasses_json_error.value)
+
+
+def test_compiled_decoder_warns_like_dataclasses_json() -> None:
+    obj = {"name": None, "id": None, "mtime": 1}
+
+    with pytest.warns(RuntimeWarning) as compiled_warnings:
+        compiled_contact = model.DiskContact.from_dict(obj)
+    with pytest.warns(RuntimeWarning) as dataclasses_json_warnings:
+        contact = dataclasses_json_core._decode_dataclass(model.DiskContact, obj, False)
+
+    assert compiled_contact == contact
+    assert [str(warning.message) for warning in compiled_warnings] == [
+        str(warning.message) for warning in dataclasses_json_warnings
+    ]
+
+
+@pytest.mark.parametrize("cls,obj", _SAMPLES)
+def test_compiled_encoder_agrees_with_dataclasses_json(cls, obj) -> None:
+    dataclass = cls.from_dict(obj)
+
+    assert json.dumps(dataclass.to_dict()) == json.dumps(
+        dataclasses_json_core._asdict(dataclass)
+    )
+
+
+def test_compiled_encoder_falls_back_for_unexpected_types() -> None:
+    contact = model.Contact(
+        name=model.Name(first_name="John"),
+        favorite={"color": None},
+        phone_numbers=(model.PhoneNumber(number="1234"),),  # type: ignore
+    )
+
+    assert contact.to_dict() == {
+        "name": {"first_name": "John"},
+        "favorite": {"color": None},
+        "phone_numbers": [{"number": "1234", "country_code": 1}],
+    }
@@ -1,16 +1,37 @@
 """Utilities for file I/O."""
 from __future__ import annotations
 
+import contextlib
+import gzip
+import io
 import json
+import lzma
+import os
+import re
+import shutil
+import tempfile
 import textwrap
-from collections.abc import Sequence
-from typing import Type, TypeVar
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from typing import IO, Any, TextIO, Type, TypeVar, cast
 
 from contacts import model
 from contacts.utils import dataclasses_utils
 
 T = TypeVar("T", bound=dataclasses_utils.DataClassJsonMixin)
 
+_CHUNK_SIZE = 1 << 16
+_DECODER = json.JSONDecoder()
+_INDENT = "    "
+_WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+_DEFAULT_FILE_MODE = 0o644
+
+COMPRESSION_TO_EXTENSION = {
+    "gzip": ".gz",
+    "lzma": ".xz",
+    "zlib": ".zlib",
+}
+
 
 def read_json_object_as_dataclass_object(path: str, cls: Type[T]) -> T:
     """Read a dataclass object from a file.
@@ -24,7 +45,7 @@ def read_json_object_as_dataclass_object(path: str, cls: Type[T]) -> T:
     Returns:
         A dataclass object.
     """
-    with open(path, encoding="utf-8") as f:
+    with open_text(path) as f:
         obj = json.loads(f.read().strip())
     return cls.from_dict(obj)
 
@@ -42,9 +63,51 @@ def read_json_array_as_dataclass_objects(path: str, cls: Type[T]) -> list[T]:
     Returns:
         A list of dataclass objects.
     """
-    with open(path, encoding="utf-8") as f:
-        objects = json.loads(f.read().strip())
-    return [cls.from_dict(obj) for obj in objects]
+    return list(iter_json_array_as_dataclass_objects(path, cls))
+
+
+def iter_json_array_as_dataclass_objects(path: str, cls: Type[T]) -> Iterator[T]:
+    """Iterate over the dataclass objects in a file.
+
+    Parse a json array of objects from a file one element at a time and transform each
+    element to a dataclass object as it is parsed.
+
+    Args:
+        path: The path of the file containing the json array of objects.
+        cls: The dataclass to convert the json objects to.
+
+    Yields:
+        The dataclass objects, in file order.
+    """
+    for obj in iter_json_array(path):
+        yield cls.from_dict(obj)
+
+
+def iter_json_array(path: str) -> Iterator[Any]:
+    """Iterate over the elements of a json array in a file.
+
+    The file is read and decompressed in chunks and only one element is decoded at a
+    time.
+
+    Args:
+        path: The path of the file containing the json array.
+
+    Yields:
+        The decoded elements of the json array, in file order.
+    """
+    with open_text(path) as f:
+        reader = _JsonArrayReader(f)
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.expect("]")
+        else:
+            while True:
+                yield reader.value()
+                if reader.peek() == "]":
+                    reader.expect("]")
+                    break
+                reader.expect(",")
+        reader.expect_end()
 
 
 def write_contacts_as_json_array(path: str, contacts: Sequence[model.Contact]) -> None:
@@ -62,23 +125,241 @@ def write_contacts_as_json_array(path: str, contacts: Sequence[model.Contact]) -
 
 
 def write_dataclass_objects_as_json_array(
-    path: str, objects: Sequence[dataclasses_utils.DataClassJsonMixin]
+    path: str, objects: Iterable[dataclasses_utils.DataClassJsonMixin]
 ) -> None:
     """Write dataclass objects to a file.
 
-    Transform a sequence of dataclass objects to a json array of objects and write them
-    to a file.
+    Transform dataclass objects to a json array of objects and write them to a file.
+    The objects are encoded and written one at a time, reusing the cached json of
+    objects that are not dirty, and the file is only replaced once all of them have
+    been written.
 
     Args:
         path: The path of the file to write to.
         objects: The dataclass objects to write to the file.
     """
-    output = ""
-    with open(path, mode="w", encoding="utf-8") as f:
-        output += "[\n"
-        output += textwrap.indent(",\n".join(obj.to_json() for obj in objects), "    ")
-        output += "\n]\n"
-        f.write(output)
+    with open_atomic(path) as f:
+        f.write("[\n")
+        for i, obj in enumerate(objects):
+            if i > 0:
+                f.write(",\n")
+            f.write(textwrap.indent(obj.to_cached_json(), _INDENT))
+        f.write("\n]\n")
+
+
+def get_compression(path: str) -> str | None:
+    """Get the compression of a file from its extension.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        The compression of the file, or None if it is not compressed.
+    """
+    for compression, extension in COMPRESSION_TO_EXTENSION.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def get_compressed_paths(path: str) -> list[str]:
+    """Get the paths of a file under each compression.
+
+    Args:
+        path: The path of the uncompressed file.
+
+    Returns:
+        The uncompressed path followed by the path for each compression.
+    """
+    return [path] + [
+        f"{path}{extension}" for extension in COMPRESSION_TO_EXTENSION.values()
+    ]
+
+
+@contextlib.contextmanager
+def open_text(path: str) -> Iterator[TextIO]:
+    """Open a text file for reading, decompressing it based on its extension.
+
+    Args:
+        path: The path of the file to read.
+
+    Yields:
+        A buffered text file that is decompressed as it is read.
+    """
+    with open(path, mode="rb") as raw_file:
+        with _wrap_compression(raw_file, get_compression(path), "rb") as binary_file:
+            with io.TextIOWrapper(binary_file, encoding="utf-8") as f:
+                yield f
+
+
+@contextlib.contextmanager
+def open_atomic(path: str, *, binary: bool = False) -> Iterator[IO]:
+    """Open a file for writing that replaces the file at the path on success.
+
+    The contents are written to a temporary file in the same directory, which is
+    renamed over the path once the block exits without an exception. The contents
+    are compressed based on the extension of the path.
+
+    Args:
+        path: The path of the file to write to.
+        binary: Whether to open the file in binary mode instead of text mode.
+
+    Yields:
+        A buffered file to write to.
+    """
+    directory, file_name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=f".{file_name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode="wb") as raw_file:
+            compression = get_compression(path)
+            binary_file = _wrap_compression(raw_file, compression, "wb")
+            text_file = (
+                None if binary else io.TextIOWrapper(binary_file, encoding="utf-8")
+            )
+            try:
+                yield binary_file if text_file is None else text_file
+            finally:
+                if text_file is not None:
+                    # flush without letting the wrapper close the files beneath it
+                    text_file.detach()
+                if compression is not None:
+                    binary_file.close()
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, _DEFAULT_FILE_MODE)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class _JsonArrayReader:
+    """A reader of json tokens from a buffered text file."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            match = _WHITESPACE_REGEX.match(self._buffer, self._pos)
+            self._pos = match.end() if match else self._pos
+            if self._pos < len(self._buffer) or not self._read():
+                return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        if self.peek() != char:
+            raise self._error(f"Expecting {char!r}")
+        self._pos += 1
+
+    def expect_end(self) -> None:
+        """Check that only whitespace is left."""
+        if self.peek() != "":
+            raise self._error("Extra data")
+
+    def value(self) -> Any:
+        """Consume and decode the next json value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+            # a value that ends with the buffer, like a number, may be truncated
+            if end < len(self._buffer) or not self._read():
+                self._pos = end
+                return value
+
+    def _read(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buffer, self._pos)
+
+
+class _ZlibReader(io.RawIOBase):
+    """A reader that decompresses a zlib stream from a binary file."""
+
+    def __init__(self, f: IO[bytes]) -> None:
+        self._f = f
+        self._decompressor = zlib.decompressobj()
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            if self._decompressor.eof:
+                return 0
+            chunk = self._f.read(_CHUNK_SIZE)
+            if not chunk:
+                raise EOFError("Compressed file ended before the end of the stream")
+            self._buffer = self._decompressor.decompress(chunk)
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class _ZlibWriter(io.RawIOBase):
+    """A writer that compresses a zlib stream to a binary file."""
+
+    def __init__(self, f: IO[bytes]) -> None:
+        self._f = f
+        self._compressor = zlib.compressobj()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self._f.write(self._compressor.compress(b))
+        return len(b)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._f.write(self._compressor.flush())
+        super().close()
+
+
+def _wrap_compression(f: IO[bytes], compression: str | None, mode: str) -> IO[bytes]:
+    """Wrap a binary file so the data is compressed or decompressed.
+
+    The wrapper does not close the file it wraps, unless no compression is used and
+    the file itself is returned.
+    """
+    match compression:
+        case None:
+            return f
+        case "gzip":
+            return cast(IO[bytes], gzip.GzipFile(fileobj=f, mode=mode, mtime=0))
+        case "lzma":
+            return cast(IO[bytes], lzma.LZMAFile(f, mode=mode))
+        case "zlib":
+            if mode == "rb":
+                return io.BufferedReader(_ZlibReader(f))
+            return io.BufferedWriter(_ZlibWriter(f))
+        case _:
+            raise ValueError(f"Unknown compression, {compression}")
 
 
 def _contact_key(contact: model.Contact) -> str:
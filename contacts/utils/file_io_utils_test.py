@@ -1,8 +1,11 @@
 """Tests for contacts.utils.file_io_utils."""
 from __future__ import annotations
 
+import json
 import os.path
 
+import pytest
+
 from contacts import model
 from contacts.utils import file_io_utils, uuid_utils
 
@@ -22,3 +25,95 @@ def test_reading_and_writing_dataclasses_are_inverses() -> None:
     os.remove(file_path)
 
     assert written_objects == read_objects
+
+
+def test_write_dataclasses_format(tmp_path) -> None:
+    file_path = os.path.join(tmp_path, "objects.json")
+
+    file_io_utils.write_dataclass_objects_as_json_array(
+        path=file_path,
+        objects=[
+            model.PhoneNumber(country_code=1, number="1234"),
+            model.PhoneNumber(country_code=86, number="5678", label="HOME"),
+        ],
+    )
+
+    with open(file_path, encoding="utf-8") as f:
+        assert f.read() == (
+            "[\n"
+            '    {"number": "1234", "country_code": 1},\n'
+            '    {"number": "5678", "country_code": 86, "label": "HOME"}\n'
+            "]\n"
+        )
+
+
+def test_write_dataclasses_leaves_file_untouched_on_error(tmp_path) -> None:
+    file_path = os.path.join(tmp_path, "objects.json")
+    file_io_utils.write_dataclass_objects_as_json_array(
+        path=file_path, objects=[model.PhoneNumber(country_code=1, number="1234")]
+    )
+
+    def objects():
+        yield model.PhoneNumber(country_code=86, number="5678")
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        file_io_utils.write_dataclass_objects_as_json_array(
+            path=file_path, objects=objects()
+        )
+
+    assert file_io_utils.read_json_array_as_dataclass_objects(
+        path=file_path, cls=model.PhoneNumber
+    ) == [model.PhoneNumber(country_code=1, number="1234")]
+    assert os.listdir(tmp_path) == ["objects.json"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[]",
+        " [\n\n]\n",
+        '[{"a": 1}, 2, "three", [4], null]',
+        '\n[\n    {"a": "[,]"},\n    12345678,\n    {"b": {"c": [1, 2]}}\n]\n',
+    ],
+)
+def test_iter_json_array_matches_json_loads(tmp_path, monkeypatch, text) -> None:
+    monkeypatch.setattr(file_io_utils, "_CHUNK_SIZE", 3)
+    file_path = os.path.join(tmp_path, "array.json")
+    with open(file_path, mode="w", encoding="utf-8") as f:
+        f.write(text)
+
+    assert list(file_io_utils.iter_json_array(file_path)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1, 2", "[1 2]", "[1,]", "[1] 2"])
+def test_iter_json_array_rejects_invalid_arrays(tmp_path, text) -> None:
+    file_path = os.path.join(tmp_path, "array.json")
+    with open(file_path, mode="w", encoding="utf-8") as f:
+        f.write(text)
+
+    with pytest.raises(json.JSONDecodeError):
+        list(file_io_utils.iter_json_array(file_path))
+
+
+@pytest.mark.parametrize("extension", ["", ".gz", ".xz", ".zlib"])
+def test_compressed_files_round_trip(tmp_path, monkeypatch, extension) -> None:
+    monkeypatch.setattr(file_io_utils, "_CHUNK_SIZE", 3)
+    file_path = os.path.join(tmp_path, f"objects.json{extension}")
+    written_objects = [
+        model.PhoneNumber(country_code=1, number=str(i)) for i in range(100)
+    ]
+
+    file_io_utils.write_dataclass_objects_as_json_array(
+        path=file_path, objects=written_objects
+    )
+
+    assert (
+        file_io_utils.read_json_array_as_dataclass_objects(
+            path=file_path, cls=model.PhoneNumber
+        )
+        == written_objects
+    )
+    with open(file_path, mode="rb") as f:
+        assert (f.read(1) == b"[") == (extension == "")
+    assert os.listdir(tmp_path) == [f"objects.json{extension}"]
@@ -0,0 +1,226 @@
+"""A columnar view of contacts for vectorized filtering and counting."""
+from __future__ import annotations
+
+import array
+import dataclasses
+import operator
+import re
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from contacts import model
+from contacts.utils import contact_utils, dataclasses_utils
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, and the array module stands in for it
+    numpy = None
+
+# the value of int columns for contacts that have no value
+MISSING = -1
+
+BACKEND = "array" if numpy is None else "numpy"
+
+EDUCATION_LEVELS = tuple(field.name for field in dataclasses.fields(model.Education))
+
+_FIELDS = (
+    "id",
+    "icloud.uuid",
+    "name.first_name",
+    "name.last_name",
+    "birthday",
+    "education",
+    "phone_numbers.country_code",
+    "tags",
+)
+
+# a mask is a numpy array of bools, or a bytearray of zeros and ones
+Mask = Any
+
+
+class ContactFrame:
+    """The contacts as columns, with one row per contact.
+
+    The tags are dictionary-encoded as a sparse boolean matrix, which holds the rows
+    of the contacts that have each distinct tag. The int columns are numpy arrays, or
+    arrays of the array module when numpy is not installed, and hold MISSING where
+    contacts have no value. Filters return masks over the rows, which are combined
+    and counted without going through the contacts one by one.
+    """
+
+    def __init__(self, objects: Iterable[dict]) -> None:
+        """Build the frame.
+
+        Args:
+            objects: The json objects of the contacts.
+        """
+        project = dataclasses_utils.projector(model.DiskContact, _FIELDS)
+        self._build(project(obj) for obj in objects)
+
+    @classmethod
+    def from_contacts(cls, contacts: Iterable[model.Contact]) -> ContactFrame:
+        """Build the frame from contacts that are already decoded.
+
+        The columns are read off the contacts, without encoding them to json.
+        """
+        frame = cls.__new__(cls)
+        frame._build(contacts)
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def has_tag(self, tag: str) -> Mask:
+        """Filter the contacts that have a tag."""
+        return self._mask_of_rows(self._tag_to_rows.get(tag, ()))
+
+    def has_tag_matching(self, pattern: re.Pattern) -> Mask:
+        """Filter the contacts that have a tag matching a pattern.
+
+        The pattern is matched once against each distinct tag.
+        """
+        return self.any_of(
+            self._mask_of_rows(self._tag_to_rows[tag])
+            for tag in self.tags
+            if pattern.match(tag)
+        )
+
+    def equals(self, column: Sequence[int], value: int) -> Mask:
+        """Filter the contacts whose value in an int column is a value."""
+        if numpy is not None:
+            return column == value
+        return bytearray(item == value for item in column)
+
+    def all_of(self, masks: Iterable[Mask]) -> Mask:
+        """Combine filters so that contacts pass all of them."""
+        result = self._full_mask()
+        for mask in masks:
+            result = _combine(result, mask, operator.and_)
+        return result
+
+    def any_of(self, masks: Iterable[Mask]) -> Mask:
+        """Combine filters so that contacts pass any of them."""
+        result = self._mask_of_rows(())
+        for mask in masks:
+            result = _combine(result, mask, operator.or_)
+        return result
+
+    def negate(self, mask: Mask) -> Mask:
+        """Invert a filter."""
+        return _combine(mask, self._full_mask(), operator.xor)
+
+    def count(self, mask: Mask) -> int:
+        """Count the contacts that pass a filter."""
+        if numpy is not None:
+            return int(numpy.count_nonzero(mask))
+        return mask.count(1)
+
+    def rows(self, mask: Mask) -> list[int]:
+        """Get the rows of the contacts that pass a filter, in order."""
+        if numpy is not None:
+            return numpy.flatnonzero(mask).tolist()
+        rows = []
+        row = mask.find(1)
+        while row != -1:
+            rows.append(row)
+            row = mask.find(1, row + 1)
+        return rows
+
+    def count_tags(self) -> dict[str, int]:
+        """Count the contacts that have each tag.
+
+        Returns:
+            The number of contacts by tag, in tag order.
+        """
+        return {tag: len(self._tag_to_rows[tag]) for tag in self.tags}
+
+    def _build(self, contacts: Iterable[Any]) -> None:
+        ids: list[int] = []
+        birthday_years: list[int] = []
+        birthday_months: list[int] = []
+        birthday_days: list[int] = []
+        country_codes: list[int] = []
+        level_to_graduation_years: dict[str, list[int]] = {
+            level: [] for level in EDUCATION_LEVELS
+        }
+        has_phone_number_rows: list[int] = []
+        tag_to_rows: dict[str, list[int]] = {}
+        self.icloud_uuids: list[str | None] = []
+        self.names: list[str] = []
+
+        for row, contact in enumerate(contacts):
+            ids.append(contact.id)
+            self.icloud_uuids.append(contact.icloud and contact.icloud.uuid)
+            self.names.append(contact_utils.build_name_str(contact))
+
+            birthday = contact.birthday
+            birthday_years.append(_int_or_missing(birthday and birthday.year))
+            birthday_months.append(_int_or_missing(birthday and birthday.month))
+            birthday_days.append(_int_or_missing(birthday and birthday.day))
+
+            # a lazy education is read without decoding it into the contact
+            education = dataclasses_utils.peek(contact, "education")
+            for level, graduation_years in level_to_graduation_years.items():
+                university = education and getattr(education, level)
+                graduation_years.append(
+                    _int_or_missing(university and university.graduation_year)
+                )
+
+            if contact.phone_numbers is not None:
+                has_phone_number_rows.append(row)
+            country_codes.append(
+                contact.phone_numbers[0].country_code
+                if contact.phone_numbers
+                else MISSING
+            )
+
+            for tag in contact.tags or []:
+                tag_to_rows.setdefault(tag, []).append(row)
+
+        self.ids = _int_column(ids)
+        self.birthday_years = _int_column(birthday_years)
+        self.birthday_months = _int_column(birthday_months)
+        self.birthday_days = _int_column(birthday_days)
+        self.country_codes = _int_column(country_codes)
+        self.level_to_graduation_years = {
+            level: _int_column(graduation_years)
+            for level, graduation_years in level_to_graduation_years.items()
+        }
+        self.has_phone_numbers = self._mask_of_rows(has_phone_number_rows)
+        self.tags = sorted(tag_to_rows)
+        self._tag_to_rows = {tag: _int_column(tag_to_rows[tag]) for tag in self.tags}
+
+    def _full_mask(self) -> Mask:
+        if numpy is not None:
+            return numpy.ones(len(self), dtype=bool)
+        return bytearray(b"\x01" * len(self))
+
+    def _mask_of_rows(self, rows: Sequence[int]) -> Mask:
+        if numpy is not None:
+            mask = numpy.zeros(len(self), dtype=bool)
+            mask[numpy.asarray(rows, dtype=numpy.int64)] = True
+            return mask
+        mask = bytearray(len(self))
+        for row in rows:
+            mask[row] = 1
+        return mask
+
+
+def _int_or_missing(value: int | None) -> int:
+    return MISSING if value is None else value
+
+
+def _int_column(values: list[int]) -> Sequence[int]:
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.int32)
+    return array.array("i", values)
+
+
+def _combine(mask_1: Mask, mask_2: Mask, operation: Callable[[Any, Any], Any]) -> Mask:
+    if numpy is not None:
+        return operation(mask_1, mask_2)
+    # the masks hold zeros and ones, so combining them as big ints keeps them so
+    value = operation(
+        int.from_bytes(mask_1, "little"), int.from_bytes(mask_2, "little")
+    )
+    return bytearray(value.to_bytes(len(mask_1), "little"))
@@ -0,0 +1,106 @@
+"""Tests for contacts.utils.frame_utils."""
+from __future__ import annotations
+
+import pickle
+import re
+
+from contacts import model
+from contacts.utils import frame_utils
+
+
+def _build_contacts() -> list[model.DiskContact]:
+    return [
+        model.DiskContact(
+            id=1,
+            mtime=0.0,
+            name=model.Name(first_name="Alice", last_name="Smith"),
+            birthday=model.Date(month=1, day=2),
+            icloud=model.ICloudMetadata(uuid="UUID-1"),
+            phone_numbers=[model.PhoneNumber(number="1234", country_code=353)],
+            tags=["CTY", "NU"],
+        ),
+        model.DiskContact(
+            id=2,
+            mtime=0.0,
+            name=model.Name(first_name="Bob"),
+            education=model.Education(
+                high_school=model.HighSchool(
+                    name=model.HighSchoolName.NEEDHAM_HIGH_SCHOOL,
+                    graduation_year=2014,
+                )
+            ),
+            tags=["NHS14", "NU"],
+        ),
+        model.DiskContact(id=3, mtime=0.0, name=model.Name(last_name="Jones")),
+    ]
+
+
+def _build_frame() -> frame_utils.ContactFrame:
+    return frame_utils.ContactFrame(contact.to_dict() for contact in _build_contacts())
+
+
+def test_columns() -> None:
+    frame = _build_frame()
+
+    assert len(frame) == 3
+    assert list(frame.ids) == [1, 2, 3]
+    assert frame.icloud_uuids == ["UUID-1", None, None]
+    assert frame.names == ["Alice Smith", "Bob", "Jones"]
+    assert list(frame.birthday_years) == [frame_utils.MISSING] * 3
+    assert list(frame.birthday_months) == [1, frame_utils.MISSING, frame_utils.MISSING]
+    assert list(frame.country_codes) == [353, frame_utils.MISSING, frame_utils.MISSING]
+    assert list(frame.level_to_graduation_years["high_school"]) == [
+        frame_utils.MISSING,
+        2014,
+        frame_utils.MISSING,
+    ]
+    assert frame.rows(frame.has_phone_numbers) == [0]
+    assert frame.count_tags() == {"CTY": 1, "NHS14": 1, "NU": 2}
+
+
+def test_from_contacts() -> None:
+    frame = _build_frame()
+
+    contacts_frame = frame_utils.ContactFrame.from_contacts(_build_contacts())
+
+    assert contacts_frame.names == frame.names
+    assert contacts_frame.icloud_uuids == frame.icloud_uuids
+    assert list(contacts_frame.ids) == list(frame.ids)
+    assert list(contacts_frame.birthday_months) == list(frame.birthday_months)
+    assert list(contacts_frame.country_codes) == list(frame.country_codes)
+    assert {
+        level: list(graduation_years)
+        for level, graduation_years in contacts_frame.level_to_graduation_years.items()
+    } == {
+        level: list(graduation_years)
+        for level, graduation_years in frame.level_to_graduation_years.items()
+    }
+    assert contacts_frame.rows(contacts_frame.has_phone_numbers) == [0]
+    assert contacts_frame.count_tags() == frame.count_tags()
+
+
+def test_filters() -> None:
+    frame = _build_frame()
+
+    assert frame.rows(frame.has_tag("NU")) == [0, 1]
+    assert frame.rows(frame.has_tag("unknown")) == []
+    assert frame.rows(frame.has_tag_matching(re.compile(r"^NHS\d{2}$"))) == [1]
+    assert frame.rows(frame.equals(frame.birthday_months, 1)) == [0]
+    assert frame.rows(frame.negate(frame.has_tag("NU"))) == [2]
+    either_tag = frame.any_of([frame.has_tag("CTY"), frame.has_tag("NHS14")])
+    assert frame.rows(either_tag) == [0, 1]
+    assert (
+        frame.count(frame.all_of([frame.has_tag("NU"), frame.has_phone_numbers])) == 1
+    )
+    assert frame.count(frame.all_of([])) == 3
+    assert frame.count(frame.any_of([])) == 0
+
+
+def test_frame_pickles() -> None:
+    frame = _build_frame()
+
+    loaded_frame = pickle.loads(pickle.dumps(frame))
+
+    assert loaded_frame.names == frame.names
+    assert list(loaded_frame.ids) == list(frame.ids)
+    assert loaded_frame.rows(loaded_frame.has_tag("NU")) == [0, 1]
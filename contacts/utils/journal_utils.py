@@ -0,0 +1,167 @@
+"""Utilities for an append-only journal of changes to a json array of objects."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from typing import Any
+
+from contacts.utils import file_io_utils
+
+JOURNAL_FILE_EXTENSION = ".journal"
+
+
+def journal_path(path: str) -> str:
+    """Get the path of the journal for a file.
+
+    Args:
+        path: The path of the snapshot file.
+
+    Returns:
+        The path of the journal next to the snapshot file.
+    """
+    return f"{path}{JOURNAL_FILE_EXTENSION}"
+
+
+def fingerprint(obj: Any) -> int:
+    """Fingerprint a json object.
+
+    Args:
+        obj: A json object.
+
+    Returns:
+        A fingerprint that is equal for equal json objects.
+    """
+    return fingerprint_json(json.dumps(obj, ensure_ascii=False, sort_keys=True))
+
+
+def fingerprint_json(encoded_json: str) -> int:
+    """Fingerprint the json encoding of an object, without decoding it.
+
+    Args:
+        encoded_json: The json encoding of an object.
+
+    Returns:
+        A fingerprint that is equal for equal encodings. Unlike fingerprint(), the
+        encodings of equal objects with their keys in different orders differ.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(encoded_json.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def iter_json_objects(path: str, key: str) -> Iterator[Any]:
+    """Iterate over the json objects in a snapshot file with its journal replayed.
+
+    The journal is read first, then the snapshot is streamed with the journaled
+    changes applied to it.
+
+    Args:
+        path: The path of the snapshot file containing a json array of objects.
+        key: The name of the field that uniquely identifies an object.
+
+    Yields:
+        The objects in snapshot order, followed by the objects added in the journal.
+    """
+    key_to_journaled_object = read_journal(path)
+    for obj in file_io_utils.iter_json_array(path):
+        if obj[key] in key_to_journaled_object:
+            obj = key_to_journaled_object.pop(obj[key])
+            if obj is None:
+                continue
+        yield obj
+    for obj in key_to_journaled_object.values():
+        if obj is not None:
+            yield obj
+
+
+def append(
+    path: str, key: str, puts: Sequence[Any], deletes: Iterable[Hashable] = ()
+) -> int:
+    """Append changes to the journal of a snapshot file.
+
+    Args:
+        path: The path of the snapshot file.
+        key: The name of the field that uniquely identifies an object.
+        puts: The json objects that were added or updated.
+        deletes: The keys of the objects that were deleted.
+
+    Returns:
+        The size of the journal in bytes.
+    """
+    _truncate_torn_entry(journal_path(path))
+    with open(journal_path(path), mode="a", encoding="utf-8") as f:
+        for obj in puts:
+            f.write(_encode_entry({"op": "put", "key": obj[key], "object": obj}))
+        for deleted_key in deletes:
+            f.write(_encode_entry({"op": "delete", "key": deleted_key}))
+        f.flush()
+        os.fsync(f.fileno())
+        return os.fstat(f.fileno()).st_size
+
+
+def discard(path: str) -> None:
+    """Remove the journal of a snapshot file, if it exists.
+
+    Args:
+        path: The path of the snapshot file.
+    """
+    try:
+        os.remove(journal_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def read_journal(path: str) -> dict[Hashable, Any]:
+    """Read the latest journaled version of each object of a snapshot file.
+
+    Args:
+        path: The path of the snapshot file.
+
+    Returns:
+        A map from the key of each journaled object to the object, or to None if the
+        object was deleted.
+    """
+    key_to_object: dict[Hashable, Any] = {}
+    if not os.path.isfile(journal_path(path)):
+        return key_to_object
+
+    with open(journal_path(path), encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    for i, line in enumerate(lines):
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            # a torn write can only be the last entry of the journal
+            if i == len(lines) - 1:
+                break
+            raise ValueError(f"Corrupt journal entry {i + 1} of {path}")
+        match entry["op"]:
+            case "put":
+                key_to_object.pop(entry["key"], None)
+                key_to_object[entry["key"]] = entry["object"]
+            case "delete":
+                key_to_object[entry["key"]] = None
+            case _:
+                raise ValueError(f"Unknown journal operation, {entry['op']}")
+    return key_to_object
+
+
+def _truncate_torn_entry(path: str) -> None:
+    # appending after a torn write would merge the next entry into the torn one
+    try:
+        with open(path, mode="rb+") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return None
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return None
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+    except FileNotFoundError:
+        pass
+
+
+def _encode_entry(entry: dict) -> str:
+    return f"{json.dumps(entry, ensure_ascii=False)}\n"
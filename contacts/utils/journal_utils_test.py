@@ -0,0 +1,95 @@
+"""Tests for contacts.utils.journal_utils."""
+from __future__ import annotations
+
+import json
+import os.path
+
+import pytest
+
+from contacts.utils import journal_utils
+
+
+def _write_snapshot(path: str, objects: list[dict]) -> None:
+    with open(path, mode="w", encoding="utf-8") as f:
+        f.write(json.dumps(objects))
+
+
+def test_read_without_journal_returns_snapshot(tmp_path) -> None:
+    path = os.path.join(tmp_path, "objects.json")
+    _write_snapshot(path, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+
+    assert list(journal_utils.iter_json_objects(path, key="id")) == [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b"},
+    ]
+
+
+def test_read_replays_journal_over_snapshot(tmp_path) -> None:
+    path = os.path.join(tmp_path, "objects.json")
+    _write_snapshot(path, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+
+    journal_utils.append(path, "id", [{"id": 1, "name": "c"}], deletes=[2])
+    journal_utils.append(path, "id", [{"id": 3, "name": "d"}])
+
+    assert list(journal_utils.iter_json_objects(path, key="id")) == [
+        {"id": 1, "name": "c"},
+        {"id": 3, "name": "d"},
+    ]
+
+
+def test_read_ignores_torn_last_entry(tmp_path) -> None:
+    path = os.path.join(tmp_path, "objects.json")
+    _write_snapshot(path, [{"id": 1, "name": "a"}])
+    journal_utils.append(path, "id", [{"id": 1, "name": "b"}])
+    with open(journal_utils.journal_path(path), mode="a", encoding="utf-8") as f:
+        f.write('{"op": "put", "key": 1, "obj')
+
+    assert list(journal_utils.iter_json_objects(path, key="id")) == [
+        {"id": 1, "name": "b"}
+    ]
+
+
+def test_append_after_torn_entry_keeps_later_entries(tmp_path) -> None:
+    path = os.path.join(tmp_path, "objects.json")
+    _write_snapshot(path, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    journal_utils.append(path, "id", [{"id": 1, "name": "c"}])
+    with open(journal_utils.journal_path(path), mode="a", encoding="utf-8") as f:
+        f.write('{"op": "put", "key": 2, "obj')
+
+    journal_utils.append(path, "id", [{"id": 2, "name": "later"}])
+    journal_utils.append(path, "id", [{"id": 1, "name": "latest"}])
+
+    assert list(journal_utils.iter_json_objects(path, key="id")) == [
+        {"id": 1, "name": "latest"},
+        {"id": 2, "name": "later"},
+    ]
+
+
+def test_read_rejects_corrupt_entry_before_last(tmp_path) -> None:
+    path = os.path.join(tmp_path, "objects.json")
+    _write_snapshot(path, [{"id": 1, "name": "a"}])
+    with open(journal_utils.journal_path(path), mode="w", encoding="utf-8") as f:
+        f.write('{"op": "put", "key": 1, "obj\n')
+        f.write('{"op": "delete", "key": 1}\n')
+
+    with pytest.raises(ValueError):
+        journal_utils.read_journal(path)
+
+
+def test_discard_removes_journal(tmp_path) -> None:
+    path = os.path.join(tmp_path, "objects.json")
+    _write_snapshot(path, [{"id": 1, "name": "a"}])
+    journal_utils.append(path, "id", [{"id": 1, "name": "b"}])
+
+    journal_utils.discard(path)
+
+    assert not os.path.exists(journal_utils.journal_path(path))
+    assert list(journal_utils.iter_json_objects(path, key="id")) == [
+        {"id": 1, "name": "a"}
+    ]
+
+
+def test_fingerprint_ignores_key_order() -> None:
+    assert journal_utils.fingerprint({"a": 1, "b": 2}) == journal_utils.fingerprint(
+        {"b": 2, "a": 1}
+    )
@@ -0,0 +1,176 @@
+"""Utilities for lazily decoding the elements of a json array file."""
+from __future__ import annotations
+
+import collections
+import json
+import mmap
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from typing import Any, Type, TypeVar, overload
+
+from contacts.utils import dataclasses_utils
+
+T = TypeVar("T", bound=dataclasses_utils.DataClassJsonMixin)
+
+_DECODER = json.JSONDecoder()
+_DEFAULT_CACHE_SIZE = 128
+
+
+def index_json_array(
+    path: str, summarize: Callable[[Any], Any]
+) -> tuple[list[tuple[int, int]], list[Any]]:
+    """Index the elements of a json array in a file.
+
+    Args:
+        path: The path of the file containing the json array.
+        summarize: Extracts a small summary from a parsed element.
+
+    Returns:
+        The byte range and the summary of each element, in file order.
+    """
+    with open(path, mode="rb") as f:
+        data = f.read()
+    text = data.decode("utf-8")
+    is_ascii = len(text) == len(data)
+
+    ranges: list[tuple[int, int]] = []
+    summaries: list[Any] = []
+    char_pos = byte_pos = 0
+
+    def advance(to: int) -> int:
+        nonlocal char_pos, byte_pos
+        byte_pos += to - char_pos if is_ascii else len(text[char_pos:to].encode())
+        char_pos = to
+        return byte_pos
+
+    pos = _skip_whitespace(text, 0)
+    if text[pos : pos + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, pos)
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos : pos + 1] == "]":
+        return ranges, summaries
+    while True:
+        obj, end = _DECODER.raw_decode(text, pos)
+        ranges.append((advance(pos), advance(end)))
+        summaries.append(summarize(obj))
+        pos = _skip_whitespace(text, end)
+        if text[pos : pos + 1] == "]":
+            return ranges, summaries
+        if text[pos : pos + 1] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = _skip_whitespace(text, pos + 1)
+
+
+class LazyJsonArray(Sequence[T]):
+    """A memory-mapped json array whose elements are decoded on access.
+
+    Each element is either a byte range in the memory-mapped file or a json object that
+    was parsed up front. Decoded elements are kept in an LRU cache, so repeated access
+    returns the same object.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cls: Type[T],
+        elements: Sequence[tuple[int, int] | dict],
+        summaries: Sequence[Any],
+        *,
+        trusted: bool = False,
+        key_functions: Mapping[str, Callable[[Any], Hashable]] | None = None,
+        cache_size: int = _DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Initialize the array.
+
+        Args:
+            path: The path of the file containing the json array, which is only
+                opened if some elements are byte ranges.
+            cls: The dataclass to convert the elements to.
+            elements: The byte range or the parsed json object of each element.
+            summaries: The summary of each element.
+            trusted: Whether the elements were encoded by this tool, so that they are
+                decoded with from_trusted_dict().
+            key_functions: Functions from a summary to a unique key, or to None if the
+                element has no key, by key name.
+            cache_size: The number of decoded elements to keep.
+        """
+        self._decode = cls.from_trusted_dict if trusted else cls.from_dict
+        self._elements = elements
+        self.summaries = summaries
+        self._key_functions = key_functions or {}
+        self._key_name_to_positions: dict[str, dict[Hashable, int]] = {}
+        self._cache: collections.OrderedDict[int, T] = collections.OrderedDict()
+        self._cache_size = cache_size
+        self._mmap: mmap.mmap | None = None
+        if any(isinstance(element, tuple) for element in elements):
+            with open(path, mode="rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    @overload
+    def __getitem__(self, i: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[T]:
+        ...
+
+    def __getitem__(self, i: int | slice) -> T | list[T]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+
+        if i in self._cache:
+            self._cache.move_to_end(i)
+            return self._cache[i]
+
+        element = self._elements[i]
+        if isinstance(element, tuple):
+            start, end = element
+            element = json.loads(self._get_mmap()[start:end])
+        obj = self._decode(element)
+
+        self._cache[i] = obj
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return obj
+
+    def find(self, key_name: str, key: Hashable) -> T | None:
+        """Find the element with a key.
+
+        Args:
+            key_name: The name of the key function to use.
+            key: The key of the element.
+
+        Returns:
+            The element, or None if no element has the key.
+        """
+        if key_name not in self._key_name_to_positions:
+            key_function = self._key_functions[key_name]
+            key_to_position = {
+                key_function(summary): i for i, summary in enumerate(self.summaries)
+            }
+            key_to_position.pop(None, None)
+            self._key_name_to_positions[key_name] = key_to_position
+        i = self._key_name_to_positions[key_name].get(key)
+        return None if i is None else self[i]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _get_mmap(self) -> mmap.mmap:
+        if self._mmap is None:
+            raise ValueError("Array is closed")
+        return self._mmap
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in " \t\n\r":
+        pos += 1
+    return pos
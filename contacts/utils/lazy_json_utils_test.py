@@ -0,0 +1,64 @@
+"""Tests for contacts.utils.lazy_json_utils."""
+from __future__ import annotations
+
+import os.path
+
+from contacts import model
+from contacts.utils import file_io_utils, lazy_json_utils
+
+
+def _write_phone_numbers(path: str) -> list[model.PhoneNumber]:
+    phone_numbers = [
+        model.PhoneNumber(country_code=1, number="1234", label="家"),
+        model.PhoneNumber(country_code=86, number="5678", label="HOME"),
+        model.PhoneNumber(country_code=44, number="9012"),
+    ]
+    file_io_utils.write_dataclass_objects_as_json_array(path, phone_numbers)
+    return phone_numbers
+
+
+def test_index_json_array_byte_ranges(tmp_path) -> None:
+    path = os.path.join(tmp_path, "phone_numbers.json")
+    _write_phone_numbers(path)
+
+    ranges, summaries = lazy_json_utils.index_json_array(
+        path, lambda obj: obj["number"]
+    )
+
+    with open(path, mode="rb") as f:
+        data = f.read()
+    assert [data[start:end] for start, end in ranges] == [
+        '{"number": "1234", "country_code": 1, "label": "家"}'.encode(),
+        b'{"number": "5678", "country_code": 86, "label": "HOME"}',
+        b'{"number": "9012", "country_code": 44}',
+    ]
+    assert summaries == ["1234", "5678", "9012"]
+
+
+def test_lazy_json_array_decodes_on_access(tmp_path) -> None:
+    path = os.path.join(tmp_path, "phone_numbers.json")
+    phone_numbers = _write_phone_numbers(path)
+    ranges, summaries = lazy_json_utils.index_json_array(
+        path, lambda obj: obj["number"]
+    )
+    replacement = {"number": "3456", "country_code": 1}
+
+    array = lazy_json_utils.LazyJsonArray(
+        path,
+        model.PhoneNumber,
+        [ranges[0], replacement, ranges[2]],
+        [summaries[0], "3456", summaries[2]],
+        key_functions={"number": lambda summary: summary},
+        cache_size=1,
+    )
+
+    assert len(array) == 3
+    assert list(array) == [
+        phone_numbers[0],
+        model.PhoneNumber(country_code=1, number="3456"),
+        phone_numbers[2],
+    ]
+    assert array[-1] is array[2]
+    assert array.find("number", "1234") == phone_numbers[0]
+    assert array.find("number", "5678") is None
+    array.close()
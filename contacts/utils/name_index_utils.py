@@ -0,0 +1,358 @@
+"""Utilities for looking up contacts by name."""
+from __future__ import annotations
+
+import unicodedata
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from contacts.utils import cache_utils
+
+# bump whenever names are normalized or indexed differently
+_NAME_INDEX_VERSION = 5
+_TRIGRAM_SIZE = 3
+
+
+def normalize(name: str | None) -> str:
+    """Normalize a name for matching.
+
+    Args:
+        name: A name, or None.
+
+    Returns:
+        The name in Unicode normal form NFKC and casefolded, with its whitespace
+        collapsed, or an empty string for None.
+    """
+    if not name:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
+def edit_distance(word_1: str, word_2: str) -> int:
+    """Compute the optimal string alignment distance between two words.
+
+    This is the Levenshtein distance extended with transpositions of adjacent
+    characters, which are common typos, so that "jonh" is one edit away from "john".
+    Uses the bit-parallel algorithm of Hyyrö, which keeps a column of the dynamic
+    programming matrix as the bits of a few ints.
+
+    Returns:
+        The least number of characters to insert, delete, substitute or swap with
+        the next one to turn one word into the other, without editing any character
+        twice.
+    """
+    if not word_1:
+        return len(word_2)
+    char_to_positions: dict[str, int] = {}
+    for i, char in enumerate(word_1):
+        char_to_positions[char] = char_to_positions.get(char, 0) | 1 << i
+    mask = (1 << len(word_1)) - 1
+    last_bit = 1 << (len(word_1) - 1)
+    # the bits of the vertical positive and negative deltas of the current column,
+    # and of the zero diagonal deltas of the previous one
+    positive, negative, diagonal = mask, 0, 0
+    previous_equal = 0
+    distance = len(word_1)
+    for char in word_2:
+        equal = char_to_positions.get(char, 0)
+        transposed = ((~diagonal & equal) << 1) & previous_equal
+        diagonal = (
+            (((equal & positive) + positive) ^ positive) | equal | negative | transposed
+        ) & mask
+        horizontal_positive = negative | ~(diagonal | positive)
+        horizontal_negative = diagonal & positive
+        if horizontal_positive & last_bit:
+            distance += 1
+        elif horizontal_negative & last_bit:
+            distance -= 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(diagonal | horizontal_positive)) & mask
+        negative = diagonal & horizontal_positive & mask
+        previous_equal = equal
+    return distance
+
+
+def levenshtein_distance(word_1: str, word_2: str) -> int:
+    """Compute the Levenshtein distance between two words.
+
+    Uses the bit-parallel algorithm of Myers, as formulated by Hyyrö.
+
+    Returns:
+        The least number of characters to insert, delete or substitute to turn one
+        word into the other.
+    """
+    if not word_1:
+        return len(word_2)
+    char_to_positions: dict[str, int] = {}
+    for i, char in enumerate(word_1):
+        char_to_positions[char] = char_to_positions.get(char, 0) | 1 << i
+    mask = (1 << len(word_1)) - 1
+    last_bit = 1 << (len(word_1) - 1)
+    # the bits of the vertical positive and negative deltas of the current column
+    positive, negative = mask, 0
+    distance = len(word_1)
+    for char in word_2:
+        equal = char_to_positions.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        horizontal_positive = negative | ~(horizontal | positive)
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last_bit:
+            distance += 1
+        elif horizontal_negative & last_bit:
+            distance -= 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & mask
+        negative = horizontal_positive & vertical & mask
+    return distance
+
+
+class BKTree:
+    """A BK-tree of words, to find the words close to a word by Levenshtein distance.
+
+    Each node holds a word, and its children by their distance to the word. By the
+    triangle inequality, a search only descends into the children whose distance is
+    within the maximum distance of the distance to the word searched for. The tree
+    uses the Levenshtein distance, which is a metric, since the optimal string
+    alignment distance of edit_distance() breaks the triangle inequality.
+    """
+
+    def __init__(self) -> None:
+        # a node is a word and a dict of its children by distance
+        self._root: tuple[str, dict[int, Any]] | None = None
+
+    def add(self, word: str) -> None:
+        """Add a word to the tree, unless it is in the tree already."""
+        if self._root is None:
+            self._root = (word, {})
+            return None
+        node_word, children = self._root
+        while (distance := levenshtein_distance(word, node_word)) != 0:
+            if distance not in children:
+                children[distance] = (word, {})
+                return None
+            node_word, children = children[distance]
+
+    def search(self, word: str, max_distance: int) -> list[tuple[str, int]]:
+        """Find the words in the tree within a Levenshtein distance of a word.
+
+        Returns:
+            The words found, each with its distance to the word.
+        """
+        found = []
+        nodes = [] if self._root is None else [self._root]
+        while nodes:
+            node_word, children = nodes.pop()
+            distance = levenshtein_distance(word, node_word)
+            if distance <= max_distance:
+                found.append((node_word, distance))
+            nodes.extend(
+                child
+                for child_distance, child in children.items()
+                if abs(child_distance - distance) <= max_distance
+            )
+        return found
+
+
+class NameIndex:
+    """A trigram index over the normalized names of contacts.
+
+    The names of a contact are its first name, nickname, middle name, last name and
+    Chinese name, normalized with normalize(). The index is kept by contact id, and
+    only the contacts whose names changed are indexed again.
+    """
+
+    def __init__(self) -> None:
+        self._id_to_name_parts: dict[int, tuple[str, ...]] = {}
+        self._trigram_to_ids: dict[str, set[int]] = {}
+        self._word_to_ids: dict[str, set[int]] = {}
+        # words are not removed from the tree, but only searched for while in use
+        self._word_tree = BKTree()
+
+    @staticmethod
+    def load(path: str) -> NameIndex:
+        """Load the index dumped to a file, or an empty index if there is none."""
+        return cache_utils.load_pickle(path, [], _NAME_INDEX_VERSION) or NameIndex()
+
+    def dump(self, path: str) -> None:
+        """Dump the index to a file."""
+        cache_utils.dump_pickle(path, [], [], _NAME_INDEX_VERSION, self)
+
+    def sync(self, id_to_name_parts: Mapping[int, tuple[str, ...]]) -> bool:
+        """Bring the index up to date with contacts.
+
+        The names are compared with the indexed ones, rather than trusting the
+        modification times of the contacts, which not every change of a name bumps.
+
+        Args:
+            id_to_name_parts: The normalized names of each contact, by id.
+
+        Returns:
+            Whether the index changed.
+        """
+        removed_ids = self._id_to_name_parts.keys() - id_to_name_parts.keys()
+        changed_ids = [
+            contact_id
+            for contact_id, name_parts in id_to_name_parts.items()
+            if self._id_to_name_parts.get(contact_id) != name_parts
+        ]
+        for contact_id in [*removed_ids, *changed_ids]:
+            self._remove(contact_id)
+        for contact_id in changed_ids:
+            self._add(contact_id, id_to_name_parts[contact_id])
+        return bool(removed_ids or changed_ids)
+
+    def search(self, query: str) -> set[int]:
+        """Find the contacts whose names match a query.
+
+        A contact matches if the query is a substring of its names joined by spaces,
+        or if the query is two words, the first of which is in its first name or
+        nickname and the second of which is in its last name.
+
+        Args:
+            query: The query, which is normalized with normalize().
+
+        Returns:
+            The ids of the matching contacts.
+        """
+        query = normalize(query)
+        matching_ids = set()
+        if query.count(" ") == 1:
+            first_name, last_name = query.split()
+            for contact_id in self._find_candidates([first_name, last_name]):
+                first, nickname, _, last, _ = self._id_to_name_parts[contact_id]
+                if (
+                    first_name in first or first_name in nickname
+                ) and last_name in last:
+                    matching_ids.add(contact_id)
+
+        for contact_id in self._find_candidates([query]):
+            if query in _join(self._id_to_name_parts[contact_id]):
+                matching_ids.add(contact_id)
+        return matching_ids
+
+    def rank(self, query: str, *, limit: int = 10) -> list[int]:
+        """Find the contacts whose names are close to a query, best first.
+
+        Each word of the query is looked up by edit distance among the words of the
+        names, which tolerates typos. Contacts are ranked by how many words of the
+        query they have a close word for, then by the total edit distance of those.
+
+        Args:
+            query: The query, which is normalized with normalize().
+            limit: The maximum number of contacts to find.
+
+        Returns:
+            The ids of the closest contacts, best first.
+        """
+        query_words = normalize(query).split()
+        id_to_distances: dict[int, dict[int, int]] = {}
+        for i, query_word in enumerate(query_words):
+            for word, distance in self._find_close_words(query_word).items():
+                for contact_id in self._word_to_ids.get(word, ()):
+                    distances = id_to_distances.setdefault(contact_id, {})
+                    distances[i] = min(distance, distances.get(i, distance))
+        return sorted(
+            id_to_distances,
+            key=lambda contact_id: (
+                -len(id_to_distances[contact_id]),
+                sum(id_to_distances[contact_id].values()),
+                contact_id,
+            ),
+        )[:limit]
+
+    def _find_close_words(self, query_word: str) -> dict[str, int]:
+        # the optimal string alignment distance swaps non-overlapping pairs of the
+        # query word, so a close word is within the Levenshtein distance left after
+        # its swaps of the query word with those swaps made: searching the tree for
+        # each such variant misses no close word, and the words found are then
+        # scored by edit_distance()
+        max_distance = _get_max_edit_distance(query_word)
+        words = set()
+        for variant, transposition_count in _transpose(query_word, max_distance):
+            if transposition_count == max_distance:
+                words.add(variant)
+            else:
+                words.update(
+                    word
+                    for word, _ in self._word_tree.search(
+                        variant, max_distance - transposition_count
+                    )
+                )
+        word_to_distance = {}
+        for word in words:
+            if word in self._word_to_ids:
+                distance = edit_distance(query_word, word)
+                if distance <= max_distance:
+                    word_to_distance[word] = distance
+        return word_to_distance
+
+    def _find_candidates(self, substrings: Iterable[str]) -> Iterable[int]:
+        # the contacts with every trigram of the substrings, as few sets first
+        id_sets = sorted(
+            (
+                self._trigram_to_ids.get(trigram, set())
+                for substring in substrings
+                for trigram in _build_trigrams(substring)
+            ),
+            key=len,
+        )
+        if not id_sets:
+            return self._id_to_name_parts.keys()
+        return id_sets[0].intersection(*id_sets[1:])
+
+    def _add(self, contact_id: int, name_parts: tuple[str, ...]) -> None:
+        self._id_to_name_parts[contact_id] = name_parts
+        for trigram in _build_trigrams(_join(name_parts)):
+            self._trigram_to_ids.setdefault(trigram, set()).add(contact_id)
+        for word in _split(name_parts):
+            if word not in self._word_to_ids:
+                self._word_tree.add(word)
+            self._word_to_ids.setdefault(word, set()).add(contact_id)
+
+    def _remove(self, contact_id: int) -> None:
+        name_parts = self._id_to_name_parts.pop(contact_id, None)
+        if name_parts is None:
+            return None
+        for trigram in _build_trigrams(_join(name_parts)):
+            ids = self._trigram_to_ids[trigram]
+            ids.discard(contact_id)
+            if not ids:
+                del self._trigram_to_ids[trigram]
+        for word in _split(name_parts):
+            ids = self._word_to_ids[word]
+            ids.discard(contact_id)
+            if not ids:
+                del self._word_to_ids[word]
+
+
+def _join(name_parts: tuple[str, ...]) -> str:
+    return " ".join(part for part in name_parts if part)
+
+
+def _split(name_parts: tuple[str, ...]) -> set[str]:
+    return set(_join(name_parts).split())
+
+
+def _transpose(word: str, max_count: int, start: int = 0) -> Iterator[tuple[str, int]]:
+    # the word with up to max_count non-overlapping swaps of distinct adjacent
+    # characters at or after start, with the number of swaps
+    yield word, 0
+    if max_count == 0:
+        return None
+    for i in range(start, len(word) - 1):
+        if word[i] != word[i + 1]:
+            swapped = f"{word[:i]}{word[i + 1]}{word[i]}{word[i + 2:]}"
+            for variant, count in _transpose(swapped, max_count - 1, i + 2):
+                yield variant, count + 1
+
+
+def _get_max_edit_distance(word: str) -> int:
+    if len(word) <= 2:
+        return 0
+    return 1 if len(word) <= 4 else 2
+
+
+def _build_trigrams(text: str) -> set[str]:
+    return {text[i : i + _TRIGRAM_SIZE] for i in range(len(text) - _TRIGRAM_SIZE + 1)}
@@ -0,0 +1,167 @@
+"""Tests for contacts.utils.name_index_utils."""
+from __future__ import annotations
+
+import os
+import random
+
+from contacts.utils import name_index_utils
+
+_ID_TO_NAMES: dict[int, tuple[str | None, ...]] = {
+    1: ("Alice", "Ally", None, "Smith", None),
+    2: ("Bob", None, "Ｊ", "Smithson", None),
+    3: ("Ming", None, None, "Li", "李明"),
+    4: ("STRASSE", None, None, "Jones", None),
+}
+
+
+def _build_index(
+    id_to_names: dict[int, tuple[str | None, ...]]
+) -> name_index_utils.NameIndex:
+    index = name_index_utils.NameIndex()
+    index.sync(
+        {
+            contact_id: tuple(name_index_utils.normalize(name) for name in names)
+            for contact_id, names in id_to_names.items()
+        }
+    )
+    return index
+
+
+def test_normalize() -> None:
+    assert name_index_utils.normalize(None) == ""
+    assert name_index_utils.normalize("  Straße  Ｊ ") == "strasse j"
+
+
+def test_search() -> None:
+    index = _build_index(_ID_TO_NAMES)
+
+    assert index.search("smith") == {1, 2}
+    assert index.search("ally smith") == {1}
+    assert index.search("bob j") == {2}
+    assert index.search("李明") == {3}
+    assert index.search("straße") == {4}
+    assert index.search("al") == {1}
+    assert index.search("none") == set()
+    assert index.search("nobody") == set()
+
+
+def test_sync_only_reindexes_changed_contacts() -> None:
+    index = _build_index(_ID_TO_NAMES)
+    id_to_name_parts = dict(index._id_to_name_parts)
+    id_to_name_parts[2] = ("carol", "", "", "smith", "")
+    del id_to_name_parts[4]
+
+    assert index.sync(id_to_name_parts)
+    assert index.search("smith") == {1, 2}
+    assert index.search("bob") == set()
+    assert index.search("jones") == set()
+    assert not index.sync(id_to_name_parts)
+
+
+def test_sync_reindexes_renamed_contact() -> None:
+    index = _build_index(_ID_TO_NAMES)
+
+    index.sync({**index._id_to_name_parts, 3: ("zzqfoo", "", "", "li", "")})
+
+    assert index.search("zzqfoo") == {3}
+    assert index.rank("zzqfo") == [3]
+    assert index.search("ming") == set()
+
+
+def test_dump_and_load(tmp_path: os.PathLike) -> None:
+    path = os.path.join(tmp_path, "name-index.pickle")
+    _build_index(_ID_TO_NAMES).dump(path)
+
+    index = name_index_utils.NameIndex.load(path)
+
+    assert index.search("smith") == {1, 2}
+    assert name_index_utils.NameIndex.load(f"{path}.missing").search("smith") == set()
+
+
+def test_edit_distance() -> None:
+    assert name_index_utils.edit_distance("", "abc") == 3
+    assert name_index_utils.edit_distance("kitten", "sitting") == 3
+    assert name_index_utils.edit_distance("jonh", "john") == 1
+    assert name_index_utils.edit_distance("jonh", "jones") == 2
+    assert name_index_utils.edit_distance("ca", "abc") == 3
+    assert name_index_utils.edit_distance("smith", "smith") == 0
+
+
+def test_levenshtein_distance() -> None:
+    assert name_index_utils.levenshtein_distance("", "abc") == 3
+    assert name_index_utils.levenshtein_distance("kitten", "sitting") == 3
+    assert name_index_utils.levenshtein_distance("jonh", "john") == 2
+    assert name_index_utils.levenshtein_distance("ca", "abc") == 3
+    assert name_index_utils.levenshtein_distance("smith", "smith") == 0
+
+
+def test_bk_tree_search() -> None:
+    words = ["john", "joan", "jon", "smith", "smyth", "jones", "john"]
+    tree = name_index_utils.BKTree()
+    for word in words:
+        tree.add(word)
+
+    for max_distance in range(4):
+        assert sorted(tree.search("jonh", max_distance)) == sorted(
+            (word, name_index_utils.levenshtein_distance("jonh", word))
+            for word in set(words)
+            if name_index_utils.levenshtein_distance("jonh", word) <= max_distance
+        )
+    assert name_index_utils.BKTree().search("john", 2) == []
+
+
+def test_bk_tree_search_finds_words_across_transpositions() -> None:
+    tree = name_index_utils.BKTree()
+    tree.add("ca")
+    tree.add("abc")
+
+    assert tree.search("ac", 1) == [("abc", 1)]
+    assert sorted(tree.search("ac", 2)) == [("abc", 1), ("ca", 2)]
+
+
+def test_rank_finds_every_close_word() -> None:
+    rng = random.Random(0)
+    words = {"".join(rng.choices("abc", k=rng.randint(1, 6))) for _ in range(200)}
+    index = _build_index(
+        {i: (word, None, None, None, None) for i, word in enumerate(sorted(words))}
+    )
+
+    for query in sorted(words)[::7] + ["ac", "bca", "cabab"]:
+        max_distance = 0 if len(query) <= 2 else 1 if len(query) <= 4 else 2
+        assert index._find_close_words(query) == {
+            word: name_index_utils.edit_distance(query, word)
+            for word in words
+            if name_index_utils.edit_distance(query, word) <= max_distance
+        }
+
+
+def test_rank() -> None:
+    index = _build_index(_ID_TO_NAMES)
+
+    assert index.rank("Alcie Smtih") == [1]
+    assert index.rank("bob smyth") == [2, 1]
+    assert index.rank("jnoes") == [4]
+    assert index.rank("alcie smtih", limit=1) == [1]
+    assert index.rank("zzzzzz") == []
+
+
+def test_rank_puts_transposed_name_first() -> None:
+    index = _build_index(
+        {
+            1: ("Sara", None, None, "Jones", None),
+            2: ("John", None, None, "Smith", None),
+        }
+    )
+
+    assert index.rank("jonh")[0] == 2
+    assert index.rank("jonh smtih")[0] == 2
+    assert index.rank("jnoes")[0] == 1
+
+
+def test_rank_forgets_removed_names() -> None:
+    index = _build_index(_ID_TO_NAMES)
+
+    index.sync({**index._id_to_name_parts, 1: ("carol", "", "", "", "")})
+
+    assert index.rank("alice") == []
+    assert index.rank("carl") == [1]
@@ -0,0 +1,184 @@
+"""Utilities for a directory of json objects stored one object per file."""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import os
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from contacts.utils import file_io_utils, journal_utils, json_utils
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+_MAX_WORKERS = 8
+
+
+def manifest_path(directory: str) -> str:
+    """Get the path of the manifest of a shard directory.
+
+    Args:
+        directory: The shard directory.
+
+    Returns:
+        The path of the manifest.
+    """
+    return os.path.join(directory, MANIFEST_FILE_NAME)
+
+
+def is_sharded(directory: str) -> bool:
+    """Check if a directory holds shards.
+
+    Args:
+        directory: The directory.
+
+    Returns:
+        Whether the directory has a manifest.
+    """
+    return os.path.isfile(manifest_path(directory))
+
+
+def read_manifest(directory: str) -> dict[int, dict]:
+    """Read the manifest of a shard directory.
+
+    Args:
+        directory: The shard directory.
+
+    Returns:
+        A map from the id of each object to its manifest entry, which holds its id,
+        iCloud uuid and content hash.
+    """
+    if not is_sharded(directory):
+        return {}
+    with open(manifest_path(directory), encoding="utf-8") as f:
+        return {entry["id"]: entry for entry in json.loads(f.read().strip())}
+
+
+def iter_json_objects(directory: str) -> Iterator[Any]:
+    """Iterate over the json objects in a shard directory.
+
+    The shards are read in parallel.
+
+    Args:
+        directory: The shard directory.
+
+    Yields:
+        The json objects, in manifest order.
+    """
+    shard_paths = [
+        _shard_path(directory, object_id) for object_id in read_manifest(directory)
+    ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        yield from executor.map(_read_shard, shard_paths)
+
+
+def write_json_objects(
+    directory: str, objects: Iterable[Any]
+) -> tuple[list[Any], set[int]]:
+    """Write json objects to a shard directory.
+
+    Only the shards whose contents changed are rewritten, and the shards of objects
+    that are no longer present are removed.
+
+    Args:
+        directory: The shard directory.
+        objects: All the json objects, each with an "id" field.
+
+    Returns:
+        The objects that were written and the ids of the objects that were removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    sharded = is_sharded(directory)
+    id_to_previous_entry = read_manifest(directory)
+
+    entries = []
+    written_objects = []
+    for obj in objects:
+        entry = _build_entry(obj)
+        entries.append(entry)
+        previous_entry = id_to_previous_entry.pop(obj["id"], None)
+        if previous_entry is None or previous_entry["hash"] != entry["hash"]:
+            _write_shard(directory, obj)
+            written_objects.append(obj)
+
+    if not sharded or written_objects or id_to_previous_entry:
+        _write_manifest(directory, entries)
+
+    for object_id in id_to_previous_entry:
+        os.remove(_shard_path(directory, object_id))
+    return written_objects, set(id_to_previous_entry)
+
+
+def update_json_objects(
+    directory: str, objects: Iterable[Any], removed_ids: Iterable[int]
+) -> None:
+    """Write changes to the json objects of a shard directory.
+
+    Unlike write_json_objects(), only the changed objects are hashed, and the other
+    objects are left to the manifest as they are.
+
+    Args:
+        directory: The shard directory.
+        objects: The json objects that were added or changed, each with an "id" field.
+        removed_ids: The ids of the objects that were removed.
+    """
+    id_to_entry = read_manifest(directory)
+    changed = False
+    for obj in objects:
+        id_to_entry[obj["id"]] = _build_entry(obj)
+        _write_shard(directory, obj)
+        changed = True
+    removed_ids = [object_id for object_id in removed_ids if object_id in id_to_entry]
+    for object_id in removed_ids:
+        del id_to_entry[object_id]
+    if changed or removed_ids:
+        _write_manifest(directory, id_to_entry.values())
+
+    for object_id in removed_ids:
+        os.remove(_shard_path(directory, object_id))
+
+
+def remove(directory: str) -> None:
+    """Remove a shard directory and its manifest.
+
+    Args:
+        directory: The shard directory.
+    """
+    for object_id in read_manifest(directory):
+        os.remove(_shard_path(directory, object_id))
+    os.remove(manifest_path(directory))
+    os.rmdir(directory)
+
+
+def _shard_path(directory: str, object_id: int) -> str:
+    return os.path.join(directory, f"{object_id}.json")
+
+
+def _build_entry(obj: Any) -> dict:
+    return {
+        "id": obj["id"],
+        "icloud_uuid": (obj.get("icloud") or {}).get("uuid"),
+        "hash": f"{journal_utils.fingerprint(obj):016x}",
+    }
+
+
+def _write_shard(directory: str, obj: Any) -> None:
+    with file_io_utils.open_atomic(_shard_path(directory, obj["id"])) as f:
+        f.write(f"{json_utils.dumps(obj)}\n")
+
+
+def _write_manifest(directory: str, entries: Iterable[dict]) -> None:
+    with file_io_utils.open_atomic(manifest_path(directory)) as f:
+        f.write("[\n")
+        f.write(
+            ",\n".join(
+                f"    {json.dumps(entry, ensure_ascii=False)}"
+                for entry in sorted(entries, key=lambda entry: entry["id"])
+            )
+        )
+        f.write("\n]\n")
+
+
+def _read_shard(path: str) -> Any:
+    with open(path, encoding="utf-8") as f:
+        return json.loads(f.read())
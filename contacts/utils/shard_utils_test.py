@@ -0,0 +1,87 @@
+"""Tests for contacts.utils.shard_utils."""
+from __future__ import annotations
+
+import os.path
+
+from contacts.utils import shard_utils
+
+
+def test_write_then_read_round_trips_in_id_order(tmp_path) -> None:
+    directory = os.path.join(tmp_path, "objects")
+    objects = [{"id": 2, "name": "b"}, {"id": 1, "icloud": {"uuid": "u"}}]
+
+    written_objects, removed_ids = shard_utils.write_json_objects(directory, objects)
+
+    assert written_objects == objects
+    assert removed_ids == set()
+    assert shard_utils.is_sharded(directory)
+    assert list(shard_utils.iter_json_objects(directory)) == [objects[1], objects[0]]
+    assert shard_utils.read_manifest(directory)[1]["icloud_uuid"] == "u"
+
+
+def test_write_only_rewrites_changed_shards(tmp_path) -> None:
+    directory = os.path.join(tmp_path, "objects")
+    shard_utils.write_json_objects(
+        directory, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3}]
+    )
+    manifest_mtime = os.stat(shard_utils.manifest_path(directory)).st_mtime_ns
+
+    assert shard_utils.write_json_objects(
+        directory, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3}]
+    ) == ([], set())
+    assert os.stat(shard_utils.manifest_path(directory)).st_mtime_ns == manifest_mtime
+
+    written_objects, removed_ids = shard_utils.write_json_objects(
+        directory, [{"id": 1, "name": "a"}, {"id": 2, "name": "c"}]
+    )
+
+    assert written_objects == [{"id": 2, "name": "c"}]
+    assert removed_ids == {3}
+    assert not os.path.exists(os.path.join(directory, "3.json"))
+    assert list(shard_utils.iter_json_objects(directory)) == [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "c"},
+    ]
+
+
+def test_update_only_writes_changes(tmp_path) -> None:
+    directory = os.path.join(tmp_path, "objects")
+    shard_utils.write_json_objects(
+        directory, [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3}]
+    )
+    shard_mtime = os.stat(os.path.join(directory, "1.json")).st_mtime_ns
+    manifest_mtime = os.stat(shard_utils.manifest_path(directory)).st_mtime_ns
+
+    shard_utils.update_json_objects(directory, [], [4])
+
+    assert os.stat(shard_utils.manifest_path(directory)).st_mtime_ns == manifest_mtime
+
+    shard_utils.update_json_objects(
+        directory, [{"id": 2, "name": "c"}, {"id": 4, "icloud": {"uuid": "u"}}], [3]
+    )
+
+    assert os.stat(os.path.join(directory, "1.json")).st_mtime_ns == shard_mtime
+    assert not os.path.exists(os.path.join(directory, "3.json"))
+    assert list(shard_utils.iter_json_objects(directory)) == [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "c"},
+        {"id": 4, "icloud": {"uuid": "u"}},
+    ]
+    assert shard_utils.read_manifest(directory)[4]["icloud_uuid"] == "u"
+    assert shard_utils.write_json_objects(
+        directory,
+        [
+            {"id": 1, "name": "a"},
+            {"id": 2, "name": "c"},
+            {"id": 4, "icloud": {"uuid": "u"}},
+        ],
+    ) == ([], set())
+
+
+def test_remove_deletes_directory(tmp_path) -> None:
+    directory = os.path.join(tmp_path, "objects")
+    shard_utils.write_json_objects(directory, [{"id": 1}])
+
+    shard_utils.remove(directory)
+
+    assert not os.path.exists(directory)
@@ -10,17 +10,34 @@ from contacts.utils import dataclasses_utils
 INDENT_SIZE = 4
 INDENT = " " * INDENT_SIZE
 
+# libyaml is optional, and the pure Python classes load and dump the same data
+_LOADER: Any = type("_Loader", (getattr(yaml, "CSafeLoader", yaml.SafeLoader),), {})
+# notes pushed before the safe dumper hold string enums as python tags, which are
+# loaded as the strings they wrap without importing anything
+_LOADER.add_multi_constructor(
+    "tag:yaml.org,2002:python/object/apply:contacts.model.enumeration.",
+    lambda loader, tag_suffix, node: str(loader.construct_sequence(node)[0]),
+)
+_DUMPER: Any = type("_Dumper", (getattr(yaml, "CSafeDumper", yaml.SafeDumper),), {})
+# string enums, such as the names of schools, are dumped as the strings they are
+_DUMPER.add_multi_representer(
+    str, lambda dumper, data: dumper.represent_str(str.__str__(data))
+)
+
 
 def load(obj: str) -> Any:
     """Load YAML formatted data as a Python object.
 
+    Only standard YAML tags are resolved, since the data may come from iCloud, and
+    the tags of the string enums of the model, which are loaded as plain strings.
+
     Args:
         obj: YAML formatted data.
 
     Returns:
         A Python object representation of the data.
     """
-    return yaml.load(obj, Loader=yaml.Loader)
+    return yaml.load(obj, Loader=_LOADER)
 
 
 def dump(obj: dataclasses_utils.DataClassJsonMixin) -> str:
@@ -32,10 +49,5 @@ def dump(obj: dataclasses_utils.DataClassJsonMixin) -> str:
     Returns:
         YAML formatted representation of the data.
     """
-    return yaml.dump(_remove_none(obj.to_dict()), allow_unicode=True, indent=4)
-
-
-def _remove_none(dct: Any) -> dict:
-    if issubclass(dct.__class__, dict):
-        return {k: _remove_none(v) for k, v in dct.items() if v is not None}
-    return dct
+    # to_dict() already leaves out the fields that are None
+    return yaml.dump(obj.to_dict(), Dumper=_DUMPER, allow_unicode=True, indent=4)
@@ -0,0 +1,70 @@
+"""Tests for contacts.utils.yaml_utils."""
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from contacts import model
+from contacts.dao.icloud.model import notes
+from contacts.utils import yaml_utils
+
+
+def test_dump_and_load_round_trip() -> None:
+    obj = notes.Notes(
+        chinese_name="张",
+        comment="a comment: with a colon",
+        education=notes.Education(high_school=notes.School(name="n", grad_year=2014)),
+    )
+
+    assert yaml_utils.load(yaml_utils.dump(obj)) == obj.to_dict()
+
+
+def test_dump_string_enums_as_strings() -> None:
+    obj = notes.School(name=model.HighSchoolName.NEEDHAM_HIGH_SCHOOL)
+
+    assert yaml_utils.dump(obj) == f"name: {model.HighSchoolName.NEEDHAM_HIGH_SCHOOL}\n"
+
+
+def test_load_rejects_python_tags() -> None:
+    with pytest.raises(yaml.constructor.ConstructorError):
+        yaml_utils.load("!!python/object/apply:os.getcwd []")
+
+
+def test_load_string_enums_dumped_with_python_tags() -> None:
+    legacy_notes = (
+        "education:\n"
+        "    high_school:\n"
+        "        grad_year: 2014\n"
+        "        name: !!python/object/apply:"
+        "contacts.model.enumeration.HighSchoolName\n"
+        "        - Needham High School\n"
+    )
+
+    assert notes.Notes.from_string(legacy_notes) == notes.Notes(
+        education=notes.Education(
+            high_school=notes.School(
+                name=model.HighSchoolName.NEEDHAM_HIGH_SCHOOL, grad_year=2014
+            )
+        )
+    )
+
+
+def test_load_rejects_other_python_object_tags() -> None:
+    with pytest.raises(yaml.constructor.ConstructorError):
+        yaml_utils.load("!!python/object/apply:contacts.model.contact.Contact []")
+
+
+def test_notes_from_string_returns_independent_copies() -> None:
+    string = notes.Notes.to_string(
+        notes.Notes(
+            partner=model.DateRange(
+                start=model.Date(year=2020), end=model.Date(year=2021)
+            )
+        )
+    )
+
+    notes_1 = notes.Notes.from_string(string)
+    notes_2 = notes.Notes.from_string(string)
+
+    assert notes_1 == notes_2
+    assert notes_1.partner is not None and notes_1.partner is not notes_2.partner